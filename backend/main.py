@@ -18,12 +18,30 @@ if ROOT not in sys.path:
 from src import logging_config  # sets up file + console logging and stdout/stderr capture
 
 import logging
+from contextlib import asynccontextmanager
 import uvicorn
 from src.handlers import handle
 from src.handlers import google_export
 from src.handlers import auth_google
+from src.handlers import jobs
 
-app = FastAPI()
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    # on shutdown: stop jobs first, then the crawl workers, browsers and Scrapy reactor they use
+    from src.utils.browser_pool import shutdown_browser_pool
+    from src.utils.crawl_workers import shutdown_crawl_pool
+    from src.utils.crawler_service import shutdown_crawler_service
+    from src.utils.jobs import shutdown_job_manager
+
+    shutdown_job_manager()
+    shutdown_crawl_pool()
+    shutdown_browser_pool()
+    shutdown_crawler_service()
+
+
+app = FastAPI(lifespan=_lifespan)
 
 # Configure allowed origins via ALLOWED_ORIGINS env var (comma-separated). Defaults to dev hosts and the GitHub Pages origin used for the static site.
 _raw_allowed = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000,https://chintu4.github.io")
@@ -48,6 +66,7 @@ app.add_middleware(
 # include routers from handlers
 app.include_router(google_export.router)
 app.include_router(auth_google.router)
+app.include_router(jobs.router)
 
 
 @app.get("/")
@@ -65,9 +84,12 @@ class ProcessRequest(BaseModel):
 
 @app.post("/scrape")
 async def scrape(req: ScrapeRequest):
-    # pass the incoming query string to the handler
-    return handle.scrape(req.input)
-    
+    """Compatibility wrapper: the blocking `handle.scrape` run on a worker thread, so the event loop stays free.
+
+    New clients should POST /jobs and poll GET /jobs/{id} instead.
+    """
+    return await asyncio.to_thread(handle.scrape, req.input)
+
 
 from fastapi.responses import StreamingResponse
 import json
@@ -77,22 +99,7 @@ import threading
 @app.get("/scrape/stream")
 async def scrape_stream(input: str, max_results: int = 200, domains: str = "pubmed,linkedin"):
     """SSE endpoint that streams progress events while scraping."""
-    # Parse domains
-    if domains.lower() == "all":
-        allowed_sources = None
-    else:
-        domain_map = {
-            "pubmed": "https://pubmed.ncbi.nlm.nih.gov/",
-            "linkedin": "https://linkedin.com/"
-        }
-        allowed_sources = []
-        for d in domains.split(","):
-            d = d.strip().lower()
-            if d in domain_map:
-                allowed_sources.append(domain_map[d])
-            else:
-                # For custom domains, just use the domain name as-is
-                allowed_sources.append(d)
+    allowed_sources = handle.parse_domains(domains)
     async def event_generator():
         q: asyncio.Queue = asyncio.Queue()
         loop = asyncio.get_event_loop()
@@ -131,6 +138,37 @@ async def scrape_stream(input: str, max_results: int = 200, domains: str = "pubm
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 
+@app.get("/crawl/deep/stream")
+async def crawl_deep_stream(url: str, max_pages: int = 25, max_depth: int = 3):
+    """SSE deep crawl of one site on the event loop (async Playwright); people are streamed as found.
+
+    Closing the connection cancels the crawl and closes its browser.
+    """
+    from src.utils.playwright_deep import CrawlConfig, iter_people_deep
+
+    cfg = CrawlConfig(
+        max_pages=max_pages,
+        max_depth=max_depth,
+        total_timeout_s=int(os.getenv("DEEP_TIMEOUT_S", "120")),
+        navigation_timeout_ms=int(os.getenv("DEEP_NAV_TIMEOUT_MS", "45000")),
+        concurrency=int(os.getenv("DEEP_CONCURRENCY", "4")),
+    )
+
+    async def gen():
+        events: list = []
+        people: list = []
+        async for person in iter_people_deep(url, config=cfg, progress_callback=events.append):
+            people.append(person)
+            while events:
+                yield f"data: {json.dumps(events.pop(0))}\n\n"
+            yield f"data: {json.dumps({'type': 'person', 'person': person})}\n\n"
+        for event in events:
+            yield f"data: {json.dumps(event)}\n\n"
+        yield f"data: {json.dumps({'type': 'done', 'percent': 100, 'results': people})}\n\n"
+
+    return StreamingResponse(gen(), media_type="text/event-stream")
+
+
 @app.get("/debug/sse-test")
 async def sse_test():
     """Simple SSE test endpoint that emits periodic progress messages (0-100).
@@ -148,6 +186,54 @@ async def sse_test():
 
     return StreamingResponse(gen(), media_type="text/event-stream")
 
+@app.get("/search/backends")
+async def search_backends():
+    """Rolling per-backend search health (latency, error rate, yield, circuit state) and cache counters."""
+    from src.utils.search_health import get_backend_registry
+    from src.utils.search_cache import get_search_cache
+
+    cache = get_search_cache()
+    return {
+        "backends": get_backend_registry().stats(),
+        "cache": cache.stats() if cache is not None else None,
+    }
+
+
+@app.get("/crawl/cache")
+async def crawl_cache():
+    """Page cache counters (hits, 304 revalidations, stores, evictions) and size."""
+    from src.utils.page_cache import get_page_cache
+
+    cache = get_page_cache()
+    return {"cache": cache.stats() if cache is not None else None}
+
+
+@app.get("/crawl/throttle")
+async def crawl_throttle():
+    """Current per-domain crawl pacing: delay, concurrency, latency, backoffs and Retry-After blocks."""
+    from src.utils.throttle import get_throttle
+
+    return {"domains": get_throttle().snapshot()}
+
+
+@app.get("/crawl/workers")
+async def crawl_workers():
+    """Crawl worker processes (CRAWL_ISOLATION=process): pids, jobs run, crashes, timeouts and recycles."""
+    from src.utils.crawl_workers import get_crawl_pool, process_isolation_enabled
+
+    if not process_isolation_enabled():
+        return {"isolation": "thread", "pool": None}
+    return {"isolation": "process", "pool": get_crawl_pool().stats()}
+
+
+@app.get("/crawl/browsers")
+async def crawl_browsers():
+    """Pooled deep-crawl browsers in this process: leases, pages served, launches and recycles."""
+    from src.utils.browser_pool import browser_pool_enabled, get_browser_pool
+
+    return {"pool": get_browser_pool().stats() if browser_pool_enabled() else None}
+
+
 @app.post("/process")
 async def process(req: ProcessRequest):
     # Forward structured scraped response to handler.process
@@ -0,0 +1,117 @@
+"""Micro-benchmark contact extraction on realistic and worst-case pages.
+
+Compares the single-pass scanner in src/utils/extract.py with the regexes the
+crawlers used before (one scan per pattern, unbounded email local part,
+backtracking-prone phone pattern). Worst cases are sized so the legacy
+patterns finish in seconds; pass --size to scale them.
+
+Examples:
+  py backend/scripts/bench_extract.py
+  py backend/scripts/bench_extract.py --size 50000 --repeat 3 --json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# Ensure the backend package root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.utils.extract import extract_contacts, extract_many
+
+LEGACY_EMAIL = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+LEGACY_SCRAPY_PHONES = [
+    r"\+?1?[-.]?\(?\d{3}\)?[-.]?\d{3}[-.]?\d{4}",
+    r"\+\d{1,3}[-.]?\d{1,4}[-.]?\d{1,4}[-.]?\d{1,9}",
+]
+LEGACY_DEEP_PHONE = r"(?:(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?)?\d{3,4}[\s.-]?\d{3,4}"
+LEGACY_LOCATION_KEYWORDS = ["headquarters", "hq", "location", "office", "address", "based in"]
+
+
+def legacy_extract(text):
+    """The pre-extract.py work per page: Scrapy spider patterns plus the deep crawler's."""
+    emails = set(re.findall(LEGACY_EMAIL, text))
+    phones = []
+    for pattern in LEGACY_SCRAPY_PHONES:
+        phones.extend(re.findall(pattern, text))
+    phones.extend(re.findall(LEGACY_DEEP_PHONE, text))
+    lower = text.lower()
+    locations = [lower.find(k) for k in LEGACY_LOCATION_KEYWORDS if k in lower]
+    return emails, phones, locations
+
+
+def realistic_page(size):
+    block = (
+        "<div class='person'><h3>Jane Doe</h3><p>Director of Toxicology, based in Boston. "
+        "Email <a href='mailto:jane.doe@acme-bio.com'>jane.doe@acme-bio.com</a>, phone +1 (617) 555-0142. "
+        "<a href='https://www.linkedin.com/in/jane-doe-tox/'>LinkedIn</a></p></div>\n"
+        "<p>Our headquarters and main office address: 100 Main St, Cambridge, MA 02139. "
+        "Founded 2004, 250 employees, 12 labs.</p>\n"
+    )
+    return (block * (size // len(block) + 1))[:size]
+
+
+def cases(size):
+    return {
+        "realistic_html": realistic_page(size * 10),
+        "long_digit_run": "7" * size,
+        "alnum_without_at": "a" * size,
+        "many_at_signs": "a@" * (size // 2),
+        "spaced_digits": "1 " * (size // 2),
+        "dotted_digits": "1." * (size // 2),
+    }
+
+
+def _time(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20000, help="characters per worst-case input (default 20000)")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of repetitions per case")
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the new scanner")
+    parser.add_argument("--batch", type=int, default=200, help="pages for the extract_many() run (0 to skip)")
+    parser.add_argument("--workers", type=int, default=4, help="processes for the extract_many() run")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for name, text in cases(args.size).items():
+        row = {"case": name, "chars": len(text), "single_pass_ms": round(_time(extract_contacts, text, args.repeat) * 1000, 2)}
+        if not args.skip_legacy:
+            row["legacy_ms"] = round(_time(legacy_extract, text, args.repeat) * 1000, 2)
+            row["speedup"] = round(row["legacy_ms"] / max(row["single_pass_ms"], 1e-3), 1)
+        rows.append(row)
+
+    if args.batch:
+        pages = [realistic_page(50_000)] * args.batch
+        for workers in (0, args.workers):
+            started = time.perf_counter()
+            extract_many(pages, workers=workers)
+            rows.append({
+                "case": f"extract_many[{args.batch} pages, workers={workers}]",
+                "chars": 50_000 * args.batch,
+                "single_pass_ms": round((time.perf_counter() - started) * 1000, 2),
+            })
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    for row in rows:
+        legacy = f"  legacy {row['legacy_ms']:>10.2f} ms  x{row['speedup']}" if "legacy_ms" in row else ""
+        print(f"{row['case']:<42} {row['chars']:>10} chars  single-pass {row['single_pass_ms']:>9.2f} ms{legacy}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
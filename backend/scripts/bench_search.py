@@ -0,0 +1,128 @@
+"""Benchmark duck() throughput and tail latency offline.
+
+Runs duck() against replayed fixtures (--fixtures, recorded with
+SEARCH_RECORD_DIR=<dir>) or synthetic stub backends, across several client
+concurrency levels, in sequential and parallel backend modes.
+
+Examples:
+  py backend/scripts/bench_search.py --latency 0.2 --jitter 0.3
+  py backend/scripts/bench_search.py --fixtures fixtures/search --use-recorded-latency --json
+  py backend/scripts/bench_search.py --modes parallel --fail-p95-ms 1500   # CI gate
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Ensure the backend package root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Measure the backends themselves, not the on-disk cache.
+os.environ["SEARCH_CACHE"] = "0"
+
+from src.utils import duck as duck_mod
+from src.utils.search_health import get_backend_registry
+from src.utils.search_replay import replay_backends, stub_backends
+
+DEFAULT_QUERIES = [
+    "liver toxicity",
+    "drug induced liver injury",
+    "3d cell culture toxicology",
+    "organoid safety assessment",
+    "hepatic spheroid model",
+    "in vitro toxicology director",
+]
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def run_case(queries, mode, concurrency, requests, inject_sources):
+    get_backend_registry().reset()
+    parallel = mode == "parallel"
+
+    def one(i):
+        q = queries[i % len(queries)]
+        started = time.perf_counter()
+        res = duck_mod.duck(q, allowed_sources=None if inject_sources else [], inject_sources=inject_sources,
+                            parallel=parallel, max_results=50)
+        return time.perf_counter() - started, len(res)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        samples = list(ex.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies = [s[0] * 1000 for s in samples]
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": requests,
+        "throughput_rps": round(requests / wall, 2) if wall else 0.0,
+        "p50_ms": round(_percentile(latencies, 50), 1),
+        "p95_ms": round(_percentile(latencies, 95), 1),
+        "p99_ms": round(_percentile(latencies, 99), 1),
+        "max_ms": round(max(latencies), 1) if latencies else 0.0,
+        "avg_results": round(sum(s[1] for s in samples) / len(samples), 1) if samples else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="replay fixtures from this directory instead of stub backends")
+    parser.add_argument("--use-recorded-latency", action="store_true", help="replay the latency captured at record time")
+    parser.add_argument("--latency", type=float, default=0.05, help="injected latency per backend call (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform extra latency in [0, jitter] (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability a backend call fails")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated client concurrency levels")
+    parser.add_argument("--requests", type=int, default=60, help="duck() calls per case")
+    parser.add_argument("--modes", default="sequential,parallel")
+    parser.add_argument("--inject-sources", action="store_true", help="benchmark the per-host site: query path")
+    parser.add_argument("--queries", help="file with one query per line")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--fail-p95-ms", type=float, help="exit 1 if any case's p95 exceeds this")
+    args = parser.parse_args(argv)
+
+    queries = DEFAULT_QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    inject = dict(latency_s=args.latency, jitter_s=args.jitter, error_rate=args.error_rate, seed=args.seed)
+    if args.fixtures:
+        duck_mod.SEARCH_BACKENDS = replay_backends(args.fixtures, use_recorded_latency=args.use_recorded_latency, **inject)
+    else:
+        duck_mod.SEARCH_BACKENDS = stub_backends(**inject)
+
+    rows = []
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        for level in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            rows.append(run_case(queries, mode, level, args.requests, args.inject_sources))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        header = f"{'mode':<11}{'conc':>5}{'rps':>9}{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}{'maxms':>9}{'results':>9}"
+        print(header)
+        for r in rows:
+            print(f"{r['mode']:<11}{r['concurrency']:>5}{r['throughput_rps']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}"
+                  f"{r['p99_ms']:>9}{r['max_ms']:>9}{r['avg_results']:>9}")
+
+    if args.fail_p95_ms is not None and any(r["p95_ms"] > args.fail_p95_ms for r in rows):
+        print(f"p95 above {args.fail_p95_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
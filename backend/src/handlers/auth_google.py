@@ -2,9 +2,10 @@ from fastapi import APIRouter, Request, Response, HTTPException
 from fastapi.responses import RedirectResponse, HTMLResponse
 import os
 import uuid
-import requests
 from urllib.parse import urlencode
 
+from src.utils import http_client
+
 router = APIRouter()
 
 # Simple in-memory session and state stores for demo purposes
@@ -70,7 +71,7 @@ def google_callback(request: Request, code: str | None = None, state: str | None
         "grant_type": "authorization_code",
     }
 
-    token_resp = requests.post(GOOGLE_TOKEN_URL, data=data, timeout=10)
+    token_resp = http_client.post(GOOGLE_TOKEN_URL, data=data)
     if token_resp.status_code != 200:
         html = f"<html><body><h3>Failed to obtain tokens: {token_resp.text}</h3></body></html>"
         return HTMLResponse(content=html, status_code=500)
@@ -82,7 +83,7 @@ def google_callback(request: Request, code: str | None = None, state: str | None
     # Fetch userinfo
     userinfo = {}
     try:
-        resp = requests.get("https://www.googleapis.com/oauth2/v3/userinfo", headers={"Authorization": f"Bearer {access_token}"}, timeout=10)
+        resp = http_client.get("https://www.googleapis.com/oauth2/v3/userinfo", headers={"Authorization": f"Bearer {access_token}"})
         if resp.status_code == 200:
             userinfo = resp.json()
     except Exception:
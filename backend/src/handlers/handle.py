@@ -1,13 +1,23 @@
-from src.utils.duck import duck
+from src.utils.duck import duck, iter_duck
+from src.utils.crawl_workers import get_crawl_pool, process_isolation_enabled
+from src.utils.identity import LeadDeduper, canonical_profile_url, identity_keys, site_domain
+from src.utils.scoring import get_propensity_scorer
 import importlib
 import logging
 import os
-from typing import Tuple
+from typing import Dict, Tuple
 from urllib.parse import urlparse
 
 # Note: avoid importing scrapy / twisted at module import time on Windows (reload/spawn issues).
 # We'll import those libraries lazily inside functions that need them.
 
+try:
+    from src.utils.profile import is_profile_url as _is_profile_url
+except Exception:
+    # Fallback conservative check: treat '/in/' as profile-like
+    def _is_profile_url(url: str, page_text=None, jsonld_texts=None) -> Tuple[bool, int]:
+        return (('/in/' in (url or '').lower()), 0)
+
 
 def _load_spider_settings(module_name='src.utils.settings'):
     """Load uppercase settings from the project's settings module into a Scrapy Settings object.
@@ -30,12 +40,53 @@ def _load_spider_settings(module_name='src.utils.settings'):
         return None
 
 
+def _scrapy_crawlers():
+    """Return (crawl_url, crawl_urls) for Scrapy crawls.
+
+    With CRAWL_ISOLATION=process both run on the crawl worker pool, so Scrapy and
+    its reactor never load in the API process. Otherwise they are the in-process
+    `scrapy_ok` functions (`crawl_urls` is None if that module lacks it). Raises
+    ImportError when Scrapy is unavailable in-process.
+    """
+    if process_isolation_enabled():
+        pool = get_crawl_pool()
+        return pool.crawl_url, pool.crawl_urls
+    from src.utils.scrapy_ok import crawl_url
+    try:
+        from src.utils.scrapy_ok import crawl_urls
+    except ImportError:
+        crawl_urls = None
+    return crawl_url, crawl_urls
+
+
+def parse_domains(domains):
+    """Map a comma-separated source list ("pubmed,linkedin", custom domains) to allowed_sources.
+
+    "all" or an empty value means no restriction (None).
+    """
+    if not domains or domains.lower() == "all":
+        return None
+    domain_map = {
+        "pubmed": "https://pubmed.ncbi.nlm.nih.gov/",
+        "linkedin": "https://linkedin.com/"
+    }
+    allowed_sources = []
+    for d in domains.split(","):
+        d = d.strip().lower()
+        if d in domain_map:
+            allowed_sources.append(domain_map[d])
+        else:
+            # For custom domains, just use the domain name as-is
+            allowed_sources.append(d)
+    return allowed_sources
+
+
 def scrape(query, max_results=200):
     """
     Search using DuckDuckGo and scrape the top results for lead data.
 
-    This runs the spider synchronously for each top result (blocking).
-    For production, run Scrapy in a separate worker or use the async runner.
+    All top results are crawled in one concurrent Scrapy run (`crawl_urls`) and this
+    call blocks until it finishes. For production, run it off the request path.
 
     Scrapy/Twisted imports are performed lazily so the app can start even if Twisted
     or platform-specific dependencies (e.g., pywin32) are not available.
@@ -62,7 +113,7 @@ def scrape(query, max_results=200):
     results = []
     try:
         # Import the crawler lazily; if unavailable, skip crawling and return search results
-        from src.utils.scrapy_ok import crawl_url
+        crawl_url, crawl_urls = _scrapy_crawlers()
         from src.utils.profile import is_profile_url
     except Exception as e:
         logging.info("Scrapy not available, skipping crawl: %s", e)
@@ -73,22 +124,41 @@ def scrape(query, max_results=200):
             "fields": fields
         }
 
-    for url in urls_to_scrape:
+    leads = LeadDeduper()
+
+    def _collect(url, item):
+        # Only include items that look like person profiles, once per person
+        keys = _lead_keys(item, is_profile_url)
+        if keys is None:
+            logging.debug("Scrape: skipping non-profile item from %s: %s", url, item.get('url'))
+            return
+        lead = leads.claim(keys, url)
+        processed = process(item, search_context={"query": query, "url": url})
+        if lead is None:
+            # a later sighting of a known lead: its contact fields fill the kept result's gaps
+            leads.fold(keys, processed)
+            return
+        processed.update(lead)
+        leads.keep(processed)
+        results.append(processed)
+
+    if crawl_urls is not None:
+        # One crawl for all URLs so Scrapy can fetch them concurrently. Items arrive on the
+        # reactor thread; keep the callback cheap and score them here afterwards.
+        crawled = []
         try:
-            items = crawl_url(url)
-            for item in items:
-                processed = process(item, search_context={"query": query, "url": url})
-                # Only include processed items that look like person profiles
-                try:
-                    is_profile = bool((processed.get('linkedin_url') or processed.get('profile_url'))) or is_profile_url((processed.get('url') or ''))[0]
-                except Exception:
-                    is_profile = bool((processed.get('linkedin_url') or processed.get('profile_url')))
-                if not is_profile:
-                    logging.debug("Scrape: skipping non-profile processed item from %s: %s", url, processed.get('url'))
-                    continue
-                results.append(processed)
+            crawl_urls(urls_to_scrape, on_item=lambda url, item: crawled.append((url, item)))
         except Exception:
-            logging.exception("Failed to crawl %s", url)
+            logging.exception("Batch crawl failed for query=%s", query)
+        for url, item in crawled:
+            _collect(url, item)
+    else:
+        for url in urls_to_scrape:
+            try:
+                for item in crawl_url(url):
+                    _collect(url, item)
+            except Exception:
+                logging.exception("Failed to crawl %s", url)
 
     return {
         "query": query,
@@ -98,14 +168,25 @@ def scrape(query, max_results=200):
     }
 
 
-def scrape_progress(query, max_results=200, allowed_sources=None, progress_callback=None):
+def scrape_progress(query, max_results=200, allowed_sources=None, progress_callback=None, cancel_event=None):
     """Scrape like `scrape` but call `progress_callback` with events as work progresses.
 
     The `progress_callback` receives dicts with these example shapes:
       {"type": "progress", "percent": 30, "url": "...", "processed_so_far": 5}
       {"type": "item", "item": {...}, "percent": 45}
+      {"type": "item_update", "item": {...}, "percent": 50}   # same lead_id, more contact fields
       {"type": "done", "percent": 100, "results": [...]} 
       {"type": "error", "msg": "..."}
+
+    Each search-result URL goes through a Scrapy stage and a deep-crawl stage
+    on bounded worker pools (SCRAPE_WORKERS, DEEP_WORKERS), so sites are crawled
+    side by side and items stream out as each one produces them. URLs that
+    arrive together are crawled in one `crawl_urls` run (up to SCRAPE_BATCH_SIZE). Events may
+    come from worker threads but are never delivered concurrently.
+
+    Setting `cancel_event` (a threading.Event) stops the search and skips URLs
+    and stages that have not started; crawls already running finish. The "done"
+    event then carries "cancelled": True and the results found so far.
     """
     def _looks_like_url(s: str) -> bool:
         if not s:
@@ -118,11 +199,11 @@ def scrape_progress(query, max_results=200, allowed_sources=None, progress_callb
 
     # If the user pastes a URL, treat it as the direct crawl target.
     if _looks_like_url(query):
-        search_results = [{"title": query, "href": query, "body": ""}]
+        search_batches = iter([[{"title": query, "href": query, "body": ""}]])
     else:
         # Prefer site-restricted results when available and bias toward people profiles
-        # (PubMed authors, LinkedIn profiles)
-        search_results = duck(query, inject_sources=True, focus_people=True, allowed_sources=allowed_sources)
+        # (PubMed authors, LinkedIn profiles). Results stream in per backend/site query.
+        search_batches = iter_duck(query, inject_sources=True, focus_people=True, allowed_sources=allowed_sources)
 
     # derive fields as above
     fields = []
@@ -134,8 +215,8 @@ def scrape_progress(query, max_results=200, allowed_sources=None, progress_callb
     if 'liver' in q or 'dili' in q:
         fields.append('Drug-Induced Liver Injury')
 
-    # Inform the client about the raw search hits immediately so the UI can
-    # show candidate leads before crawling/enrichment completes.
+    # Inform the client about the raw search hits as soon as each batch arrives so
+    # the UI can show candidate leads before crawling/enrichment completes.
     # Separate profile links to send directly, and non-profile links for deep search.
     try:
         from src.utils.profile import is_profile_url
@@ -143,214 +224,342 @@ def scrape_progress(query, max_results=200, allowed_sources=None, progress_callb
         def is_profile_url(url: str, page_text=None, jsonld_texts=None) -> Tuple[bool, int]:
             return (False, 0)
 
+    import queue
+    import threading
+
+    search_results = []
     profile_results = []
+    seen_profiles = set()
     non_profile_urls = []
-    for r in search_results:  # Check ALL search results for profiles
-        href = r['href']
-        try:
-            is_prof, _ = is_profile_url(href)
-        except Exception:
-            is_prof = False
-        if is_prof:
-            profile_results.append(r)
-        else:
-            non_profile_urls.append(href)
-
-    # Limit profile results to max_results for immediate display
-    profile_results = profile_results[:max_results]
+    # Leads found on several sites, by both stages or by earlier jobs resolve to one lead id;
+    # each is emitted once per scrape, and later sightings fill in its missing fields (item_update).
+    leads = LeadDeduper()
+    # Non-profile URLs are handed to the crawl loop below while the search is still running.
+    url_queue: "queue.Queue" = queue.Queue()
+    search_done = object()
 
-    logging.info("Found %d profile links and %d non-profile URLs for query=%s", len(profile_results), len(non_profile_urls), query)
+    def _cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
 
-    if progress_callback and profile_results:
+    def _search_worker():
         try:
-            progress_callback({"type": "search_results", "results": profile_results})
+            for batch in search_batches:
+                if _cancelled():
+                    break
+                search_results.extend(batch)
+                profile_chunk = []
+                for r in batch:  # Check ALL search results for profiles
+                    href = r.get('href') or r.get('url')
+                    if not href:
+                        continue
+                    try:
+                        is_prof, _ = is_profile_url(href)
+                    except Exception:
+                        is_prof = False
+                    if is_prof:
+                        # Backends often return the same profile under different URLs; show it once
+                        key = canonical_profile_url(href)
+                        if key and key in seen_profiles:
+                            continue
+                        if key:
+                            seen_profiles.add(key)
+                        # Limit profile results to max_results for immediate display
+                        if len(profile_results) < max_results:
+                            profile_results.append(r)
+                            profile_chunk.append(r)
+                    else:
+                        non_profile_urls.append(href)
+                        url_queue.put(href)
+
+                if progress_callback and profile_chunk:
+                    try:
+                        progress_callback({"type": "search_results", "results": profile_chunk})
+                    except Exception:
+                        logging.exception("progress_callback failed when sending search_results event")
         except Exception:
-            logging.exception("progress_callback failed when sending search_results event")
-
-    if not search_results:
-        if progress_callback:
-            progress_callback({"type": "done", "percent": 100, "results": []})
-        return {"query": query, "fields": fields, "results": []}
+            logging.exception("Search failed for query=%s", query)
+        finally:
+            logging.info("Found %d profile links and %d non-profile URLs for query=%s", len(profile_results), len(non_profile_urls), query)
+            url_queue.put(search_done)
 
-    urls_to_scrape = non_profile_urls
+    search_thread = threading.Thread(target=_search_worker, name="scrape-search", daemon=True)
+    search_thread.start()
 
     results = []
     # Scrapy crawl is optional; Playwright deep crawl can be used instead.
     try:
-        from src.utils.scrapy_ok import crawl_url
+        crawl_url, crawl_urls = _scrapy_crawlers()
     except Exception as e:
-        crawl_url = None
+        crawl_url = crawl_urls = None
         logging.info("Scrapy not available, skipping crawl: %s", e)
 
-    total = max(len(urls_to_scrape), 1)
-    processed_count = 0
-
-    logging.info("Starting scrape_progress for query=%s (urls=%d)", query, len(urls_to_scrape))
-
-    # Emit initial progress so the client sees that work started
-    if progress_callback:
-        try:
-            progress_callback({"type": "progress", "percent": 0, "url": None, "processed_so_far": 0})
-        except Exception:
-            logging.exception("progress_callback failed on initial event")
-
     import concurrent.futures
-    # Allow tuning via env; defaults raised for heavy sites like PubMed/LinkedIn.
-    CRAWL_TIMEOUT = int(os.getenv("CRAWL_TIMEOUT", "120"))
-
     # Enable deep Playwright crawl by default; can be disabled via USE_PLAYWRIGHT_DEEP=0.
     use_deep = _looks_like_url(query) or (os.getenv("USE_PLAYWRIGHT_DEEP", "1").lower() in ("1", "true", "yes"))
     deep_max_pages = int(os.getenv("DEEP_MAX_PAGES", "25"))
     deep_max_depth = int(os.getenv("DEEP_MAX_DEPTH", "3"))
     deep_timeout_s = int(os.getenv("DEEP_TIMEOUT_S", "120"))
     deep_nav_timeout_ms = int(os.getenv("DEEP_NAV_TIMEOUT_MS", "45000"))
+    deep_concurrency = int(os.getenv("DEEP_CONCURRENCY", "4"))
+    deep_frontier = os.getenv("DEEP_FRONTIER", "priority").lower()
     deep_person_limit = int(os.getenv("DEEP_PERSON_LIMIT", "50"))
     allow_linkedin = os.getenv("ALLOW_LINKEDIN_DEEP", "0").lower() in ("1", "true", "yes")
 
-    for idx, url in enumerate(urls_to_scrape, start=1):
-        logging.info("Starting crawl for url=%s (idx=%d/%d)", url, idx, total)
-        if progress_callback:
+    processed_count = 0
+    last_percent = 0
+    # Every URL is one work unit per stage (Scrapy crawl, deep crawl); percent is units done / units known.
+    stages = [name for name, enabled in (("scrapy", crawl_url is not None), ("deep", use_deep)) if enabled]
+    units_per_url = max(len(stages), 1)
+    units_done = 0
+    stages_left: Dict[int, int] = {}
+    # Stages run on worker threads; results, counters and progress_callback calls are serialized here.
+    emit_lock = threading.RLock()
+
+    def _percent() -> int:
+        # The URL total keeps growing while search results stream in, so hold back
+        # from 100% until the search is finished and never report less progress
+        # than we already have.
+        nonlocal last_percent
+        percent = int((units_done / max(len(non_profile_urls) * units_per_url, 1)) * 100)
+        if search_thread.is_alive():
+            percent = min(percent, 90)
+        last_percent = max(last_percent, percent)
+        return last_percent
+
+    def _emit(event: dict, what: str) -> None:
+        if not progress_callback:
+            return
+        with emit_lock:
             try:
-                progress_callback({"type": "progress", "percent": int(((idx-1) / total) * 100), "url": url, "processed_so_far": processed_count})
+                progress_callback(event)
             except Exception:
-                logging.exception("progress_callback failed when announcing url start")
+                logging.exception("progress_callback failed when sending %s", what)
+
+    def _add_result(processed: dict, what: str) -> None:
+        nonlocal processed_count
+        with emit_lock:
+            results.append(processed)
+            processed_count += 1
+            _emit({"type": "item", "item": processed, "percent": _percent()}, what)
+
+    def _fold_result(keys: list, processed: dict, what: str) -> None:
+        # A later sighting of a known lead: fill the kept result's gaps (in place, so `results`
+        # and the done event carry them) and send the updated lead to the client.
+        with emit_lock:
+            kept = leads.fold(keys, processed)
+            if kept is not None:
+                _emit({"type": "item_update", "item": dict(kept), "percent": _percent()}, what)
+
+    def _unit_done(idx: int, url: str) -> None:
+        nonlocal units_done
+        with emit_lock:
+            units_done += 1
+            stages_left[idx] -= 1
+            if stages_left[idx] > 0:
+                return
+            del stages_left[idx]
+            # emit progress at the end of each URL
+            percent = _percent()
+            logging.info("URL complete: %s (percent=%d)", url, percent)
+            _emit({"type": "progress", "percent": percent, "url": url, "processed_so_far": processed_count},
+                  "url completion event")
 
-        try:
-            items = []
+    logging.info("Starting scrape_progress for query=%s (streaming search results)", query)
 
-            if crawl_url is not None:
-                # Run crawl_url in a worker thread with a timeout so a stuck crawl doesn't hang SSE
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
-                    fut = ex.submit(crawl_url, url)
-                    try:
-                        items = fut.result(timeout=CRAWL_TIMEOUT)
-                    except concurrent.futures.TimeoutError:
-                        logging.warning("Crawl timed out for %s after %s seconds", url, CRAWL_TIMEOUT)
-                        try:
-                            fut.cancel()
-                        except Exception:
-                            pass
-                        items = []
-                        if progress_callback:
-                            progress_callback({"type": "error", "msg": f"Crawl timed out for {url}", "url": url})
-
-                for item in items:
-                    processed = process(item, search_context={"query": query, "url": url})
-                    # Server-side filter: only include processed items that contain a profile-like link
-                    is_profile = False
-                    try:
-                        is_profile = bool((processed.get('linkedin_url') or processed.get('profile_url')))
-                        if not is_profile:
-                            # fallback: consider the processed url itself
-                            is_profile = is_profile_url((processed.get('url') or ''))[0]
-                    except Exception:
-                        is_profile = bool((processed.get('linkedin_url') or processed.get('profile_url')))
+    # Emit initial progress so the client sees that work started
+    _emit({"type": "progress", "percent": 0, "url": None, "processed_so_far": 0}, "initial event")
+
+    def _scrapy_item(url: str, item: dict) -> None:
+        # Server-side filter: only include items that contain a profile-like link
+        keys = _lead_keys(item, is_profile_url)
+        if keys is None:
+            logging.debug("Skipping non-profile item from %s: %s", url, item.get('url'))
+            return
+        lead = leads.claim(keys, url)
+        processed = process(item, search_context={"query": query, "url": url})
+        if lead is None:
+            logging.debug("Folding duplicate lead from %s: %s", url, item.get('url'))
+            _fold_result(keys, processed, "item update event")
+            return
+        processed.update(lead)
+        leads.keep(processed)
+        logging.debug("Processed item from %s: %s", url, processed.get('url'))
+        _add_result(processed, "item event")
+
+    def _scrapy_stage(urls: list) -> None:
+        if crawl_urls is None:
+            # crawl_url stops a crawl that overruns CRAWL_TIMEOUT and returns what it collected
+            for url in urls:
+                for item in crawl_url(url) or []:
+                    _scrapy_item(url, item)
+            return
+        # One MySpider run for the whole batch, so Scrapy fetches the sites concurrently.
+        # on_item runs on the reactor (or dispatcher) thread; items are scored here instead.
+        found: "queue.Queue" = queue.Queue()
+        finished = object()
+
+        def _crawl():
+            try:
+                crawl_urls(urls, on_item=lambda url, item: found.put((url, item)))
+            except Exception:
+                logging.exception("Batch crawl of %d URLs failed", len(urls))
+            finally:
+                found.put(finished)
+
+        threading.Thread(target=_crawl, name="scrape-batch", daemon=True).start()
+        while True:
+            entry = found.get()
+            if entry is finished:
+                return
+            _scrapy_item(*entry)
+
+    def _deep_stage(url: str) -> None:
+        from src.utils.playwright_deep import crawl_people_deep, CrawlConfig
+        if process_isolation_enabled():
+            # Chromium runs in a crawl worker process instead of this one
+            crawl_people_deep = get_crawl_pool().crawl_people_deep
+
+        def deep_cb(evt: dict):
+            # Optionally forward non-fatal deep progress into logs; we don't send unknown SSE event types.
+            if evt.get("type") == "error":
+                logging.info("deep crawl error: %s", evt)
+
+        cfg = CrawlConfig(
+            max_pages=deep_max_pages,
+            max_depth=deep_max_depth,
+            total_timeout_s=deep_timeout_s,
+            navigation_timeout_ms=deep_nav_timeout_ms,
+            concurrency=deep_concurrency,
+            frontier=deep_frontier,
+            same_domain_only=True,
+            deny_domains=() if allow_linkedin else (
+                "linkedin.com",
+                "www.linkedin.com",
+            ),
+        )
+        people = crawl_people_deep(url, config=cfg, progress_callback=deep_cb)
+
+        # Convert people to Lead-shaped items and emit
+        for p in (people or [])[:deep_person_limit]:
+            profile_url = (p.get("profile_url") or "").strip()
+            linkedin = (p.get("linkedin_url") or profile_url).strip()
+            email = (p.get("email") or "").strip()
+
+            # Create a spider-like payload for consistent scoring
+            scraped_like = {
+                "url": p.get("page_url") or url,
+                "title": (p.get("title") or p.get("name") or p.get("page_title") or "").strip(),
+                "emails": [email] if email else (p.get("page_emails") or []),
+                "phones": [p.get("phone")] if p.get("phone") else (p.get("page_phones") or []),
+                # Existing pipeline expects linkedin_urls, so map profile_url into it.
+                "linkedin_urls": [linkedin] if linkedin else ([profile_url] if profile_url else []),
+                "location": [],
+                "company_info": {},
+                "text_content": p.get("page_text") or "",
+            }
+            # Filter deep crawl items server-side: only include profile-like results
+            keys = _lead_keys(scraped_like, is_profile_url, emails=[email], name=p.get("name") or "")
+            if keys is None:
+                logging.debug("Skipping non-profile deep item from %s: %s", url, scraped_like["url"])
+                continue
+            # the same person is often found on several sites and by the Scrapy stage too
+            lead = leads.claim(keys, url)
+            processed = process(scraped_like, search_context={"query": query, "url": url})
+            if lead is None:
+                logging.debug("Folding duplicate deep lead from %s: %s", url, scraped_like["url"])
+                _fold_result(keys, processed, "deep item update event")
+                continue
+            processed.update(lead)
+            leads.keep(processed)
+            _add_result(processed, "deep item event")
+
+    def _run_stage(stage: str, units: list) -> None:
+        # units: [(idx, url)]; the Scrapy stage takes a batch of URLs, the deep stage one
+        urls = [url for _, url in units]
+        try:
+            if _cancelled():
+                return
+            if stage == "scrapy":
+                _scrapy_stage(urls)
+            else:
+                _deep_stage(urls[0])
+        except Exception as e:
+            for url in urls:
+                if stage == "scrapy":
+                    logging.exception("Failed to crawl %s", url)
+                    _emit({"type": "error", "msg": f"Failed to crawl {url}", "url": url}, "error event")
+                else:
+                    logging.exception("Deep Playwright crawl failed for %s: %s", url, e)
+                    _emit({"type": "error", "msg": f"Deep crawl failed for {url}: {e}", "url": url}, "deep error")
+        finally:
+            for idx, url in units:
+                _unit_done(idx, url)
+
+    # URLs from the search feed two bounded stages that run side by side: a slow
+    # site holds one worker of its stage, not the whole scrape.
+    scrape_workers = max(1, int(os.getenv("SCRAPE_WORKERS", "4")))
+    deep_workers = max(1, int(os.getenv("DEEP_WORKERS", "2")))
+    pools = {
+        "scrapy": concurrent.futures.ThreadPoolExecutor(scrape_workers, thread_name_prefix="scrape-crawl"),
+        "deep": concurrent.futures.ThreadPoolExecutor(deep_workers, thread_name_prefix="scrape-deep"),
+    }
 
-                    if not is_profile:
-                        logging.debug("Skipping non-profile item from %s: %s", url, processed.get('url'))
-                        continue
+    # URLs that are already waiting (one search batch usually arrives at once) share one Scrapy run.
+    scrape_batch_size = max(1, int(os.getenv("SCRAPE_BATCH_SIZE", "16"))) if crawl_urls is not None else 1
 
-                    results.append(processed)
-                    processed_count += 1
-                    logging.debug("Processed item from %s: %s", url, processed.get('url'))
-                    if progress_callback:
-                        percent = int((idx / total) * 100)
-                        logging.info("Progress: %d%% (%d/%d) for query=%s", percent, idx, total, query)
-                        try:
-                            progress_callback({"type": "item", "item": processed, "percent": percent})
-                        except Exception:
-                            logging.exception("progress_callback failed when sending item event")
-
-            if use_deep:
+    idx = 0
+    searching = True
+    try:
+        while searching and not _cancelled():
+            try:
+                url = url_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if url is search_done:
+                break
+            batch = [url]
+            while len(batch) < scrape_batch_size:
                 try:
-                    from src.utils.playwright_deep import crawl_people_deep, CrawlConfig
-
-                    def deep_cb(evt: dict):
-                        # Optionally forward non-fatal deep progress into logs; we don't send unknown SSE event types.
-                        if evt.get("type") == "error":
-                            logging.info("deep crawl error: %s", evt)
-
-                    cfg = CrawlConfig(
-                        max_pages=deep_max_pages,
-                        max_depth=deep_max_depth,
-                        total_timeout_s=deep_timeout_s,
-                        navigation_timeout_ms=deep_nav_timeout_ms,
-                        same_domain_only=True,
-                        deny_domains=() if allow_linkedin else (
-                            "linkedin.com",
-                            "www.linkedin.com",
-                        ),
-                    )
-                    people = crawl_people_deep(url, config=cfg, progress_callback=deep_cb)
-
-                    # Convert people to Lead-shaped items and emit
-                    seen_local = set()
-                    for p in (people or [])[:deep_person_limit]:
-                        profile_url = (p.get("profile_url") or "").strip()
-                        linkedin = (p.get("linkedin_url") or profile_url).strip()
-                        email = (p.get("email") or "").strip()
-                        key = profile_url or linkedin or email or (p.get("name") or "")
-                        if key and key in seen_local:
-                            continue
-                        if key:
-                            seen_local.add(key)
-
-                        # Create a spider-like payload for consistent scoring
-                        scraped_like = {
-                            "url": p.get("page_url") or url,
-                            "title": (p.get("title") or p.get("name") or p.get("page_title") or "").strip(),
-                            "emails": [email] if email else (p.get("page_emails") or []),
-                            "phones": [p.get("phone")] if p.get("phone") else (p.get("page_phones") or []),
-                            # Existing pipeline expects linkedin_urls, so map profile_url into it.
-                            "linkedin_urls": [linkedin] if linkedin else ([profile_url] if profile_url else []),
-                            "location": [],
-                            "company_info": {},
-                            "text_content": p.get("page_text") or "",
-                        }
-                        processed = process(scraped_like, search_context={"query": query, "url": url})
-                        # Filter deep crawl items server-side: only include profile-like results
-                        try:
-                            deep_is_profile = bool((processed.get('linkedin_url') or processed.get('profile_url'))) or is_profile_url((processed.get('url') or ''))[0]
-                        except Exception:
-                            deep_is_profile = bool((processed.get('linkedin_url') or processed.get('profile_url')))
-
-                        if not deep_is_profile:
-                            logging.debug("Skipping non-profile deep item from %s: %s", url, processed.get('url'))
-                            continue
+                    url = url_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if url is search_done:
+                    searching = False
+                    break
+                batch.append(url)
+
+            units = []
+            for url in batch:
+                idx += 1
+                logging.info("Queueing crawl for url=%s (idx=%d/%d)", url, idx, max(len(non_profile_urls), 1))
+                with emit_lock:
+                    stages_left[idx] = units_per_url
+                    _emit({"type": "progress", "percent": _percent(), "url": url, "processed_so_far": processed_count},
+                          "url start event")
+                if not stages:
+                    _unit_done(idx, url)
+                if use_deep:
+                    pools["deep"].submit(_run_stage, "deep", [(idx, url)])
+                units.append((idx, url))
+            if "scrapy" in stages:
+                pools["scrapy"].submit(_run_stage, "scrapy", units)
+    finally:
+        for pool in pools.values():
+            # stages not started yet are dropped on cancel; running ones finish
+            pool.shutdown(wait=True, cancel_futures=_cancelled())
+
+    cancelled = _cancelled()
+    done_extra = {"cancelled": True} if cancelled else {}
+    if not cancelled:
+        search_thread.join()
 
-                        results.append(processed)
-                        processed_count += 1
-                        if progress_callback:
-                            percent = int((idx / total) * 100)
-                            try:
-                                progress_callback({"type": "item", "item": processed, "percent": percent})
-                            except Exception:
-                                logging.exception("progress_callback failed when sending deep item event")
-
-                except Exception as e:
-                    logging.exception("Deep Playwright crawl failed for %s: %s", url, e)
-                    if progress_callback:
-                        try:
-                            progress_callback({"type": "error", "msg": f"Deep crawl failed for {url}: {e}", "url": url})
-                        except Exception:
-                            logging.exception("progress_callback failed when sending deep error")
-        except Exception:
-            logging.exception("Failed to crawl %s", url)
-            if progress_callback:
-                try:
-                    progress_callback({"type": "error", "msg": f"Failed to crawl {url}", "url": url})
-                except Exception:
-                    logging.exception("progress_callback failed when sending error event")
-        # emit progress at the end of each URL
+    if not search_results:
         if progress_callback:
-            percent = int((idx / total) * 100)
-            logging.info("URL complete: %s (percent=%d)", url, percent)
-            try:
-                progress_callback({"type": "progress", "percent": percent, "url": url, "processed_so_far": processed_count})
-            except Exception:
-                logging.exception("progress_callback failed when sending url completion event")
+            progress_callback({"type": "done", "percent": 100, "results": [], **done_extra})
+        return {"query": query, "fields": fields, "results": []}
 
-    logging.info("Scrape complete for query=%s, results=%d", query, len(results))
+    logging.info("Scrape complete for query=%s, results=%d, duplicate leads merged=%d",
+                 query, len(results), leads.duplicates)
 
     if progress_callback:
         # Ensure final results include only profile-like items (defensive double-check)
@@ -362,7 +571,7 @@ def scrape_progress(query, max_results=200, allowed_sources=None, progress_callb
                 ok = bool((r.get('linkedin_url') or r.get('profile_url')))
             if ok:
                 final_results.append(r)
-        progress_callback({"type": "done", "percent": 100, "results": final_results})
+        progress_callback({"type": "done", "percent": 100, "results": final_results, **done_extra})
 
     return {
         "query": query,
@@ -374,19 +583,20 @@ def scrape_progress(query, max_results=200, allowed_sources=None, progress_callb
 
 def scrape_async(query, max_results=5):
     """
-    Async-style facade that uses Scrapy's CrawlerRunner if available; otherwise returns an empty list.
+    Crawl the top search results concurrently on the shared Scrapy reactor; returns [] if Scrapy is unavailable.
 
-    Note: kept as a normal function (no module-level decorator) to avoid importing Twisted during module import.
+    All crawls are submitted to `CrawlerService` at once and this call blocks until they finish
+    (each bounded by CRAWL_TIMEOUT). Scrapy/Twisted are only imported when this is called.
     """
     try:
-        from scrapy.crawler import CrawlerRunner
-        from scrapy.utils.project import get_project_settings
         from src.utils.scrapy_ok import MySpider
-        from twisted.internet import defer
+        from src.utils.crawler_service import get_crawler_service
     except Exception as e:
         logging.info("Scrapy/Twisted not available for async crawling: %s", e)
         return []
 
+    import concurrent.futures
+
     # Prefer site-restricted results when available
     search_results = duck(query, inject_sources=True)
 
@@ -394,41 +604,77 @@ def scrape_async(query, max_results=5):
         return []
 
     urls_to_scrape = [result['href'] for result in search_results[:max_results]]
+    crawl_timeout = int(os.getenv("CRAWL_TIMEOUT", "120"))
+
+    service = get_crawler_service()
+    jobs = []
+    for url in urls_to_scrape:
+        collected = []
+        jobs.append((url, collected, service.submit(MySpider, start_url=url, collected=collected)))
 
-    proc_settings = _load_spider_settings() or get_project_settings()
-    runner = CrawlerRunner(settings=proc_settings)
     results = []
+    for url, collected, fut in jobs:
+        try:
+            fut.result(timeout=crawl_timeout)
+        except concurrent.futures.TimeoutError:
+            logging.warning("Crawl timed out for %s after %s seconds", url, crawl_timeout)
+            service.stop(fut)
+        except Exception:
+            logging.exception("Failed to crawl %s", url)
+        results.extend(collected)
 
-    @defer.inlineCallbacks
-    def run_all():
-        for url in urls_to_scrape:
-            collected = []
-            yield runner.crawl(MySpider, start_url=url, collected=collected)
-            results.extend(collected)
+    return results
 
-    # Start the deferred and block until completion (this is a blocking call - use carefully)
-    from twisted.internet import reactor
-    d = run_all()
-    done = []
+def _is_person_link(url, is_profile_url):
+    """True for a link to one person's profile (LinkedIn /in/ or /pub/, ORCID, or a profile-like URL), not a company page."""
+    if not isinstance(url, str) or not url.strip():
+        return False
+    u = url.lower()
+    if '/in/' in u or 'linkedin.com/pub/' in u or 'orcid.org/' in u:
+        return True
+    try:
+        return bool(is_profile_url(url)[0])
+    except Exception:
+        return False
 
-    def _stop(_=None):
-        try:
-            reactor.stop()  # type: ignore[attr-defined]
-        except AttributeError:
-            pass
 
-    d.addBoth(_stop)
-    import threading
-    try:
-        if threading.current_thread() is threading.main_thread():
-            reactor.run()  # type: ignore[attr-defined]
-        else:
-            reactor.run(installSignalHandlers=False)  # type: ignore[attr-defined]
-    except AttributeError:
-        # reactor may not have run method
-        pass
+def _person_link(scraped_data, is_profile_url):
+    """The first person-profile link of a crawled item ("" if none)."""
+    for u in scraped_data.get('linkedin_urls', []) or []:
+        if _is_person_link(u, is_profile_url):
+            return u
+    # If we crawled a LinkedIn profile page directly, treat that as the person link
+    scraped_url = (scraped_data.get('url') or '').strip()
+    if 'linkedin.com' in scraped_url.lower() and _is_person_link(scraped_url, is_profile_url):
+        return scraped_url
+    return ""
+
+
+def _profile_link(scraped_data, is_profile_url):
+    """The link `process` reports as linkedin_url: a person link, else the first LinkedIn link ("" if none)."""
+    linkedin_urls = scraped_data.get('linkedin_urls', []) or []
+    return _person_link(scraped_data, is_profile_url) or (linkedin_urls[0] if linkedin_urls else "")
+
+
+def _lead_keys(scraped_data, is_profile_url, emails=(), name=""):
+    """Identity keys for a crawled item, or None if the profile filter would drop it.
+
+    Runs before `process`, so non-profile items are never scored.
+    Only person-profile links become keys: a company page or the crawled page's
+    URL is shared by everyone found there. Page-level emails are left out for
+    the same reason.
+    """
+    url = (scraped_data.get('url') or '').strip()
+    if not _profile_link(scraped_data, is_profile_url):
+        try:
+            if not is_profile_url(url)[0]:
+                return None
+        except Exception:
+            return None
+    link = _person_link(scraped_data, is_profile_url)
+    return identity_keys(emails=emails, profile_urls=[link] if link else [], name=name,
+                         domain=site_domain(url) if name else "")
 
-    return results
 
 def process(scraped_data, search_context=None):
     """
@@ -462,25 +708,9 @@ def process(scraped_data, search_context=None):
     # Extract LinkedIn URLs
     linkedin_urls = scraped_data.get('linkedin_urls', []) or []
 
-    # Prefer a person profile link over other linkedin pages. Use the page-based
-    # `is_profile_url` heuristic when available to be conservative about what we
-    # consider a profile. Fall back to containing '/in/' as a simple fast check.
-    try:
-        from src.utils.profile import is_profile_url
-    except Exception:
-        # Fallback conservative check: treat '/in/' as profile-like
-        def is_profile_url(url: str, page_text=None, jsonld_texts=None) -> Tuple[bool, int]:
-            return (('/in/' in (url or '').lower()), 0)
-
-    profile_like = [u for u in linkedin_urls if isinstance(u, str) and (('/in/' in u.lower()) or is_profile_url(u)[0])]
-    linkedin_url = profile_like[0] if profile_like else (linkedin_urls[0] if linkedin_urls else "")
-
-    # If we crawled a LinkedIn profile page directly, treat that as the person link
-    # but only when it looks like a profile page.
-    scraped_url = (scraped_data.get('url') or '').strip()
-    scraped_url_l = scraped_url.lower()
-    if not linkedin_url and 'linkedin.com' in scraped_url_l and (('/in/' in scraped_url_l) or is_profile_url(scraped_url)[0]):
-        linkedin_url = scraped_data.get('url', '')
+    # Prefer a person profile link over other linkedin pages, using the page-based
+    # `is_profile_url` heuristic to be conservative about what we consider a profile.
+    linkedin_url = _profile_link(scraped_data, _is_profile_url)
     
     # Extract location/HQ
     locations = scraped_data.get('location', [])
@@ -513,49 +743,9 @@ def calculate_propensity_score(data, context=None):
     - Location (hub locations): +10
     - Scientific Intent (publications): +40
     
+    All keyword lists are matched in one pass (see src/utils/scoring.py).
+
     Returns:
         Score from 0-100
     """
-    score = 0
-    text_content = data.get('text_content', '').lower()
-    title = data.get('title', '').lower()
-    url = data.get('url', '').lower()
-    
-    # Role Fit: Check for relevant titles/roles (+30 max)
-    role_keywords = [
-        'toxicology', 'safety', 'hepatic', '3d', 'preclinical',
-        'drug development', 'director', 'head of', 'vp', 'chief'
-    ]
-    role_score = sum(5 for keyword in role_keywords if keyword in text_content or keyword in title)
-    score += min(role_score, 30)
-    
-    # Company Intent: Funding indicators (+20 max)
-    funding_keywords = ['series a', 'series b', 'funding', 'raised', 'investment', 'ipo']
-    funding_score = sum(5 for keyword in funding_keywords if keyword in text_content)
-    score += min(funding_score, 20)
-    
-    # Technographic: Tech adoption (+15 max)
-    tech_keywords = ['in vitro', '3d model', 'organ-on-chip', 'spheroid', 'nam', 'new approach methodologies']
-    tech_score = sum(5 for keyword in tech_keywords if keyword in text_content)
-    score += min(tech_score, 15)
-    
-    # Location: Hub detection (+10 max)
-    hub_locations = ['boston', 'cambridge', 'bay area', 'basel', 'san francisco', 'uk']
-    location_score = sum(5 for loc in hub_locations if loc in text_content)
-    score += min(location_score, 10)
-    
-    # Scientific Intent: Publication indicators (+40 max)
-    science_keywords = ['publication', 'published', 'research', 'dili', 'liver injury', 'toxicity']
-    science_score = sum(8 for keyword in science_keywords if keyword in text_content)
-    score += min(science_score, 40)
-    
-    # Bonus: Has LinkedIn profile (+5)
-    if data.get('linkedin_urls'):
-        score += 5
-    
-    # Bonus: Has business email (+5)
-    emails = data.get('emails', [])
-    if any('@' in email and not any(x in email.lower() for x in ['gmail', 'yahoo', 'hotmail']) for email in emails):
-        score += 5
-    
-    return min(score, 100)  # Cap at 100
+    return get_propensity_scorer().score(data)
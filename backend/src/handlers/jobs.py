@@ -0,0 +1,87 @@
+# backend/src/handlers/jobs.py
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from src.handlers.handle import parse_domains
+from src.utils.job_queue import FINISHED as QUEUE_FINISHED, durable_jobs_enabled, get_job_queue
+from src.utils.jobs import get_job_manager
+
+router = APIRouter()
+
+
+class JobRequest(BaseModel):
+    input: str
+    max_results: int = 200
+    # comma-separated source domains as for /scrape/stream; "all" or empty = no restriction
+    domains: Optional[str] = None
+
+
+def _get_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
+
+
+def _found(value):
+    if value is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return value
+
+
+@router.post("/jobs", status_code=202)
+def create_job(req: JobRequest):
+    """Start a scrape in the background and return its id at once.
+
+    With JOB_BACKEND=queue the job goes to the durable queue for `python -m src.worker`.
+    """
+    allowed_sources = parse_domains(req.domains)
+    if durable_jobs_enabled():
+        job_id = get_job_queue().enqueue(req.input, {"max_results": req.max_results, "allowed_sources": allowed_sources})
+        return {"id": job_id, "status": "queued"}
+    job = get_job_manager().submit(req.input, max_results=req.max_results, allowed_sources=allowed_sources)
+    return {"id": job.id, "status": job.status}
+
+
+@router.get("/jobs")
+def list_jobs():
+    if durable_jobs_enabled():
+        return {"jobs": get_job_queue().list_jobs()}
+    return {"jobs": get_job_manager().list_jobs()}
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str, preview: int = 20):
+    """Status, percent, the latest results found so far, recent errors and timings."""
+    if durable_jobs_enabled():
+        return _found(get_job_queue().status_dict(job_id, preview=max(0, min(preview, 100))))
+    return _get_job(job_id).status_dict(preview=max(0, min(preview, 100)))
+
+
+@router.get("/jobs/{job_id}/results")
+def get_job_results(job_id: str, offset: int = 0, limit: int = 100):
+    if durable_jobs_enabled():
+        return _found(get_job_queue().page(job_id, offset=offset, limit=limit))
+    return _get_job(job_id).page(offset=offset, limit=limit)
+
+
+@router.delete("/jobs/{job_id}")
+def delete_job(job_id: str):
+    """Cancel a running job; a finished one is forgotten."""
+    if durable_jobs_enabled():
+        queue = get_job_queue()
+        status = _found(queue.status_dict(job_id, preview=0))["status"]
+        if status in QUEUE_FINISHED:
+            queue.delete(job_id)
+            return {"id": job_id, "status": status, "deleted": True}
+        status = queue.cancel(job_id)
+        return {"id": job_id, "status": "cancelling" if status == "running" else status, "deleted": False}
+    manager = get_job_manager()
+    job = _get_job(job_id)
+    if job.finished:
+        manager.delete(job_id)
+        return {"id": job_id, "status": job.status, "deleted": True}
+    manager.cancel(job_id)
+    return {"id": job_id, "status": "cancelling", "deleted": False}
@@ -0,0 +1,280 @@
+"""Long-lived Chromium pool for the Playwright deep crawler.
+
+Launching `sync_playwright()` plus Chromium for every start URL costs seconds
+of startup and a burst of RSS per crawl. `BrowserPool` keeps BROWSER_POOL_SIZE
+browsers alive and hands out short-lived, isolated browser contexts instead
+(fresh cookies/storage per lease; contexts are cheap).
+
+Playwright's sync API is bound to the thread that started it, so every browser
+is owned by one worker thread and leased work runs *on* that thread:
+`pool.run(fn)` queues `fn(context)`, blocks, and returns its result. The number
+of threads is therefore also the cap on concurrently open contexts.
+
+Before each lease the browser is health-checked (`is_connected()`) and
+relaunched if Chromium died. After a lease a browser is recycled once it has
+served BROWSER_POOL_MAX_PAGES main-frame navigations, or once its own process
+tree (the Playwright driver its slot started, and the Chromium under it)
+exceeds BROWSER_POOL_MAX_RSS_MB. The RSS check needs psutil.
+"""
+import concurrent.futures
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+# serializes driver starts so each slot can tell which new child process is its own
+_driver_start_lock = threading.Lock()
+
+
+def _child_pids() -> Optional[set]:
+    """PIDs of this process's direct children, or None without psutil."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return {child.pid for child in psutil.Process().children()}
+    except psutil.Error:
+        return None
+
+
+def _process_tree_rss_mb(pids: List[int]) -> Optional[float]:
+    """RSS of the given processes and all their descendants, or None without psutil."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    total = 0
+    for pid in pids:
+        try:
+            root = psutil.Process(pid)
+            procs = [root, *root.children(recursive=True)]
+        except psutil.Error:
+            continue
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+    return total / 2 ** 20
+
+
+class _BrowserSlot:
+    def __init__(self, index: int):
+        self.index = index
+        self.playwright = None
+        self.browser = None
+        self.pages = 0
+        self.leases = 0
+        self.launched_at = 0.0
+        self.driver_pids: List[int] = []  # the Playwright driver this slot started; Chromium runs under it
+
+
+class BrowserPool:
+    def __init__(self, size: int = 2, max_pages_per_browser: int = 200, max_rss_mb: float = 1024,
+                 launch_options: Optional[Dict[str, Any]] = None, context_options: Optional[Dict[str, Any]] = None):
+        self.size = max(1, size)
+        self.max_pages_per_browser = max(1, max_pages_per_browser)
+        self.max_rss_mb = max_rss_mb
+        self.launch_options = dict(launch_options or {"headless": True})
+        self.context_options = dict(context_options or {"user_agent": DEFAULT_USER_AGENT})
+        self._tasks: "queue.Queue" = queue.Queue()
+        self._slots = [_BrowserSlot(i) for i in range(self.size)]
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._counters = {"leases": 0, "launches": 0, "recycles": 0, "health_failures": 0, "errors": 0}
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += n
+
+    def _start_threads(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for slot in self._slots:
+                t = threading.Thread(target=self._serve, args=(slot,), name=f"browser-pool-{slot.index}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> concurrent.futures.Future:
+        """Queue `fn(context, *args, **kwargs)` on a pooled browser; the future carries its result."""
+        if self._closed:
+            raise RuntimeError("browser pool is shut down")
+        self._start_threads()
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        self._tasks.put((fut, fn, args, kwargs))
+        return fut
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `fn(context, *args, **kwargs)` in a fresh context on a pooled browser and return its result."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    # -- browser thread -------------------------------------------------
+
+    def _launch(self, slot: _BrowserSlot) -> None:
+        if slot.playwright is None:
+            from playwright.sync_api import sync_playwright
+
+            with _driver_start_lock:
+                before = _child_pids()
+                slot.playwright = sync_playwright().start()
+                after = _child_pids()
+            slot.driver_pids = sorted(after - before) if before is not None and after is not None else []
+        started = time.monotonic()
+        slot.browser = slot.playwright.chromium.launch(**self.launch_options)
+        slot.pages = 0
+        slot.launched_at = time.time()
+        self._count("launches")
+        logger.info("Browser pool %d: launched Chromium in %.2fs", slot.index, time.monotonic() - started)
+
+    def _close_browser(self, slot: _BrowserSlot) -> None:
+        browser, slot.browser = slot.browser, None
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception:
+                logger.debug("Browser pool %d: close failed", slot.index, exc_info=True)
+
+    def _stop_playwright(self, slot: _BrowserSlot) -> None:
+        self._close_browser(slot)
+        pw, slot.playwright = slot.playwright, None
+        slot.driver_pids = []
+        if pw is not None:
+            try:
+                pw.stop()
+            except Exception:
+                logger.debug("Browser pool %d: playwright stop failed", slot.index, exc_info=True)
+
+    def _ensure_healthy(self, slot: _BrowserSlot) -> None:
+        if slot.browser is not None:
+            try:
+                if slot.browser.is_connected():
+                    return
+            except Exception:
+                pass
+            logger.warning("Browser pool %d: browser disconnected; relaunching", slot.index)
+            self._count("health_failures")
+            # the driver may be gone too; start from scratch
+            self._stop_playwright(slot)
+        self._launch(slot)
+
+    def _should_recycle(self, slot: _BrowserSlot) -> Optional[str]:
+        if slot.pages >= self.max_pages_per_browser:
+            return f"{slot.pages} pages"
+        if self.max_rss_mb and slot.driver_pids:
+            rss = _process_tree_rss_mb(slot.driver_pids)
+            if rss is not None and rss > self.max_rss_mb:
+                return f"{rss:.0f} MiB"
+        return None
+
+    def _serve(self, slot: _BrowserSlot) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                self._stop_playwright(slot)
+                return
+            fut, fn, args, kwargs = task
+            if not fut.set_running_or_notify_cancel():
+                continue
+            context = None
+            try:
+                self._ensure_healthy(slot)
+                context = slot.browser.new_context(**self.context_options)
+
+                def _count_navigation(frame, _slot=slot):
+                    if frame.parent_frame is None:
+                        _slot.pages += 1
+
+                context.on("page", lambda page: page.on("framenavigated", _count_navigation))
+                slot.leases += 1
+                self._count("leases")
+                fut.set_result(fn(context, *args, **kwargs))
+            except BaseException as e:
+                self._count("errors")
+                if not fut.done():
+                    fut.set_exception(e)
+            finally:
+                if context is not None:
+                    try:
+                        context.close()
+                    except Exception:
+                        pass
+            reason = self._should_recycle(slot)
+            if reason:
+                logger.info("Browser pool %d: recycling browser after %s", slot.index, reason)
+                self._count("recycles")
+                self._close_browser(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "size": self.size,
+            "queued": self._tasks.qsize(),
+            "max_pages_per_browser": self.max_pages_per_browser,
+            "max_rss_mb": self.max_rss_mb,
+            "browsers": [
+                {"index": s.index, "running": s.browser is not None, "pages": s.pages, "leases": s.leases,
+                 "launched_at": s.launched_at}
+                for s in self._slots
+            ],
+            **counters,
+        }
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Close all browsers; queued leases that have not started are cancelled."""
+        self._closed = True
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                task[0].cancel()
+        for _ in self._threads:
+            self._tasks.put(None)
+        for t in self._threads:
+            t.join(timeout)
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def browser_pool_enabled() -> bool:
+    """Pooling is the default; DEEP_BROWSER_POOL=0 restores one browser launch per crawl."""
+    return os.getenv("DEEP_BROWSER_POOL", "1").lower() in ("1", "true", "yes")
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool(
+                    size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+                    max_pages_per_browser=int(os.getenv("BROWSER_POOL_MAX_PAGES", "200")),
+                    max_rss_mb=float(os.getenv("BROWSER_POOL_MAX_RSS_MB", "1024")),
+                )
+    return _pool
+
+
+def shutdown_browser_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
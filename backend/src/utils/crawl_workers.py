@@ -0,0 +1,482 @@
+"""Crawl worker processes that keep Scrapy and Playwright out of the API process.
+
+`CrawlWorkerPool` runs crawls in separate processes (spawned, so each gets a
+fresh interpreter, its own Twisted reactor / Chromium and its own GIL). Each
+worker is driven over a duplex pipe by one dispatcher thread in the parent:
+
+- jobs are `(job_id, "module:function", kwargs)`. The worker calls
+  `function(emit, **kwargs)`; `emit(kind, data)` streams messages such as
+  scraped items or deep-crawl events back while the job runs, and the return
+  value arrives in a final "done" message;
+- a worker retires itself after CRAWL_WORKER_MAX_JOBS jobs, or once its RSS
+  (including child processes such as Chromium) exceeds
+  CRAWL_WORKER_MAX_RSS_MB. It says so ahead of the job's "done" message,
+  and the dispatcher starts a replacement before the next job;
+- a worker that dies mid-job, or overruns the job timeout, is killed and
+  replaced. A crashed job is retried once on a fresh worker if it had not
+  streamed anything yet, otherwise its future fails with CrawlWorkerCrashed.
+
+`crawl_url`, `crawl_urls` and `crawl_people_deep` mirror the in-process
+functions so callers can switch with CRAWL_ISOLATION=process (see
+`src/handlers/handle.py`). Pool size: CRAWL_WORKERS (default: CPUs, max 4).
+"""
+import concurrent.futures
+import importlib
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+CRAWL_TIMEOUT = int(os.getenv("CRAWL_TIMEOUT", "120"))
+# Extra time allowed past a job's own timeout before the worker is considered stuck.
+JOB_GRACE_S = float(os.getenv("CRAWL_WORKER_GRACE_S", "30"))
+
+MessageCallback = Callable[[str, Any], None]
+
+
+class CrawlWorkerError(RuntimeError):
+    """A job raised inside the worker; the message carries the remote traceback."""
+
+
+class CrawlWorkerCrashed(RuntimeError):
+    """The worker process died or was killed while running the job."""
+
+
+def _proc_tree_pids(root: int) -> List[int]:
+    """`root` and its descendants, from the parent pids in /proc (Linux)."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # the command name may contain spaces; fields after it are fixed
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    pids, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, ()))
+    return pids
+
+
+def _rss_mb() -> float:
+    """Resident memory of this process and its children (Chromium, the Playwright driver), in MiB."""
+    try:
+        import psutil
+
+        proc = psutil.Process()
+        rss = proc.memory_info().rss
+        for child in proc.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        pids = _proc_tree_pids(os.getpid())
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+    pages = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                pages += int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            pass
+    return pages * page_size / 2 ** 20
+
+
+def _resolve(target: str) -> Callable:
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _worker_main(conn, worker_id: int, max_jobs: int, max_rss_mb: float) -> None:
+    """Worker process entry point: run jobs from `conn` until told to stop or retired."""
+    # Ctrl-C is handled by the parent, which stops workers explicitly.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=os.getenv("CRAWL_WORKER_LOG_LEVEL", "INFO"),
+        format=f"%(asctime)s %(levelname)s crawl-worker-{worker_id} %(name)s - %(message)s",
+    )
+    send_lock = threading.Lock()
+
+    def send(msg) -> None:
+        # emit() may be called from the reactor thread while the main thread is idle
+        with send_lock:
+            conn.send(msg)
+
+    send(("ready", None, os.getpid()))
+    jobs_done = 0
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        job_id, target, kwargs = job
+        try:
+            func = _resolve(target)
+            reply = ("done", job_id, func(lambda kind, data, _id=job_id: send((kind, _id, data)), **kwargs))
+        except Exception:
+            reply = ("error", job_id, traceback.format_exc())
+        jobs_done += 1
+        rss = _rss_mb()
+        retire = jobs_done >= max_jobs or (max_rss_mb and rss > max_rss_mb)
+        if retire:
+            # before the job's final message, so the dispatcher knows before it hands out the next job
+            send(("retire", job_id, {"jobs": jobs_done, "rss_mb": round(rss, 1)}))
+        try:
+            send(reply)
+        except Exception:
+            send(("error", job_id, traceback.format_exc()))
+        if retire:
+            break
+    conn.close()
+
+
+def _job_crawl_urls(emit, urls: List[str], timeout: Optional[float] = None) -> int:
+    from src.utils.scrapy_ok import crawl_urls
+
+    items = crawl_urls(urls, on_item=lambda url, item: emit("item", (url, item)), timeout=timeout)
+    return len(items)
+
+
+def _job_crawl_people_deep(emit, start_url: str, config=None) -> List[Dict[str, Any]]:
+    from src.utils.playwright_deep import crawl_people_deep
+
+    return crawl_people_deep(start_url, config=config, progress_callback=lambda evt: emit("event", evt))
+
+
+class _Job:
+    _ids = itertools.count(1)
+
+    def __init__(self, target: str, kwargs: Dict[str, Any], on_message: Optional[MessageCallback], timeout: Optional[float]):
+        self.id = next(self._ids)
+        self.target = target
+        self.kwargs = kwargs
+        self.on_message = on_message
+        self.timeout = timeout
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.attempts = 0
+        self.streamed = 0
+
+
+class _Worker:
+    def __init__(self, pool: "CrawlWorkerPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.pid: Optional[int] = None
+        self.jobs = 0
+        self.started_at = 0.0
+        self.retiring = False
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def ensure_started(self) -> None:
+        if self.retiring or (self.process is not None and not self.alive()):
+            self.stop()
+        if self.process is not None:
+            return
+        ctx = self.pool.context
+        parent_conn, child_conn = ctx.Pipe(duplex=True)
+        proc = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.index, self.pool.max_jobs_per_worker, self.pool.max_rss_mb),
+            name=f"crawl-worker-{self.index}",
+            daemon=True,
+        )
+        proc.start()
+        child_conn.close()
+        if not parent_conn.poll(self.pool.startup_timeout_s):
+            proc.kill()
+            raise CrawlWorkerCrashed(f"crawl worker {self.index} did not start in time")
+        kind, _, pid = parent_conn.recv()
+        self.process, self.conn, self.pid = proc, parent_conn, pid
+        self.jobs = 0
+        self.started_at = time.time()
+        self.retiring = False
+        self.pool._count("spawned")
+        logger.info("Crawl worker %d started (pid %s)", self.index, pid)
+
+    def stop(self, kill: bool = False, timeout: float = 5.0) -> None:
+        proc, conn = self.process, self.conn
+        self.process = self.conn = self.pid = None
+        if proc is None:
+            return
+        if not kill and proc.is_alive():
+            try:
+                conn.send(None)
+            except (OSError, EOFError, BrokenPipeError):
+                pass
+            proc.join(timeout)
+        if proc.is_alive():
+            proc.kill()
+            proc.join(timeout)
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def drain(self) -> None:
+        """Consume messages left over from the previous job (e.g. a retire notice)."""
+        if self.conn is None:
+            return
+        try:
+            while self.conn.poll(0):
+                kind, _, data = self.conn.recv()
+                if kind == "retire":
+                    logger.info("Crawl worker %d retiring: %s", self.index, data)
+                    self.pool._count("recycled")
+                    self.retiring = True
+        except (EOFError, OSError):
+            self.stop(kill=True)
+
+
+class CrawlWorkerPool:
+    def __init__(self, size: int = 2, max_jobs_per_worker: int = 50, max_rss_mb: float = 1536,
+                 startup_timeout_s: float = 60.0, start_method: str = "spawn", crash_retries: int = 1):
+        self.size = max(1, size)
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self.max_rss_mb = max_rss_mb
+        self.startup_timeout_s = startup_timeout_s
+        self.crash_retries = crash_retries
+        self.context = multiprocessing.get_context(start_method)
+        self._jobs: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._workers = [_Worker(self, i) for i in range(self.size)]
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "crashed": 0, "timeouts": 0,
+                          "spawned": 0, "recycled": 0, "retried": 0}
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += n
+
+    def _start_dispatchers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for worker in self._workers:
+                t = threading.Thread(target=self._dispatch, args=(worker,), name=f"crawl-dispatch-{worker.index}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, target: str, kwargs: Optional[Dict[str, Any]] = None, on_message: Optional[MessageCallback] = None,
+               timeout: Optional[float] = None) -> concurrent.futures.Future:
+        """Queue `target(emit, **kwargs)` ("module:function") to run on a worker process.
+
+        `on_message(kind, data)` is called on a dispatcher thread for every
+        message the job emits. The future resolves to the job's return value, or
+        fails with CrawlWorkerError / CrawlWorkerCrashed / TimeoutError.
+        """
+        if self._closed:
+            raise RuntimeError("crawl worker pool is shut down")
+        self._start_dispatchers()
+        job = _Job(target, dict(kwargs or {}), on_message, timeout)
+        self._count("submitted")
+        self._jobs.put(job)
+        return job.future
+
+    def _dispatch(self, worker: _Worker) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                worker.stop()
+                return
+            if job.attempts == 0 and not job.future.set_running_or_notify_cancel():
+                continue
+            job.attempts += 1
+            try:
+                self._run(worker, job)
+            except Exception as e:
+                logger.exception("Crawl worker %d failed to run job %d", worker.index, job.id)
+                worker.stop(kill=True)
+                self._fail(job, e)
+
+    def _fail(self, job: _Job, exc: BaseException) -> None:
+        if not job.future.done():
+            job.future.set_exception(exc)
+        self._count("failed")
+
+    def _run(self, worker: _Worker, job: _Job) -> None:
+        worker.drain()
+        worker.ensure_started()
+        worker.conn.send((job.id, job.target, job.kwargs))
+        worker.jobs += 1
+        deadline = None if job.timeout is None else time.monotonic() + job.timeout
+
+        while True:
+            wait = 1.0 if deadline is None else min(1.0, max(0.0, deadline - time.monotonic()))
+            try:
+                ready = worker.conn.poll(wait)
+                msg = worker.conn.recv() if ready else None
+            except (EOFError, OSError):
+                ready, msg = True, None
+
+            if msg is None:
+                if ready or not worker.alive():
+                    self._crashed(worker, job)
+                    return
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.warning("Crawl job %d overran %ss on worker %d; killing it", job.id, job.timeout, worker.index)
+                    worker.stop(kill=True)
+                    self._count("timeouts")
+                    self._fail(job, TimeoutError(f"crawl job {job.id} timed out after {job.timeout}s"))
+                    return
+                continue
+
+            kind, job_id, data = msg
+            if kind == "retire":
+                worker.retiring = True
+                self._count("recycled")
+                continue
+            if job_id != job.id:
+                continue
+            if kind == "done":
+                job.future.set_result(data)
+                self._count("completed")
+                return
+            if kind == "error":
+                self._fail(job, CrawlWorkerError(data))
+                return
+            job.streamed += 1
+            if job.on_message is not None:
+                try:
+                    job.on_message(kind, data)
+                except Exception:
+                    logger.exception("on_message callback failed for crawl job %d", job.id)
+
+    def _crashed(self, worker: _Worker, job: _Job) -> None:
+        exitcode = worker.process.exitcode if worker.process is not None else None
+        logger.error("Crawl worker %d (pid %s) died running job %d (exit code %s)", worker.index, worker.pid, job.id, exitcode)
+        worker.stop(kill=True)
+        self._count("crashed")
+        if job.streamed == 0 and job.attempts <= self.crash_retries and not self._closed:
+            self._count("retried")
+            self._jobs.put(job)
+            return
+        self._fail(job, CrawlWorkerCrashed(f"crawl worker died running job {job.id} (exit code {exitcode})"))
+
+    def crawl_urls(self, urls: List[str], on_item: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                   timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Process-isolated `scrapy_ok.crawl_urls`: same arguments, same partial-results-on-failure behavior."""
+        urls = [u for u in dict.fromkeys(urls or []) if u]
+        if not urls:
+            return []
+        crawl_timeout = CRAWL_TIMEOUT if timeout is None else timeout
+        items: List[Dict[str, Any]] = []
+
+        def on_message(kind, data):
+            if kind != "item":
+                return
+            url, item = data
+            items.append(item)
+            if on_item is not None:
+                on_item(url, item)
+
+        fut = self.submit("src.utils.crawl_workers:_job_crawl_urls", {"urls": urls, "timeout": crawl_timeout},
+                          on_message=on_message, timeout=crawl_timeout + JOB_GRACE_S)
+        try:
+            fut.result()
+        except Exception as e:
+            logger.warning("Isolated crawl of %d URLs failed: %s", len(urls), e)
+        return list(items)
+
+    def crawl_url(self, start_url: str, settings=None, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Process-isolated `scrapy_ok.crawl_url` (custom Scrapy settings are not forwarded)."""
+        return self.crawl_urls([start_url], timeout=timeout)
+
+    def crawl_people_deep(self, start_url: str, *, config=None, progress_callback=None) -> List[Dict[str, Any]]:
+        """Process-isolated `playwright_deep.crawl_people_deep`; raises if the worker fails."""
+        def on_message(kind, data):
+            if kind == "event" and progress_callback is not None:
+                progress_callback(data)
+
+        total_timeout_s = getattr(config, "total_timeout_s", 120)
+        fut = self.submit("src.utils.crawl_workers:_job_crawl_people_deep", {"start_url": start_url, "config": config},
+                          on_message=on_message, timeout=total_timeout_s + JOB_GRACE_S)
+        return fut.result() or []
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "size": self.size,
+            "queued": self._jobs.qsize(),
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+            "max_rss_mb": self.max_rss_mb,
+            "workers": [
+                {"index": w.index, "pid": w.pid, "alive": w.alive(), "jobs": w.jobs, "started_at": w.started_at}
+                for w in self._workers
+            ],
+            **counters,
+        }
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop dispatchers and worker processes; queued jobs that have not started are cancelled."""
+        self._closed = True
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.future.cancel()
+        for _ in self._threads:
+            self._jobs.put(None)
+        for t in self._threads:
+            t.join(timeout)
+        for worker in self._workers:
+            worker.stop(timeout=timeout)
+
+
+_pool: Optional[CrawlWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def process_isolation_enabled() -> bool:
+    """True when CRAWL_ISOLATION=process asks for crawls to run in worker processes."""
+    return os.getenv("CRAWL_ISOLATION", "thread").lower() == "process"
+
+
+def get_crawl_pool() -> CrawlWorkerPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = CrawlWorkerPool(
+                    size=int(os.getenv("CRAWL_WORKERS", str(min(4, os.cpu_count() or 1)))),
+                    max_jobs_per_worker=int(os.getenv("CRAWL_WORKER_MAX_JOBS", "50")),
+                    max_rss_mb=float(os.getenv("CRAWL_WORKER_MAX_RSS_MB", "1536")),
+                )
+    return _pool
+
+
+def shutdown_crawl_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,171 @@
+"""Long-lived Twisted reactor service for Scrapy crawls.
+
+Twisted's reactor can only be started once per process, so calling
+`reactor.run()`/`reactor.stop()` per crawl breaks every crawl after the first.
+`CrawlerService` instead starts the reactor once, on a dedicated daemon thread,
+and keeps it running for the life of the process. Crawl jobs can be submitted
+from any thread; each submission returns a `concurrent.futures.Future` that
+resolves to the finished `Crawler` (its spider's collector holds the items).
+
+Scrapy/Twisted are imported lazily so importing this module never installs a
+reactor as a side effect.
+"""
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlerService:
+    def __init__(self, settings=None):
+        """`settings` is a scrapy Settings object (or None for project settings)."""
+        self._settings = settings
+        self._lock = threading.Lock()
+        self._started = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reactor = None
+        self._runner = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._started.is_set() and self._error is None
+
+    def start(self, timeout: float = 30.0) -> None:
+        """Start the reactor thread if needed and wait until the reactor is running."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="crawler-reactor", daemon=True)
+                self._thread.start()
+        if not self._started.wait(timeout):
+            raise RuntimeError("Twisted reactor did not start in time")
+        if self._error is not None:
+            raise RuntimeError(f"Twisted reactor failed to start: {self._error}")
+
+    def _run(self) -> None:
+        try:
+            from scrapy.crawler import CrawlerRunner
+            from scrapy.utils.project import get_project_settings
+
+            settings = self._settings if self._settings is not None else get_project_settings()
+            reactor_path = settings.get("TWISTED_REACTOR")
+            if reactor_path:
+                # Installing inside this thread also binds the asyncio event loop
+                # (for AsyncioSelectorReactor) to the thread that will run it.
+                from scrapy.utils.reactor import install_reactor
+                from twisted.internet.error import ReactorAlreadyInstalledError
+                try:
+                    install_reactor(reactor_path, settings.get("ASYNCIO_EVENT_LOOP"))
+                except ReactorAlreadyInstalledError:
+                    logger.warning("A Twisted reactor was already installed; using it instead of %s", reactor_path)
+
+            from twisted.internet import reactor
+
+            self._settings = settings
+            self._reactor = reactor
+            self._runner = CrawlerRunner(settings)
+            reactor.callWhenRunning(self._started.set)  # type: ignore[attr-defined]
+            logger.info("Crawler service: starting reactor %s", type(reactor).__name__)
+            reactor.run(installSignalHandlers=False)  # type: ignore[attr-defined]
+            logger.info("Crawler service: reactor stopped")
+        except BaseException as e:
+            logger.exception("Crawler service: reactor thread failed")
+            self._error = e
+            self._started.set()
+
+    def submit(self, spidercls, settings: Optional[Dict[str, Any]] = None, **spider_kwargs) -> concurrent.futures.Future:
+        """Schedule `spidercls` on the shared reactor; thread-safe.
+
+        `settings` optionally overrides the service settings for this crawl only.
+        The returned future resolves to the Crawler once the crawl finishes, or
+        carries the crawl's exception. The future's `crawler` attribute is set as
+        soon as the crawl is scheduled so it can be stopped early with `stop()`.
+        """
+        self.start()
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        fut.crawler = None  # type: ignore[attr-defined]
+
+        def _schedule():
+            if not fut.set_running_or_notify_cancel():
+                return
+            try:
+                from scrapy.crawler import Crawler
+
+                crawl_settings = self._settings
+                if settings:
+                    crawl_settings = self._settings.copy()
+                    crawl_settings.setdict(settings, priority="cmdline")
+                crawler = Crawler(spidercls, crawl_settings)
+                fut.crawler = crawler  # type: ignore[attr-defined]
+                d = self._runner.crawl(crawler, **spider_kwargs)
+            except Exception as e:
+                fut.set_exception(e)
+                return
+
+            def _ok(_):
+                if not fut.done():
+                    fut.set_result(crawler)
+
+            def _err(failure):
+                if not fut.done():
+                    fut.set_exception(failure.value)
+
+            d.addCallbacks(_ok, _err)
+
+        self._reactor.callFromThread(_schedule)  # type: ignore[union-attr]
+        return fut
+
+    def stop(self, fut: concurrent.futures.Future) -> None:
+        """Ask the crawl behind `fut` to stop (e.g. after the caller timed out)."""
+        crawler = getattr(fut, "crawler", None)
+        if not fut.cancel() and crawler is not None and self._reactor is not None:
+            self._reactor.callFromThread(self._stop_crawler, crawler)
+
+    @staticmethod
+    def _stop_crawler(crawler) -> None:
+        stop_async = getattr(crawler, "stop_async", None)  # Scrapy 2.13+; stop() is deprecated there
+        if stop_async is None:
+            crawler.stop()
+            return
+        from scrapy.utils.defer import deferred_from_coro
+
+        deferred_from_coro(stop_async()).addErrback(lambda f: logger.error("Stopping a crawl failed: %s", f.value))
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop all crawls and the reactor. The reactor cannot be started again afterwards."""
+        if not self.running:
+            return
+
+        def _stop():
+            d = self._runner.stop()
+            d.addBoth(lambda _: self._reactor.stop())
+
+        self._reactor.callFromThread(_stop)
+        self._thread.join(timeout)
+
+
+_service: Optional[CrawlerService] = None
+_service_lock = threading.Lock()
+
+
+def get_crawler_service() -> CrawlerService:
+    """Return the process-wide crawler service (created with the project spider settings)."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from src.utils.scrapy_ok import _load_spider_settings
+                _service = CrawlerService(_load_spider_settings())
+    return _service
+
+
+def shutdown_crawler_service() -> None:
+    """Stop the process-wide service's crawls and reactor (and any scrapy-playwright browser); for app shutdown."""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.shutdown()
+            _service = None
@@ -1,13 +1,22 @@
 import warnings
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import logging
-import requests
 import os
+import time
+
+from src.utils import http_client
+from src.utils.search_cache import get_search_cache
+from src.utils.search_health import get_backend_registry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Silence the library's rename notice (duckduckgo_search -> ddgs). Set once at import
+# because searches run on worker threads, where catch_warnings() is not reliable.
+warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*renamed to.*")
+
 # Attempt imports with compatibility handling
 try:
     from ddgs import DDGS
@@ -30,7 +39,7 @@ def _search_wikipedia_opensearch(query, limit=10):
             "namespace": 0,
             "format": "json"
         }
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         data = response.json()
         results = []
@@ -46,61 +55,57 @@ def _search_wikipedia_opensearch(query, limit=10):
         return []
 
 
+class BackendUnavailable(RuntimeError):
+    """Raised by a search backend that cannot serve requests (e.g. missing API key)."""
+
+
+# Google and Bing raise on failure instead of returning [] so the backend health
+# registry can count errors and open the circuit; callers log and skip them.
 def _search_google(query, limit=10):
     """Search using Google Custom Search API."""
     api_key = os.getenv("GOOGLE_API_KEY")
     cse_id = os.getenv("GOOGLE_CSE_ID")
     if not api_key or not cse_id:
-        logger.warning("Google API key or CSE ID not set, skipping Google search")
-        return []
-    try:
-        url = "https://www.googleapis.com/customsearch/v1"
-        params = {
-            "key": api_key,
-            "cx": cse_id,
-            "q": query,
-            "num": limit
-        }
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        results = []
-        for item in data.get("items", []):
-            results.append({
-                "title": item.get("title", ""),
-                "body": item.get("snippet", ""),
-                "href": item.get("link", "")
-            })
-        return results
-    except Exception as e:
-        logger.warning(f"Google search failed: {e}")
-        return []
+        raise BackendUnavailable("Google API key or CSE ID not set")
+    url = "https://www.googleapis.com/customsearch/v1"
+    params = {
+        "key": api_key,
+        "cx": cse_id,
+        "q": query,
+        "num": limit
+    }
+    response = http_client.get(url, params=params)
+    response.raise_for_status()
+    data = response.json()
+    results = []
+    for item in data.get("items", []):
+        results.append({
+            "title": item.get("title", ""),
+            "body": item.get("snippet", ""),
+            "href": item.get("link", "")
+        })
+    return results
 
 
 def _search_bing(query, limit=10):
     """Search using Bing Search API."""
     api_key = os.getenv("BING_API_KEY")
     if not api_key:
-        logger.warning("Bing API key not set, skipping Bing search")
-        return []
-    try:
-        url = "https://api.bing.microsoft.com/v7.0/search"
-        headers = {"Ocp-Apim-Subscription-Key": api_key}
-        params = {"q": query, "count": limit}
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        results = []
-        for item in data.get("webPages", {}).get("value", []):
-            results.append({
-                "title": item.get("name", ""),
-                "body": item.get("snippet", ""),
-                "href": item.get("url", "")
-            })
-        return results
-    except Exception as e:
-        logger.warning(f"Bing search failed: {e}")
-        return []
+        raise BackendUnavailable("Bing API key not set")
+    url = "https://api.bing.microsoft.com/v7.0/search"
+    headers = {"Ocp-Apim-Subscription-Key": api_key}
+    params = {"q": query, "count": limit}
+    response = http_client.get(url, headers=headers, params=params)
+    response.raise_for_status()
+    data = response.json()
+    results = []
+    for item in data.get("webPages", {}).get("value", []):
+        results.append({
+            "title": item.get("name", ""),
+            "body": item.get("snippet", ""),
+            "href": item.get("url", "")
+        })
+    return results
 
 
 # List of search backends
@@ -114,30 +119,190 @@ SEARCH_BACKENDS = [
     ("bing", _search_bing),
 ]
 
+# Record mode: capture every backend response to fixtures for offline replay
+# and benchmarking (see src/utils/search_replay.py).
+SEARCH_RECORD_DIR = os.getenv("SEARCH_RECORD_DIR", "")
+if SEARCH_RECORD_DIR:
+    from src.utils.search_replay import recording_backend, recording_backends
+    SEARCH_BACKENDS = recording_backends(SEARCH_BACKENDS, SEARCH_RECORD_DIR)
+    _search_wikipedia_opensearch = recording_backend(SEARCH_RECORD_DIR, "wikipedia", _search_wikipedia_opensearch)
+
+# Concurrent fan-out across SEARCH_BACKENDS. Each backend gets its own deadline
+# (SEARCH_BACKEND_TIMEOUTS="ddgs=8,google=5" overrides the default per name) and
+# the whole fan-out is capped by SEARCH_BUDGET_S. Late backends are abandoned and
+# whatever already arrived is returned.
+SEARCH_PARALLEL = os.getenv("SEARCH_PARALLEL", "1").lower() in ("1", "true", "yes")
+SEARCH_BACKEND_TIMEOUT_S = float(os.getenv("SEARCH_BACKEND_TIMEOUT_S", "10"))
+SEARCH_BUDGET_S = float(os.getenv("SEARCH_BUDGET_S", "12"))
+
+
+def _parse_backend_timeouts(raw):
+    """Parse "name=seconds,name=seconds" into a dict, ignoring malformed entries."""
+    timeouts = {}
+    for part in (raw or "").split(","):
+        name, _, value = part.partition("=")
+        try:
+            timeouts[name.strip()] = float(value)
+        except ValueError:
+            continue
+    return timeouts
+
+
+SEARCH_BACKEND_TIMEOUTS = _parse_backend_timeouts(os.getenv("SEARCH_BACKEND_TIMEOUTS", ""))
+
+# Max number of per-host site: queries in flight at once when inject_sources=True.
+SEARCH_SITE_CONCURRENCY = int(os.getenv("SEARCH_SITE_CONCURRENCY", "4"))
+
 
-def duck(query, allowed_sources=None, max_results=200, inject_sources=False, focus_people=False):
+def _tag_results(results, backend):
+    """Return copies of `results` tagged with the backend that produced them."""
+    return [{**r, "backend": backend} for r in (results or []) if isinstance(r, dict)]
+
+
+def _call_backend(name, search_func, query, limit):
+    """Call a backend unless its circuit is open, recording latency, errors and yield."""
+    registry = get_backend_registry()
+    if not registry.allow(name):
+        logger.debug("%s circuit open, skipping query '%s'", name, query)
+        return []
+    started = time.monotonic()
+    try:
+        results = list(search_func(query))[:limit]
+    except Exception as e:
+        registry.record_failure(name, time.monotonic() - started, str(e))
+        raise
+    registry.record_success(name, time.monotonic() - started, len(results))
+    return results
+
+
+def _cached_search(name, search_func, query, limit):
+    """Call a backend through the on-disk search cache when it is enabled."""
+    cache = get_search_cache()
+    if cache is None:
+        return _call_backend(name, search_func, query, limit)
+    return cache.fetch(name, query, limit, lambda: _call_backend(name, search_func, query, limit))
+
+
+def _iter_backend_results(query, per_backend_limit, parallel=True, backend_timeout_s=None, search_budget_s=None):
+    """Yield (backend_name, results) pairs from SEARCH_BACKENDS as each backend returns.
+
+    In parallel mode every backend is queried at once on a small thread pool. A
+    backend that misses its deadline (or the overall budget) is skipped and its
+    thread is left to finish in the background; results are never waited for
+    past the budget.
     """
-    Run a DuckDuckGo search and return results filtered by allowed_sources.
+    # Cheapest backends (latency per useful result) first; matters most in sequential mode.
+    funcs = dict(SEARCH_BACKENDS)
+    backends = [(name, funcs[name]) for name in get_backend_registry().order(funcs)]
 
-    Args:
-        query (str): The search query.
-        allowed_sources (list, optional): List of allowed hostnames/domains. 
-                                          If None, attempts to load from settings.
-        max_results (int): Maximum number of results to fetch.
-        inject_sources (bool): If True and allowed sources are known, add site: clauses to the query.
+    if not parallel or len(backends) <= 1:
+        for name, search_func in backends:
+            try:
+                yield name, _tag_results(_cached_search(name, search_func, query, per_backend_limit), name)
+            except Exception as e:
+                logger.warning(f"{name} search failed: {e}")
+        return
+
+    if backend_timeout_s is None:
+        backend_timeout_s = SEARCH_BACKEND_TIMEOUT_S
+    if search_budget_s is None:
+        search_budget_s = SEARCH_BUDGET_S
+
+    start = time.monotonic()
+    budget_deadline = start + search_budget_s
+    pool = ThreadPoolExecutor(max_workers=len(backends), thread_name_prefix="search")
+    names = {}
+    deadlines = {}
+    try:
+        for name, search_func in backends:
+            fut = pool.submit(_cached_search, name, search_func, query, per_backend_limit)
+            names[fut] = name
+            timeout = SEARCH_BACKEND_TIMEOUTS.get(name, backend_timeout_s)
+            deadlines[fut] = min(start + timeout, budget_deadline)
+
+        pending = set(names)
+        while pending:
+            now = time.monotonic()
+            late = {f for f in pending if deadlines[f] <= now}
+            for f in late:
+                logger.warning("%s search missed its deadline after %.1fs; returning partial results", names[f], now - start)
+            pending -= late
+            if not pending:
+                break
+
+            done, pending = wait(pending, timeout=min(deadlines[f] for f in pending) - now, return_when=FIRST_COMPLETED)
+            for f in done:
+                name = names[f]
+                try:
+                    results = f.result()
+                except Exception as e:
+                    logger.warning(f"{name} search failed: {e}")
+                    continue
+                yield name, _tag_results(results, name)
+    finally:
+        # Never block on stragglers; their results are discarded.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _search_backend(name):
+    """Return the search function registered under `name` in SEARCH_BACKENDS."""
+    for backend_name, search_func in SEARCH_BACKENDS:
+        if backend_name == name:
+            return search_func
+    raise KeyError(f"Unknown search backend: {name}")
+
+
+def _site_queries_for_host(query, host, focus_people=False):
+    """Build the site: queries issued for one normalized host."""
+    # When focusing on people profiles, tweak the site: query per host
+    if focus_people:
+        if 'pubmed' in host or 'ncbi' in host:
+            # PubMed: prefer author pages / articles mentioning authors
+            return [f"{query} site:{host} author" if query else f"site:{host} author"]
+        if 'linkedin' in host:
+            # LinkedIn: prefer profile paths (in/, pub/) for more results
+            return [
+                f"{query} site:{host}/in/" if query else f"site:{host}/in/",
+                f"{query} site:{host}/pub/" if query else f"site:{host}/pub/"
+            ]
+    return [f"{query} site:{host}" if query else f"site:{host}"]
+
+
+def _run_site_query(host, site_query, limit):
+    try:
+        return _tag_results(_cached_search("ddgs", _search_backend("ddgs"), site_query, limit), "ddgs")
+    except Exception as e:
+        logging.warning(f"Error querying {host} with {site_query}: {e}")
+        return []
+
+
+def _iter_site_results(site_jobs, limit, concurrency=None):
+    """Yield (host, site_query, results) for each (host, site_query) job as it completes.
+
+    At most `concurrency` queries are in flight at once. Closing the generator
+    cancels queued queries and abandons in-flight ones, which lets callers stop
+    early once they have enough results.
     """
+    if concurrency is None:
+        concurrency = SEARCH_SITE_CONCURRENCY
 
-    # 1. Resolve Allowed Sources
-    if allowed_sources is None:
-        try:
-            # Lazy import to keep function portable
-            from src.utils import settings as _settings
-            allowed_sources = getattr(_settings, 'SOURCES', None)
-        except ImportError:
-            pass # No settings module found, default to None (allow all)
+    if concurrency <= 1 or len(site_jobs) <= 1:
+        for host, site_query in site_jobs:
+            yield host, site_query, _run_site_query(host, site_query, limit)
+        return
 
-    # 2. Normalize sources early so we can optionally inject site: clauses
-    # Preserve original ordering of allowed_sources and avoid duplicates.
+    pool = ThreadPoolExecutor(max_workers=min(concurrency, len(site_jobs)), thread_name_prefix="site-search")
+    try:
+        jobs = {pool.submit(_run_site_query, host, site_query, limit): (host, site_query) for host, site_query in site_jobs}
+        for fut in as_completed(jobs):
+            host, site_query = jobs[fut]
+            yield host, site_query, fut.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _normalize_sources(allowed_sources):
+    """Normalize allowed_sources to bare hostnames, preserving order and dropping duplicates."""
     normalized_hosts = []
     if allowed_sources:
         _seen_hosts = set()
@@ -151,93 +316,174 @@ def duck(query, allowed_sources=None, max_results=200, inject_sources=False, foc
             if host and host not in _seen_hosts:
                 normalized_hosts.append(host)
                 _seen_hosts.add(host)
+    return normalized_hosts
+
+
+def _host_matches(url_lower, hosts):
+    """Return True if the URL's host is one of `hosts` or a subdomain of one."""
+    try:
+        r_host = urlparse(url_lower).netloc.replace('www.', '').split(':')[0]
+    except Exception:
+        return False
+    return any(r_host == host or r_host.endswith('.' + host) for host in hosts)
+
 
-    # 3. Optionally inject site: clauses to bias results
-    query_to_use = query
+def iter_duck(query, allowed_sources=None, max_results=200, inject_sources=False, focus_people=False,
+              parallel=None, backend_timeout_s=None, search_budget_s=None, site_concurrency=None):
+    """Yield lists of new search results as each backend or site: query returns.
+
+    Takes the same arguments as `duck`. Every yielded batch is already
+    deduplicated against earlier batches and filtered to the allowed hosts, so
+    callers can start acting on the first hits while slower backends are still
+    running. Stops after `max_results` results in total; closing the generator
+    early abandons outstanding queries.
+    """
+    if parallel is None:
+        parallel = SEARCH_PARALLEL
+
+    # 1. Resolve Allowed Sources
+    if allowed_sources is None:
+        try:
+            # Lazy import to keep function portable
+            from src.utils import settings as _settings
+            allowed_sources = getattr(_settings, 'SOURCES', None)
+        except ImportError:
+            pass # No settings module found, default to None (allow all)
+
+    # 2. Normalize sources early so we can optionally inject site: clauses
+    normalized_hosts = _normalize_sources(allowed_sources)
 
-    # Prepare containers for the sequential-source accumulation path
-    filtered = []
     seen_urls = set()
+    emitted = 0
 
-    # 4. Execute search safely
+    # 3. Execute search safely
     try:
-        # Suppress specific runtime warnings from the library
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*renamed to.*")
-
-            with DDGS() as ddgs:
-                # If injecting sources, query each host individually (one site: clause per call)
-                # and accumulate deduplicated results. This avoids issuing a single OR-query
-                # and improves the chance of gathering more leads across multiple domains.
-                if inject_sources and normalized_hosts:
-                    for host in normalized_hosts:
-                        # When focusing on people profiles, tweak the site: query per host
-                        if focus_people:
-                            if 'pubmed' in host or 'ncbi' in host:
-                                # PubMed: prefer author pages / articles mentioning authors
-                                site_queries = [f"{query} site:{host} author" if query else f"site:{host} author"]
-                            elif 'linkedin' in host:
-                                # LinkedIn: prefer profile paths (in/, pub/) for more results
-                                site_queries = [
-                                    f"{query} site:{host}/in/" if query else f"site:{host}/in/",
-                                    f"{query} site:{host}/pub/" if query else f"site:{host}/pub/"
-                                ]
-                            else:
-                                site_queries = [f"{query} site:{host}" if query else f"site:{host}"]
-                        else:
-                            site_queries = [f"{query} site:{host}" if query else f"site:{host}"]
-                        
-                        for site_query in site_queries:
-                            try:
-                                host_results = list(ddgs.text(site_query))[: (max_results + 5)]
-                            except Exception as e:
-                                logging.warning(f"Error querying {host} with {site_query}: {e}")
-                                host_results = []
-                            logging.info(f"Host {host}: {len(host_results)} results from query '{site_query}'")
-                            for r in host_results:
-                                url = r.get('href') or r.get('url')
-                                if not url:
-                                    continue
-                                url_lower = url.lower()
-                                if url_lower in seen_urls:
-                                    continue
-                                try:
-                                    r_parsed = urlparse(url_lower)
-                                    r_host = r_parsed.netloc.replace('www.', '').split(':')[0]
-                                    if r_host == host or r_host.endswith('.' + host):
-                                        filtered.append(r)
-                                        seen_urls.add(url_lower)
-                                except Exception:
-                                    continue
-                                if len(filtered) >= max_results:
-                                    break
-                            if len(filtered) >= max_results:
-                                break
-                else:
-                    # Fetch from multiple backends and aggregate
-                    raw_results = []
-                    seen = set()
-                    for name, search_func in SEARCH_BACKENDS:
-                        try:
-                            backend_results = search_func(query_to_use)[: (max_results // len(SEARCH_BACKENDS) + 5)]
-                            for r in backend_results:
-                                url = r.get('href') or r.get('url')
-                                if url and url not in seen:
-                                    raw_results.append(r)
-                                    seen.add(url)
-                        except Exception as e:
-                            logger.warning(f"{name} search failed: {e}")
-                    raw_results = raw_results[:max_results + 5]
+        # If injecting sources, query each host individually (one site: clause per call)
+        # and accumulate deduplicated results. This avoids issuing a single OR-query
+        # and improves the chance of gathering more leads across multiple domains.
+        # The site: queries run concurrently and are merged in order of arrival.
+        if inject_sources and normalized_hosts:
+            site_jobs = [
+                (host, site_query)
+                for host in normalized_hosts
+                for site_query in _site_queries_for_host(query, host, focus_people)
+            ]
+            source = _iter_site_results(site_jobs, max_results + 5, concurrency=site_concurrency)
+        else:
+            per_backend_limit = max_results // max(len(SEARCH_BACKENDS), 1) + 5
+            source = (
+                (name, None, backend_results)
+                for name, backend_results in _iter_backend_results(
+                    query,
+                    per_backend_limit,
+                    parallel=parallel,
+                    backend_timeout_s=backend_timeout_s,
+                    search_budget_s=search_budget_s,
+                )
+            )
+
+        try:
+            for host, site_query, results in source:
+                if site_query is not None:
+                    logging.info(f"Host {host}: {len(results)} results from query '{site_query}'")
+                # site: results must match their own host; backend results any allowed host
+                match_hosts = [host] if site_query is not None else normalized_hosts
+
+                batch = []
+                for r in results:
+                    if emitted + len(batch) >= max_results:
+                        break
+                    url = r.get('href') or r.get('url')
+                    if not url:
+                        continue
+                    url_lower = url.lower()
+                    if url_lower in seen_urls:
+                        continue
+                    if match_hosts and not _host_matches(url_lower, match_hosts):
+                        continue
+                    batch.append(r)
+                    seen_urls.add(url_lower)
+
+                if batch:
+                    emitted += len(batch)
+                    yield batch
+                if emitted >= max_results:
+                    # Enough results: drop queued queries and stop waiting on in-flight ones
+                    break
+        finally:
+            source.close()
 
     except Exception as e:
         logger.error(f"DuckDuckGo search failed: {e}")
-        return []
 
-    # If no explicit allowed_sources, just return raw results; otherwise return filtered list.
-    if not allowed_sources:
-        return raw_results[:max_results]
 
-    return filtered
+async def aiter_duck(query, **kwargs):
+    """Async-iterator variant of `iter_duck` for use on an asyncio event loop.
+
+    The blocking search runs on the default executor; batches are handed back to
+    the loop as they arrive.
+    """
+    import asyncio
+    import threading
+
+    loop = asyncio.get_running_loop()
+    batches: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    stop = threading.Event()
+
+    def _produce():
+        try:
+            for batch in iter_duck(query, **kwargs):
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(batches.put_nowait, batch)
+        finally:
+            loop.call_soon_threadsafe(batches.put_nowait, finished)
+
+    loop.run_in_executor(None, _produce)
+    try:
+        while True:
+            batch = await batches.get()
+            if batch is finished:
+                break
+            yield batch
+    finally:
+        stop.set()
+
+
+def duck(query, allowed_sources=None, max_results=200, inject_sources=False, focus_people=False,
+         parallel=None, backend_timeout_s=None, search_budget_s=None, site_concurrency=None):
+    """
+    Run a DuckDuckGo search and return results filtered by allowed_sources.
+
+    Args:
+        query (str): The search query.
+        allowed_sources (list, optional): List of allowed hostnames/domains. 
+                                          If None, attempts to load from settings.
+        max_results (int): Maximum number of results to fetch.
+        inject_sources (bool): If True and allowed sources are known, add site: clauses to the query.
+        parallel (bool, optional): Query SEARCH_BACKENDS concurrently. Defaults to SEARCH_PARALLEL.
+        backend_timeout_s (float, optional): Per-backend deadline in parallel mode.
+        search_budget_s (float, optional): Overall deadline for the parallel fan-out.
+        site_concurrency (int, optional): Max in-flight site: queries when injecting sources.
+            Defaults to SEARCH_SITE_CONCURRENCY.
+
+    See `iter_duck` for a streaming variant that yields results as they arrive.
+    """
+    results = []
+    for batch in iter_duck(
+        query,
+        allowed_sources=allowed_sources,
+        max_results=max_results,
+        inject_sources=inject_sources,
+        focus_people=focus_people,
+        parallel=parallel,
+        backend_timeout_s=backend_timeout_s,
+        search_budget_s=search_budget_s,
+        site_concurrency=site_concurrency,
+    ):
+        results.extend(batch)
+    return results
 
 if __name__ == "__main__":
     # Test execution
@@ -0,0 +1,243 @@
+"""Single-pass contact extraction shared by the Scrapy and Playwright crawlers.
+
+One precompiled scanner walks the page text once and reports every email,
+phone number, location keyword, mailto:/tel: link and LinkedIn profile/company
+URL it passes. All patterns are bounded so a match attempt never looks at more
+than a few hundred characters, which keeps the scan linear on hostile input
+(long digit runs, long alphanumeric runs without '@', thousands of '@'):
+
+- emails are found by their '@' and expanded outwards over bounded local and
+  domain runs, instead of a leading `[...]+@` that rescans every start offset;
+- phones must start and end on a digit run boundary, so a long digit run is
+  rejected once instead of once per offset.
+
+`extract_many()` runs the scanner over many pages, optionally across worker
+processes (EXTRACT_WORKERS, default 0 = in-process). `scripts/bench_extract.py`
+compares it with the previous per-pattern regexes on worst-case inputs.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", "0"))
+
+DEFAULT_EMAIL_BLOCKLIST: Tuple[str, ...] = ("example.com", "sentry.io", "w3.org")
+LOCATION_KEYWORDS: Tuple[str, ...] = ("headquarters", "hq", "location", "office", "address", "based in")
+
+# Retina asset names such as "logo@2x.png" look like emails to a regex.
+_ASSET_TLDS = frozenset({"png", "jpg", "jpeg", "gif", "svg", "webp", "ico", "css", "js"})
+
+_EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+_EMAIL_DOMAIN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-")
+_MAX_LOCAL = 64
+_MAX_DOMAIN = 253
+
+_HOST_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-")
+_LINKEDIN_HOST = "linkedin.com"
+
+
+def _keyword_branches() -> str:
+    # "headquarters" -> (?<=[hH])(?P<kw0>(?i:eadquarters)): triggered on its first letter
+    return "".join(
+        f"|(?<=[{k[0].lower()}{k[0].upper()}])(?P<kw{i}>(?i:{re.escape(k[1:])}))"
+        for i, k in enumerate(LOCATION_KEYWORDS)
+    )
+
+
+# Every match starts on one of a few trigger characters. Because the pattern
+# opens with a plain character class, the regex engine skips all other text in
+# C; each branch then checks what precedes the trigger with a lookbehind.
+_SCANNER_RE = re.compile(
+    r"[@:/+(0-9" + "".join(sorted({c for k in LOCATION_KEYWORDS for c in (k[0].lower(), k[0].upper())})) + r"]"
+    r"(?:(?<=@)(?P<at>)"
+    r"|(?<=(?i:mailto):)(?P<mailto>[^\s\"'<>?&]{3,254})"
+    r"|(?<=(?i:tel):)(?P<tel>\+?[\d\-. ()]{5,30})"
+    r"|(?<=(?i:linkedin\.com)/)(?P<linkedin>(?i:in|company)/[^\s\"'<>?#]{1,200})"
+    # 7-22 chars of digits and separators, not glued to a preceding word, digit or URL
+    r"|(?<![\w+#/=.%-].)(?<=[+(\d])(?P<phone>[\d .()\-]{5,21}\d(?!\w))"
+    + _keyword_branches()
+    + r")"
+)
+_ISO_DATE_RE = re.compile(r"^\d{4}[-/.]\d{1,2}[-/.]\d{1,2}$")
+
+
+@dataclass
+class Contacts:
+    emails: List[str] = field(default_factory=list)
+    phones: List[str] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+    linkedin_urls: List[str] = field(default_factory=list)
+    mailto: List[str] = field(default_factory=list)
+    tel: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _email_at(text: str, at: int) -> Optional[str]:
+    """Expand the '@' at index `at` into an email address, or None."""
+    start = at
+    floor = max(0, at - _MAX_LOCAL)
+    while start > floor and text[start - 1] in _EMAIL_LOCAL_CHARS:
+        start -= 1
+    if start == at:
+        return None
+
+    end = at + 1
+    ceiling = min(len(text), at + 1 + _MAX_DOMAIN)
+    while end < ceiling and text[end] in _EMAIL_DOMAIN_CHARS:
+        end += 1
+    domain = text[at + 1:end]
+
+    # Longest prefix of the domain run ending in "." + 2+ letters (what the
+    # old `[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}` matched), found without backtracking.
+    dot = domain.rfind(".")
+    while dot > 0:
+        k = dot + 1
+        while k < len(domain) and domain[k].isascii() and domain[k].isalpha():
+            k += 1
+        if k - dot - 1 >= 2:
+            tld = domain[dot + 1:k]
+            if tld.lower() in _ASSET_TLDS:
+                return None
+            return f"{text[start:at]}@{domain[:k]}"
+        dot = domain.rfind(".", 0, dot)
+    return None
+
+
+def _linkedin_url(text: str, slash: int, end: int) -> str:
+    """Rebuild a LinkedIn URL whose path starts after the '/' at `slash`."""
+    start = slash - len(_LINKEDIN_HOST)
+    # subdomain ("www.", "uk.") and scheme, if present
+    floor = max(0, start - 16)
+    while start > floor and text[start - 1] in _HOST_CHARS:
+        start -= 1
+    if text[max(0, start - 3):start] == "://":
+        for scheme in ("https", "http"):
+            if text[max(0, start - 3 - len(scheme)):start - 3].lower() == scheme:
+                start -= 3 + len(scheme)
+                break
+    return text[start:end].rstrip(".,;:)")
+
+
+def _clean_phone(raw: str) -> Optional[str]:
+    phone = raw.strip(" .-")
+    if phone.count("(") != phone.count(")"):
+        phone = phone.strip("()")
+    digits = sum(c.isdigit() for c in phone)
+    if digits < 7 or digits > 15 or _ISO_DATE_RE.match(phone):
+        return None
+    return phone
+
+
+def _digits(value: str) -> str:
+    return "".join(c for c in value if c.isdigit())
+
+
+def extract_contacts(
+    text: str,
+    *,
+    max_emails: int = 10,
+    max_phones: int = 10,
+    max_locations: int = 3,
+    max_linkedin: int = 5,
+    email_blocklist: Iterable[str] = DEFAULT_EMAIL_BLOCKLIST,
+    snippet_before: int = 50,
+    snippet_after: int = 100,
+) -> Contacts:
+    """Scan `text` once and return the contacts found, deduplicated in page order.
+
+    Location snippets are taken around the first occurrence of each keyword in
+    LOCATION_KEYWORDS and returned in keyword order, as before. mailto:/tel:
+    targets are reported on their own and also counted as emails/phones.
+    """
+    out = Contacts()
+    if not text:
+        return out
+
+    blocklist = tuple(b.lower() for b in email_blocklist)
+    seen_emails = set()
+    seen_phones = set()
+    seen_linkedin = set()
+    first_keyword: Dict[str, int] = {}
+
+    def add_email(value: str) -> None:
+        key = value.lower()
+        if key in seen_emails or any(b in key for b in blocklist):
+            return
+        seen_emails.add(key)
+        out.emails.append(value)
+
+    def add_phone(value: str) -> None:
+        key = _digits(value)
+        if key in seen_phones:
+            return
+        seen_phones.add(key)
+        out.phones.append(value)
+
+    for m in _SCANNER_RE.finditer(text):
+        kind = m.lastgroup
+        if kind == "at":
+            email = _email_at(text, m.start())
+            if email:
+                add_email(email)
+        elif kind == "phone":
+            phone = _clean_phone(text[m.start():m.end()])
+            if phone:
+                add_phone(phone)
+        elif kind.startswith("kw"):
+            first_keyword.setdefault(LOCATION_KEYWORDS[int(kind[2:])], m.start())
+        elif kind == "linkedin":
+            url = _linkedin_url(text, m.start(), m.end())
+            if url.lower() not in seen_linkedin:
+                seen_linkedin.add(url.lower())
+                out.linkedin_urls.append(url)
+        elif kind == "mailto":
+            addr = m.group("mailto")
+            at = addr.find("@")
+            email = _email_at(addr, at) if at > 0 else None
+            if email:
+                if email not in out.mailto:
+                    out.mailto.append(email)
+                add_email(email)
+        elif kind == "tel":
+            phone = _clean_phone(m.group("tel"))
+            if phone:
+                if phone not in out.tel:
+                    out.tel.append(phone)
+                add_phone(phone)
+
+    for keyword in LOCATION_KEYWORDS:
+        idx = first_keyword.get(keyword)
+        if idx is not None:
+            out.locations.append(text[max(0, idx - snippet_before):idx + snippet_after].strip())
+
+    out.emails = out.emails[:max_emails]
+    out.phones = out.phones[:max_phones]
+    out.locations = out.locations[:max_locations]
+    out.linkedin_urls = out.linkedin_urls[:max_linkedin]
+    return out
+
+
+def _extract_one(args: Tuple[str, Dict[str, Any]]) -> Contacts:
+    text, kwargs = args
+    return extract_contacts(text, **kwargs)
+
+
+def extract_many(texts: Iterable[str], workers: Optional[int] = None, **kwargs) -> List[Contacts]:
+    """Run `extract_contacts` over many pages, preserving input order.
+
+    The scan is pure-Python CPU work that holds the GIL, so with `workers` > 1
+    (default: EXTRACT_WORKERS) pages are spread over a process pool instead of
+    threads. Small batches always run in-process.
+    """
+    texts = list(texts)
+    workers = EXTRACT_WORKERS if workers is None else workers
+    if workers <= 1 or len(texts) < 2 * workers:
+        return [extract_contacts(t, **kwargs) for t in texts]
+    chunksize = max(1, len(texts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_extract_one, [(t, kwargs) for t in texts], chunksize=chunksize))
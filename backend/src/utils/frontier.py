@@ -0,0 +1,84 @@
+"""Bounded priority frontier for the deep crawler.
+
+`CrawlFrontier.pop()` returns the highest-scored URL (ties in insertion order,
+so with equal scores it is a plain FIFO queue) in O(log n) instead of the
+O(n) `list.pop(0)` it replaces. Once `max_size` URLs are waiting, pushing a
+better one evicts the lowest-scored (newest first among equals), and a URL no
+better than that is refused.
+
+Two heaps over the same entries serve the two ends; entries removed through
+the other heap are skipped lazily.
+"""
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+
+class _Entry:
+    __slots__ = ("url", "depth", "score", "seq", "live")
+
+    def __init__(self, url: str, depth: int, score: float, seq: int):
+        self.url = url
+        self.depth = depth
+        self.score = score
+        self.seq = seq
+        self.live = True
+
+
+class CrawlFrontier:
+    def __init__(self, max_size: int = 2000):
+        self.max_size = max(1, max_size)
+        self._best: List[Tuple[float, int, _Entry]] = []  # (-score, seq): pop order
+        self._worst: List[Tuple[float, int, _Entry]] = []  # (score, -seq): eviction order
+        self._entries: Dict[str, _Entry] = {}
+        self._seq = itertools.count()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
+
+    def push(self, url: str, depth: int, score: float = 0.0) -> Tuple[bool, Optional[str]]:
+        """Add `url`; returns (added, evicted url or None). URLs already waiting are left as they are."""
+        if url in self._entries:
+            return False, None
+        evicted = None
+        if len(self._entries) >= self.max_size:
+            worst = self._peek_worst()
+            if worst is None or score <= worst.score:
+                return False, None
+            self._remove(worst)
+            self.evicted += 1
+            evicted = worst.url
+        entry = _Entry(url, depth, score, next(self._seq))
+        self._entries[url] = entry
+        heapq.heappush(self._best, (-score, entry.seq, entry))
+        heapq.heappush(self._worst, (score, -entry.seq, entry))
+        return True, evicted
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """Highest-scored (url, depth), or None when empty."""
+        while self._best:
+            _neg, _seq, entry = heapq.heappop(self._best)
+            if entry.live:
+                self._remove(entry)
+                return entry.url, entry.depth
+        return None
+
+    def _peek_worst(self) -> Optional[_Entry]:
+        while self._worst and not self._worst[0][2].live:
+            heapq.heappop(self._worst)
+        return self._worst[0][2] if self._worst else None
+
+    def _remove(self, entry: _Entry) -> None:
+        entry.live = False
+        del self._entries[entry.url]
+        # keep dead entries from piling up in the heap that did not pop them
+        if len(self._best) > 2 * len(self._entries) + 64:
+            self._best = [t for t in self._best if t[2].live]
+            heapq.heapify(self._best)
+        if len(self._worst) > 2 * len(self._entries) + 64:
+            self._worst = [t for t in self._worst if t[2].live]
+            heapq.heapify(self._worst)
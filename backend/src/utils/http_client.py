@@ -0,0 +1,79 @@
+"""Shared pooled HTTP client for outbound API calls.
+
+Search backends (Google, Bing, Wikipedia) and the Google OAuth handlers issue
+many small requests to the same few hosts. Going through one process-wide
+`requests.Session` keeps TCP/TLS connections alive between calls instead of
+paying a new handshake every time.
+
+Tuning (env vars):
+- HTTP_POOL_CONNECTIONS: number of per-host connection pools kept (default 20)
+- HTTP_POOL_MAXSIZE: max open connections per host (default 10)
+- HTTP_POOL_BLOCK: wait for a free connection instead of opening extra ones past
+  HTTP_POOL_MAXSIZE (default 1)
+- HTTP_CONNECT_TIMEOUT_S / HTTP_READ_TIMEOUT_S: default timeouts (5 / 10)
+"""
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "20"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "1").lower() in ("1", "true", "yes")
+HTTP_CONNECT_TIMEOUT_S = float(os.getenv("HTTP_CONNECT_TIMEOUT_S", "5"))
+HTTP_READ_TIMEOUT_S = float(os.getenv("HTTP_READ_TIMEOUT_S", "10"))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=HTTP_POOL_BLOCK,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # The session is shared by every request in the process (including OAuth calls
+    # made on behalf of different users), so never persist cookies between calls.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Issue a request on the shared session, applying the default (connect, read) timeout."""
+    kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT_S, HTTP_READ_TIMEOUT_S))
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def close_session() -> None:
+    """Close pooled connections (e.g. on shutdown or after a fork)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,344 @@
+"""Lead identity index: recognizes the same person found through different URLs, sources and jobs.
+
+A lead is known by identity keys:
+
+- "email:<address>" for a personal address (role mailboxes such as info@ are
+  shared by many people and skipped);
+- "orcid:<id>" for an ORCID iD in any URL;
+- "url:<host/path?query>" for a canonical profile URL (LinkedIn /in/<slug>
+  with country subdomains and trailing slash removed; query parameters that
+  name the person, such as Scholar's ?user= or PubMed's ?term=, are kept
+  and tracking parameters dropped; a bare host or search page gives none);
+- "name:<name>|<domain>" for a normalized person name at a site.
+
+Keys map to lead ids in a union-find forest. `resolve()` merges every
+lead the given keys touch into one and returns its id, so a PubMed author
+found by email and a team-page entry found by email plus LinkedIn URL end up
+as one lead. Lookups and merges are dict operations (near O(1) with path
+compression and union by size).
+
+The index is mirrored to a local SQLite file (IDENTITY_INDEX_PATH), so lead
+ids stay stable across jobs and restarts; IDENTITY_INDEX=0 keeps it in
+memory only. Each process loads the file when it starts; keys other
+processes add later are seen after a restart.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "cache",
+    "identity.sqlite3",
+)
+
+_ROLE_MAILBOXES = frozenset((
+    "info", "contact", "hello", "admin", "office", "sales", "support", "press", "media", "marketing",
+    "careers", "jobs", "hr", "team", "enquiries", "inquiries", "webmaster", "noreply", "no-reply",
+))
+_NAME_TITLES = frozenset(("dr", "prof", "professor", "mr", "mrs", "ms", "phd", "md", "msc", "bsc", "jr", "sr"))
+_ORCID_RE = re.compile(r"(\d{4}-\d{4}-\d{4}-\d{3}[\dX])", re.I)
+_LINKEDIN_PERSON_RE = re.compile(r"^/(in|pub)/([^/?#]+)", re.I)
+# query parameters that say whose profile it is (scholar ?user=, pubmed ?term=, linkedin /profile/view?id=)
+_IDENTIFYING_PARAMS = frozenset((
+    "user", "userid", "uid", "id", "term", "author", "authorid", "pid", "personid", "profileid", "memberid",
+))
+_SEARCH_SEGMENTS = frozenset(("search", "results", "find", "query", "scholar"))
+
+
+def normalize_email(email: str) -> str:
+    """Lowercased address without a mailto: prefix; "" for role mailboxes and non-addresses."""
+    email = (email or "").strip().lower()
+    if email.startswith("mailto:"):
+        email = email[7:].split("?", 1)[0]
+    local, sep, domain = email.partition("@")
+    if not sep or not local or "." not in domain or local in _ROLE_MAILBOXES:
+        return ""
+    return email
+
+
+def canonical_profile_url(url: str) -> str:
+    """Identity key for a profile URL ("orcid:..." or "url:host/path?query"), or "" if it names nobody."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    orcid = _ORCID_RE.search(url)
+    if orcid and "orcid" in url.lower():
+        return "orcid:" + orcid.group(1).upper()
+    parts = urlsplit(url if "//" in url else "//" + url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return ""
+    path = parts.path.rstrip("/")
+    if host == "linkedin.com" or host.endswith(".linkedin.com"):
+        host = "linkedin.com"
+        m = _LINKEDIN_PERSON_RE.match(path)
+        if m:
+            return f"url:{host}/{m.group(1).lower()}/{m.group(2).lower()}"
+    params = sorted((k, " ".join(v.split())) for k, v in parse_qsl(parts.query)
+                    if k.lower() in _IDENTIFYING_PARAMS and v.strip())
+    if not params:
+        segments = {seg.lower() for seg in path.split("/") if seg}
+        if not segments or not segments.isdisjoint(_SEARCH_SEGMENTS):
+            return ""  # a site's home page or a search page is nobody's profile
+        return f"url:{host}{path}"
+    return f"url:{host}{path}?{urlencode(params)}"
+
+
+def normalize_name(name: str) -> str:
+    """ASCII-folded lowercase name without titles or punctuation; "" unless it has two or more words."""
+    folded = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode().lower()
+    words = [w for w in re.split(r"[^a-z]+", folded) if w and w not in _NAME_TITLES]
+    return " ".join(words) if len(words) >= 2 else ""
+
+
+def site_domain(url: str) -> str:
+    host = (urlsplit(url if "//" in (url or "") else "//" + (url or "")).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def identity_keys(emails: Iterable[str] = (), profile_urls: Iterable[str] = (), name: str = "",
+                  domain: str = "") -> List[str]:
+    """The identity keys for a lead, most specific first, without duplicates."""
+    keys: List[str] = []
+    for url in profile_urls:
+        key = canonical_profile_url(url)
+        if key and key not in keys:
+            keys.append(key)
+    for email in emails:
+        email = normalize_email(email)
+        if email and "email:" + email not in keys:
+            keys.append("email:" + email)
+    name = normalize_name(name)
+    if name and domain:
+        keys.append(f"name:{name}|{domain.lower()}")
+    return keys
+
+
+class IdentityIndex:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._keys: Dict[str, str] = {}  # identity key -> lead id (any node of its tree)
+        self._parent: Dict[str, str] = {}
+        self._size: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.merges = 0
+        if path:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            with self._lock:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("CREATE TABLE IF NOT EXISTS identity_keys (key TEXT PRIMARY KEY, lead_id TEXT NOT NULL)")
+                self._conn.execute("CREATE TABLE IF NOT EXISTS identity_links (lead_id TEXT PRIMARY KEY, parent TEXT NOT NULL)")
+                self._conn.commit()
+                self._load_locked()
+
+    def _load_locked(self) -> None:
+        for lead_id, parent in self._conn.execute("SELECT lead_id, parent FROM identity_links"):
+            self._parent[lead_id] = parent
+            self._parent.setdefault(parent, parent)
+        for key, lead_id in self._conn.execute("SELECT key, lead_id FROM identity_keys"):
+            self._keys[key] = lead_id
+            self._parent.setdefault(lead_id, lead_id)
+        for lead_id in self._keys.values():
+            root = self._find(lead_id)
+            self._size[root] = self._size.get(root, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _find(self, node: str) -> str:
+        root = node
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[node] != root:
+            self._parent[node], node = root, self._parent[node]
+        return root
+
+    def find(self, lead_id: str) -> str:
+        """The current id of the lead `lead_id` was merged into (itself if never merged)."""
+        with self._lock:
+            return self._find(lead_id) if lead_id in self._parent else lead_id
+
+    def lookup(self, keys: Iterable[str]) -> Optional[str]:
+        """Lead id for the first known key, without recording anything."""
+        with self._lock:
+            for key in keys:
+                node = self._keys.get(key)
+                if node is not None:
+                    return self._find(node)
+        return None
+
+    def resolve(self, keys: Iterable[str]) -> Tuple[Optional[str], List[str]]:
+        """Record `keys` as one lead; returns (lead id, ids of other leads merged into it)."""
+        keys = [k for k in keys if k]
+        if not keys:
+            return None, []
+        with self._lock:
+            roots: List[str] = []
+            for key in keys:
+                node = self._keys.get(key)
+                if node is not None:
+                    root = self._find(node)
+                    if root not in roots:
+                        roots.append(root)
+            if roots:
+                lead_id = max(roots, key=lambda r: self._size.get(r, 0))
+            else:
+                lead_id = uuid.uuid4().hex[:16]
+                self._parent[lead_id] = lead_id
+                self._size[lead_id] = 0
+            absorbed = [r for r in roots if r != lead_id]
+            for root in absorbed:
+                self._parent[root] = lead_id
+                self._size[lead_id] = self._size.get(lead_id, 0) + self._size.pop(root, 0)
+            self.merges += len(absorbed)
+            new_keys = [k for k in keys if k not in self._keys]
+            for key in new_keys:
+                self._keys[key] = lead_id
+            self._size[lead_id] = self._size.get(lead_id, 0) + len(new_keys)
+            if self._conn is not None and (new_keys or absorbed):
+                try:
+                    self._conn.executemany("INSERT OR IGNORE INTO identity_keys (key, lead_id) VALUES (?, ?)",
+                                           [(k, lead_id) for k in new_keys])
+                    self._conn.executemany("INSERT OR REPLACE INTO identity_links (lead_id, parent) VALUES (?, ?)",
+                                           [(r, lead_id) for r in absorbed])
+                    self._conn.commit()
+                except sqlite3.Error:
+                    logger.exception("Identity index write failed; keeping the in-memory index only")
+            return lead_id, absorbed
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            leads = sum(1 for node, parent in self._parent.items() if node == parent)
+            return {"path": self.path, "keys": len(self._keys), "leads": leads, "merges": self.merges}
+
+
+_index: Optional[IdentityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_identity_index() -> IdentityIndex:
+    """Process-wide index; persisted to IDENTITY_INDEX_PATH unless IDENTITY_INDEX=0."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = None
+                if os.getenv("IDENTITY_INDEX", "1").lower() in ("1", "true", "yes"):
+                    path = os.getenv("IDENTITY_INDEX_PATH", _DEFAULT_PATH)
+                try:
+                    _index = IdentityIndex(path)
+                except Exception:
+                    logger.exception("Identity index file unavailable; keeping it in memory only")
+                    _index = IdentityIndex(None)
+    return _index
+
+
+# a lead's contact fields, as `process()` returns them: (primary value, every value seen)
+_CONTACT_FIELDS = (("email", "all_emails"), ("phone", "all_phones"), ("linkedin_url", "all_linkedin"),
+                   ("location_hq", None), ("title", None))
+
+
+def _fold_lead(kept: Dict[str, object], other: Dict[str, object]) -> bool:
+    """Fill the gaps in `kept` from another sighting of the same lead; True if anything was added."""
+    changed = False
+    for primary, seen in _CONTACT_FIELDS:
+        if other.get(primary) and not kept.get(primary):
+            kept[primary] = other[primary]
+            changed = True
+        if seen is not None:
+            values = kept.setdefault(seen, [])
+            for value in other.get(seen) or ():
+                if value not in values:
+                    values.append(value)
+                    changed = True
+    # the other page's text may score higher (publications, funding news, ...)
+    if (other.get("rank") or 0) > (kept.get("rank") or 0):
+        kept["rank"] = other["rank"]
+        changed = True
+    return changed
+
+
+class LeadDeduper:
+    """One scrape's view of the index: lets each lead through once and folds its later sightings into it."""
+
+    def __init__(self, index: Optional[IdentityIndex] = None):
+        self.index = index if index is not None else get_identity_index()
+        self.duplicates = 0
+        self._sources: Dict[str, List[str]] = {}  # lead id -> source URLs (shared with the emitted item)
+        self._results: Dict[str, Dict[str, object]] = {}  # lead id -> the kept (emitted) result
+        self._early: Dict[str, List[Dict[str, object]]] = {}  # lead id -> sightings folded before `keep`
+        self._lock = threading.Lock()
+
+    def _resolve(self, keys: List[str]) -> str:
+        lead_id, absorbed = self.index.resolve(keys)
+        for old in absorbed:
+            # two leads already let through turn out to be one; later sightings join the first
+            sources = self._sources.pop(old, None)
+            if sources is not None:
+                self._sources.setdefault(lead_id, sources)
+            result = self._results.pop(old, None)
+            if result is not None:
+                self._results.setdefault(lead_id, result)
+        return lead_id
+
+    def claim(self, keys: List[str], source: str) -> Optional[Dict[str, object]]:
+        """Fields for a lead seen for the first time in this scrape ({"lead_id", "sources"}), or None for a duplicate.
+
+        Pass the first sighting's result to `keep` and a duplicate's to `fold`.
+        """
+        if not keys:
+            return {"lead_id": None, "sources": [source]}
+        try:
+            with self._lock:
+                lead_id = self._resolve(keys)
+                sources = self._sources.get(lead_id)
+                if sources is not None:
+                    self.duplicates += 1
+                    if source not in sources:
+                        sources.append(source)
+                    return None
+                sources = self._sources[lead_id] = [source]
+        except Exception:
+            logger.exception("Identity lookup failed; treating lead as new")
+            return {"lead_id": None, "sources": [source]}
+        return {"lead_id": lead_id, "sources": sources}
+
+    def keep(self, result: Dict[str, object]) -> None:
+        """Remember a claimed lead's result (updated in place by `fold`)."""
+        lead_id = result.get("lead_id")
+        if not lead_id:
+            return
+        with self._lock:
+            self._results[lead_id] = result
+            for other in self._early.pop(lead_id, ()):
+                _fold_lead(result, other)
+
+    def fold(self, keys: List[str], result: Dict[str, object]) -> Optional[Dict[str, object]]:
+        """Add a duplicate's contact fields to the kept result; returns it if anything changed, else None."""
+        try:
+            with self._lock:
+                lead_id = self._resolve(keys)
+                kept = self._results.get(lead_id)
+                if kept is None:
+                    # claimed by another thread that has not called `keep` yet
+                    self._early.setdefault(lead_id, []).append(result)
+                    return None
+                return kept if _fold_lead(kept, result) else None
+        except Exception:
+            logger.exception("Identity lookup failed; dropping the duplicate's fields")
+            return None
@@ -0,0 +1,441 @@
+"""Durable scrape-job queue in a local SQLite file, shared by the API and worker processes.
+
+The API enqueues jobs and reads their progress and results. Workers started
+with `python -m src.worker` claim jobs and run them. All of them must run on
+the same host as the file: WAL mode needs shared memory between the
+processes and does not work over a network filesystem, where workers could
+double-claim jobs or corrupt the queue. Scale out with more worker
+processes on that machine.
+
+- claiming takes a lease (JOB_LEASE_S) inside a `BEGIN IMMEDIATE` transaction,
+  so two workers never get the same job;
+- a running worker heartbeats to extend the lease and stream progress, new
+  and updated items and error events; a job whose lease runs out (worker
+  killed or hung) is claimed again by another worker;
+- a failed or abandoned attempt is retried after an exponential backoff
+  (JOB_RETRY_BASE_S * 2^(attempt-1), capped at JOB_RETRY_MAX_S) until
+  max_attempts, after which the job is dead-lettered ("dead") with its last
+  error; `requeue()` gives a dead job a fresh set of attempts;
+- cancellation is a flag the worker sees on its next heartbeat.
+
+The file is opened in WAL mode with a busy timeout, so readers never block
+the workers. Configure with JOB_QUEUE_PATH, JOB_LEASE_S, JOB_MAX_ATTEMPTS,
+JOB_RETRY_BASE_S and JOB_RETRY_MAX_S.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "cache",
+    "jobs.sqlite3",
+)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"  # only while waiting for a retry
+CANCELLED = "cancelled"
+DEAD = "dead"
+FINISHED = (SUCCEEDED, CANCELLED, DEAD)
+
+_COLUMNS = (
+    "id", "query", "params", "status", "attempts", "max_attempts", "available_at", "lease_owner",
+    "lease_expires_at", "heartbeat_at", "cancel_requested", "percent", "error", "result",
+    "created_at", "started_at", "finished_at",
+)
+
+
+class LeaseLost(Exception):
+    """The worker's lease on a job expired and the job may now belong to another worker."""
+
+
+class JobQueue:
+    def __init__(self, path: str = _DEFAULT_PATH, lease_s: float = 60, max_attempts: int = 3,
+                 retry_base_s: float = 30, retry_max_s: float = 900):
+        self.path = path
+        self.lease_s = lease_s
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # autocommit; write transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    available_at REAL NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires_at REAL,
+                    heartbeat_at REAL,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    percent INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    result TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, available_at)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_errors (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    msg TEXT,
+                    url TEXT,
+                    PRIMARY KEY (job_id, seq)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_items (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    item TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                )
+                """
+            )
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _row(row) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(zip(_COLUMNS, row))
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.retry_base_s * (2 ** max(0, attempts - 1)), self.retry_max_s)
+
+    # -- producer side --------------------------------------------------
+
+    def enqueue(self, query: str, params: Optional[Dict[str, Any]] = None, max_attempts: Optional[int] = None) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, query, params, status, max_attempts, available_at, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, query, json.dumps(params or {}), QUEUED, max_attempts or self.max_attempts, now, now),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            job = self._row(row)
+            if job is not None:
+                job["items_count"] = self._conn.execute(
+                    "SELECT COUNT(*) FROM job_items WHERE job_id = ?", (job_id,)).fetchone()[0]
+        return job
+
+    def items(self, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item FROM job_items WHERE job_id = ? ORDER BY seq LIMIT ? OFFSET ?",
+                (job_id, max(1, limit), max(0, offset)),
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def errors(self, job_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """The last `limit` error events the job's current attempt reported."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT msg, url FROM job_errors WHERE job_id = ? ORDER BY seq DESC LIMIT ?", (job_id, limit),
+            ).fetchall()
+        return [{"msg": msg, "url": url} for msg, url in reversed(rows)]
+
+    def list_jobs(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)}, (SELECT COUNT(*) FROM job_items WHERE job_id = jobs.id)"
+                " FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        jobs = []
+        for row in rows:
+            job = self._row(row[:-1])
+            job["items_count"] = row[-1]
+            jobs.append(self._status(job, preview=0))
+        return jobs
+
+    def status_dict(self, job_id: str, preview: int = 20) -> Optional[Dict[str, Any]]:
+        """The shape GET /jobs/{id} returns for in-memory jobs, plus attempt and lease details."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        return self._status(job, preview)
+
+    def _status(self, job: Dict[str, Any], preview: int) -> Dict[str, Any]:
+        count = job.get("items_count", 0)
+        now = time.time()
+        started = job["started_at"]
+        return {
+            "id": job["id"],
+            "query": job["query"],
+            "status": job["status"],
+            "percent": 100 if job["status"] == SUCCEEDED else job["percent"],
+            "results_count": count,
+            "partial_results": self.items(job["id"], max(0, count - preview), preview) if preview and count else [],
+            "search_results_count": len((job["result"] or {}).get("search_results") or []),
+            "errors": self.errors(job["id"]) if preview else [],
+            "error": job["error"],
+            "attempts": job["attempts"],
+            "max_attempts": job["max_attempts"],
+            "worker": job["lease_owner"],
+            "timings": {
+                "created_at": job["created_at"],
+                "started_at": started,
+                "finished_at": job["finished_at"],
+                "queued_s": round((started or now) - job["created_at"], 3),
+                "run_s": round((job["finished_at"] or now) - started, 3) if started else None,
+            },
+        }
+
+    def page(self, job_id: str, offset: int = 0, limit: int = 100) -> Optional[Dict[str, Any]]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        offset = max(0, offset)
+        limit = max(1, min(limit, 500))
+        return {
+            "id": job_id,
+            "status": job["status"],
+            "total": job["items_count"],
+            "offset": offset,
+            "limit": limit,
+            "results": self.items(job_id, offset, limit),
+        }
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancel a job; returns its new status, or None if unknown. Running jobs stop at their next heartbeat."""
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            status = row[0]
+            if status in (QUEUED, FAILED):
+                conn.execute("UPDATE jobs SET status = ?, finished_at = ?, lease_owner = NULL WHERE id = ?",
+                             (CANCELLED, now, job_id))
+                return CANCELLED
+            if status == RUNNING:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            return status
+
+    def delete(self, job_id: str) -> bool:
+        """Remove a finished job and its items."""
+        with self._write() as conn:
+            cur = conn.execute(f"DELETE FROM jobs WHERE id = ? AND status IN ({', '.join('?' * len(FINISHED))})",
+                               (job_id, *FINISHED))
+            if cur.rowcount:
+                conn.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+                conn.execute("DELETE FROM job_errors WHERE job_id = ?", (job_id,))
+            return bool(cur.rowcount)
+
+    def requeue(self, job_id: str) -> bool:
+        """Give a dead-lettered job a fresh set of attempts."""
+        with self._write() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, available_at = ?, error = NULL, finished_at = NULL,"
+                " cancel_requested = 0 WHERE id = ? AND status = ?",
+                (QUEUED, time.time(), job_id, DEAD),
+            )
+            return bool(cur.rowcount)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            expired = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND lease_expires_at < ?", (RUNNING, time.time())
+            ).fetchone()[0]
+        return {"path": self.path, "lease_s": self.lease_s, "by_status": counts, "expired_leases": expired}
+
+    # -- worker side ----------------------------------------------------
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the next runnable job (queued, due for retry, or with an expired lease), or None."""
+        now = time.time()
+        with self._write() as conn:
+            # Attempts whose worker vanished count as failures; dead-letter those out of attempts.
+            # A job cancelled while its worker was gone is not run again.
+            for job_id, attempts, max_attempts, cancel_requested in conn.execute(
+                "SELECT id, attempts, max_attempts, cancel_requested FROM jobs WHERE status = ? AND lease_expires_at < ?",
+                (RUNNING, now),
+            ).fetchall():
+                error = "lease expired (worker lost)"
+                if cancel_requested:
+                    conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_owner = NULL"
+                                 " WHERE id = ?", (CANCELLED, error, now, job_id))
+                elif attempts >= max_attempts:
+                    conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_owner = NULL"
+                                 " WHERE id = ?", (DEAD, error, now, job_id))
+                    logger.warning("Job %s dead-lettered: %s", job_id, error)
+                else:
+                    conn.execute("UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL"
+                                 " WHERE id = ?", (FAILED, error, now + self._backoff(attempts), job_id))
+
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE status IN (?, ?) AND available_at <= ?"
+                " ORDER BY available_at LIMIT 1",
+                (QUEUED, FAILED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            job = self._row(row)
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires_at = ?,"
+                " heartbeat_at = ?, started_at = ?, percent = 0 WHERE id = ?",
+                (RUNNING, worker_id, now + self.lease_s, now, now, job["id"]),
+            )
+            # a retry starts from scratch
+            conn.execute("DELETE FROM job_items WHERE job_id = ?", (job["id"],))
+            conn.execute("DELETE FROM job_errors WHERE job_id = ?", (job["id"],))
+        job.update(status=RUNNING, attempts=job["attempts"] + 1, lease_owner=worker_id)
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str, percent: Optional[int] = None,
+                  items: Optional[List[Dict[str, Any]]] = None, errors: Optional[List[Dict[str, Any]]] = None,
+                  updates: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Extend the lease and store progress/new items/error events; returns True if cancellation was requested.
+
+        `updates` replace stored items with the same lead_id (a later sighting filled in their fields).
+
+        Raises LeaseLost if the job is no longer leased to `worker_id`.
+        """
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE id = ? AND status = ? AND lease_owner = ?",
+                (job_id, RUNNING, worker_id),
+            ).fetchone()
+            if row is None:
+                raise LeaseLost(job_id)
+            conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, heartbeat_at = ?, percent = MAX(percent, ?) WHERE id = ?",
+                (now + self.lease_s, now, int(percent or 0), job_id),
+            )
+            if items:
+                self._append_items(conn, job_id, items)
+            if errors:
+                self._append_errors(conn, job_id, errors)
+            if updates:
+                conn.executemany(
+                    "UPDATE job_items SET item = ? WHERE job_id = ? AND json_extract(item, '$.lead_id') = ?",
+                    [(json.dumps(item, default=str), job_id, item.get("lead_id")) for item in updates],
+                )
+            return bool(row[0])
+
+    @staticmethod
+    def _append_items(conn: sqlite3.Connection, job_id: str, items: List[Dict[str, Any]]) -> None:
+        start = conn.execute("SELECT COALESCE(MAX(seq), -1) + 1 FROM job_items WHERE job_id = ?", (job_id,)).fetchone()[0]
+        conn.executemany(
+            "INSERT INTO job_items (job_id, seq, item) VALUES (?, ?, ?)",
+            [(job_id, start + i, json.dumps(item, default=str)) for i, item in enumerate(items)],
+        )
+
+    @staticmethod
+    def _append_errors(conn: sqlite3.Connection, job_id: str, errors: List[Dict[str, Any]]) -> None:
+        # like in-memory jobs, keep the first 100 error events of a run
+        start = conn.execute("SELECT COALESCE(MAX(seq), -1) + 1 FROM job_errors WHERE job_id = ?", (job_id,)).fetchone()[0]
+        conn.executemany(
+            "INSERT INTO job_errors (job_id, seq, msg, url) VALUES (?, ?, ?, ?)",
+            [(job_id, start + i, e.get("msg"), e.get("url")) for i, e in enumerate(errors[:max(0, 100 - start)])],
+        )
+
+    def complete(self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None,
+                 items: Optional[List[Dict[str, Any]]] = None, cancelled: bool = False) -> None:
+        """Finish a leased job. `items` replaces the streamed items (the final, filtered list)."""
+        now = time.time()
+        with self._write() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, percent = 100, result = ?, finished_at = ?, lease_owner = NULL"
+                " WHERE id = ? AND status = ? AND lease_owner = ?",
+                (CANCELLED if cancelled else SUCCEEDED, json.dumps(result, default=str) if result is not None else None,
+                 now, job_id, RUNNING, worker_id),
+            )
+            if not cur.rowcount:
+                raise LeaseLost(job_id)
+            if items is not None:
+                conn.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+                self._append_items(conn, job_id, items)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> str:
+        """Record a failed attempt; returns the new status (FAILED = will retry, DEAD = dead-lettered)."""
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? AND lease_owner = ?",
+                (job_id, RUNNING, worker_id),
+            ).fetchone()
+            if row is None:
+                raise LeaseLost(job_id)
+            attempts, max_attempts = row
+            if attempts >= max_attempts:
+                conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_owner = NULL WHERE id = ?",
+                             (DEAD, error, now, job_id))
+                logger.warning("Job %s dead-lettered after %d attempts: %s", job_id, attempts, error)
+                return DEAD
+            conn.execute("UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL WHERE id = ?",
+                         (FAILED, error, now + self._backoff(attempts), job_id))
+            return FAILED
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def durable_jobs_enabled() -> bool:
+    """JOB_BACKEND=queue hands jobs to `python -m src.worker` processes instead of in-process threads."""
+    return os.getenv("JOB_BACKEND", "memory").lower() == "queue"
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue(
+                    os.getenv("JOB_QUEUE_PATH", _DEFAULT_PATH),
+                    lease_s=float(os.getenv("JOB_LEASE_S", "60")),
+                    max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+                    retry_base_s=float(os.getenv("JOB_RETRY_BASE_S", "30")),
+                    retry_max_s=float(os.getenv("JOB_RETRY_MAX_S", "900")),
+                )
+    return _queue
@@ -0,0 +1,226 @@
+"""Background scrape jobs, so HTTP handlers never wait on a crawl.
+
+`JobManager.submit()` queues `handle.scrape_progress` on a small thread pool
+(JOB_WORKERS) and returns a `Job` at once. The job folds the progress events
+into its state as they arrive: status, percent, items found so far, errors and
+timings. `cancel()` sets the event that scrape_progress checks between URLs
+and stages. Running crawls finish, queued ones are skipped, and the job ends
+as "cancelled" with whatever it found.
+
+Jobs live in memory. Finished jobs are dropped after JOB_TTL_S, and the oldest
+finished ones go first once more than JOB_MAX_KEPT are held.
+"""
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class Job:
+    def __init__(self, query: str, max_results: int = 200, allowed_sources: Optional[List[str]] = None):
+        self.id = uuid.uuid4().hex
+        self.query = query
+        self.max_results = max_results
+        self.allowed_sources = allowed_sources
+        self.status = QUEUED
+        self.percent = 0
+        self.results: List[Dict[str, Any]] = []
+        self.search_results: List[Dict[str, Any]] = []
+        self.errors: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def on_event(self, event: Dict[str, Any]) -> None:
+        """progress_callback for scrape_progress."""
+        kind = event.get("type")
+        with self._lock:
+            if "percent" in event:
+                self.percent = max(self.percent, int(event.get("percent") or 0))
+            if kind == "item":
+                self.results.append(event["item"])
+            elif kind == "item_update":
+                # a later sighting filled in fields of an item already streamed
+                lead_id = event["item"].get("lead_id")
+                for i, item in enumerate(self.results):
+                    if item.get("lead_id") == lead_id:
+                        self.results[i] = event["item"]
+                        break
+            elif kind == "search_results":
+                self.search_results.extend(event.get("results") or [])
+            elif kind == "error":
+                if len(self.errors) < 100:
+                    self.errors.append({"msg": event.get("msg"), "url": event.get("url")})
+            elif kind == "done":
+                # the final list is filtered once more; prefer it over the streamed items
+                self.results = list(event.get("results") or [])
+
+    def timings(self) -> Dict[str, Optional[float]]:
+        now = time.time()
+        started = self.started_at
+        return {
+            "created_at": self.created_at,
+            "started_at": started,
+            "finished_at": self.finished_at,
+            "queued_s": round((started or now) - self.created_at, 3),
+            "run_s": round((self.finished_at or now) - started, 3) if started else None,
+        }
+
+    def status_dict(self, preview: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "id": self.id,
+                "query": self.query,
+                "status": self.status,
+                "percent": 100 if self.status == SUCCEEDED else self.percent,
+                "results_count": len(self.results),
+                "partial_results": self.results[-preview:] if preview else [],
+                "search_results_count": len(self.search_results),
+                "errors": list(self.errors[-10:]),
+                "error": self.error,
+                "timings": self.timings(),
+            }
+
+    def page(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        offset = max(0, offset)
+        limit = max(1, min(limit, 500))
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "total": len(self.results),
+                "offset": offset,
+                "limit": limit,
+                "results": self.results[offset:offset + limit],
+            }
+
+
+class JobManager:
+    def __init__(self, workers: int = 2, ttl_s: float = 3600, max_kept: int = 200):
+        self.ttl_s = ttl_s
+        self.max_kept = max(1, max_kept)
+        self._pool = concurrent.futures.ThreadPoolExecutor(max(1, workers), thread_name_prefix="scrape-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, query: str, max_results: int = 200, allowed_sources: Optional[List[str]] = None) -> Job:
+        job = Job(query, max_results=max_results, allowed_sources=allowed_sources)
+        with self._lock:
+            self._prune_locked()
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Ask a job to stop; returns it, or None if unknown."""
+        job = self.get(job_id)
+        if job is not None and not job.finished:
+            job.cancel_event.set()
+        return job
+
+    def delete(self, job_id: str) -> bool:
+        """Forget a finished job."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.finished:
+                return False
+            del self._jobs[job_id]
+            return True
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.status_dict(preview=0) for job in jobs]
+
+    def _run(self, job: Job) -> None:
+        if job.cancel_event.is_set():
+            job.finished_at = time.time()
+            job.status = CANCELLED
+            job.future.set_result(None)
+            return
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            from src.handlers import handle
+
+            job.result = handle.scrape_progress(
+                job.query,
+                max_results=job.max_results,
+                allowed_sources=job.allowed_sources,
+                progress_callback=job.on_event,
+                cancel_event=job.cancel_event,
+            )
+            status = CANCELLED if job.cancel_event.is_set() else SUCCEEDED
+        except Exception as e:
+            logger.exception("Scrape job %s failed", job.id)
+            job.error = str(e)
+            status = FAILED
+        job.finished_at = time.time()
+        job.status = status
+        logger.info("Scrape job %s %s in %.1fs", job.id, job.status, job.finished_at - job.started_at)
+        job.future.set_result(job.result)
+
+    def _prune_locked(self) -> None:
+        now = time.time()
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at or 0)
+        for job in finished:
+            if now - (job.finished_at or now) > self.ttl_s or len(self._jobs) > self.max_kept:
+                del self._jobs[job.id]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel_event.set()
+        self._pool.shutdown(wait=False)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager(
+                    workers=int(os.getenv("JOB_WORKERS", "2")),
+                    ttl_s=float(os.getenv("JOB_TTL_S", "3600")),
+                    max_kept=int(os.getenv("JOB_MAX_KEPT", "200")),
+                )
+    return _manager
+
+
+def shutdown_job_manager() -> None:
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.shutdown()
+            _manager = None
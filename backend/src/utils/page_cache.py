@@ -0,0 +1,489 @@
+"""Shared on-disk HTTP page cache for the Scrapy and Playwright crawlers.
+
+Pages are stored in a local SQLite file keyed by (normalized URL, variant):
+
+- "raw": the HTML as served over HTTP. Written and read by Scrapy's plain-HTTP
+  tier and by the deep crawler, which serves it to the browser through request
+  interception (the page's scripts still run).
+- "rendered": the DOM after rendering, as returned by scrapy-playwright.
+
+Bodies are zlib-compressed and stored with their ETag / Last-Modified. An
+entry younger than its domain's TTL is served without touching the network.
+An older entry that has validators is revalidated with a conditional GET; a 304
+refreshes it in place. The table is bounded to a byte budget, and the least
+recently used pages are evicted first.
+
+Configure with PAGE_CACHE (0 disables), PAGE_CACHE_PATH, PAGE_CACHE_TTL_S,
+PAGE_CACHE_DOMAIN_TTLS ("host=seconds,..."; subdomains match, 0 = never cache),
+PAGE_CACHE_MAX_BYTES and PAGE_CACHE_MAX_BODY_BYTES.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "cache",
+    "page_cache.sqlite3",
+)
+
+RAW = "raw"
+RENDERED = "rendered"
+
+# Article and author pages on these hosts rarely change; company sites do.
+DEFAULT_DOMAIN_TTLS: Dict[str, float] = {
+    "pubmed.ncbi.nlm.nih.gov": 7 * 86400,
+    "ncbi.nlm.nih.gov": 3 * 86400,
+}
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def normalize_page_url(url: str) -> str:
+    """Canonical cache key: lowercase scheme/host, no default port, fragment or tracking params, sorted query."""
+    parts = urlsplit((url or "").strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def parse_domain_ttls(spec: str) -> Dict[str, float]:
+    """Parse "host=seconds,host2=seconds" into a dict, ignoring malformed entries."""
+    ttls: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        host, sep, value = part.partition("=")
+        if not sep:
+            continue
+        try:
+            ttls[host.strip().lower()] = float(value)
+        except ValueError:
+            logger.warning("Ignoring malformed page cache TTL entry: %r", part)
+    return ttls
+
+
+@dataclass
+class CachedPage:
+    url: str
+    variant: str
+    status: int
+    content_type: str
+    body: bytes
+    etag: str
+    last_modified: str
+    stored_at: float
+    ttl_s: float
+
+    @property
+    def age_s(self) -> float:
+        return time.time() - self.stored_at
+
+    @property
+    def fresh(self) -> bool:
+        return self.age_s <= self.ttl_s
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a conditional GET revalidating this entry (empty if it has no validators)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    def __init__(self, path: str, default_ttl_s: float = 6 * 3600, domain_ttls: Optional[Dict[str, float]] = None,
+                 max_bytes: int = 512 * 1024 * 1024, max_body_bytes: int = 5 * 1024 * 1024):
+        self.path = path
+        self.default_ttl_s = default_ttl_s
+        self.domain_ttls = dict(DEFAULT_DOMAIN_TTLS)
+        self.domain_ttls.update(domain_ttls or {})
+        self.max_bytes = max_bytes
+        self.max_body_bytes = max_body_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS page_cache (
+                    url TEXT NOT NULL,
+                    variant TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    content_type TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    etag TEXT NOT NULL,
+                    last_modified TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (url, variant)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_page_cache_accessed ON page_cache (accessed_at)")
+            self._conn.commit()
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM page_cache").fetchone()
+            self._total_bytes = int(total)
+
+    def ttl_for(self, url: str) -> float:
+        """TTL for `url`'s host: the most specific PAGE_CACHE_DOMAIN_TTLS match, else the default."""
+        host = (urlsplit(url).hostname or "").lower()
+        while host:
+            if host in self.domain_ttls:
+                return self.domain_ttls[host]
+            _, _, host = host.partition(".")
+        return self.default_ttl_s
+
+    def cacheable(self, url: str) -> bool:
+        return self.ttl_for(url) > 0
+
+    def get(self, url: str, variant: str = RAW) -> Optional[CachedPage]:
+        """Return the stored page (fresh or stale), or None. Counts hits, stale hits and misses."""
+        key = normalize_page_url(url)
+        ttl_s = self.ttl_for(key)
+        if ttl_s <= 0:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, content_type, body, etag, last_modified, stored_at FROM page_cache "
+                "WHERE url=? AND variant=?",
+                (key, variant),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE page_cache SET accessed_at=? WHERE url=? AND variant=?", (time.time(), key, variant)
+            )
+            self._conn.commit()
+        try:
+            body = zlib.decompress(row[2])
+        except zlib.error:
+            logger.warning("Dropping corrupt page cache entry for %s", key)
+            self.delete(key, variant)
+            return None
+        page = CachedPage(key, variant, row[0], row[1], body, row[3], row[4], row[5], ttl_s)
+        with self._lock:
+            if page.fresh:
+                self.hits += 1
+            else:
+                self.stale += 1
+        return page
+
+    def put(self, url: str, body: bytes, *, variant: str = RAW, status: int = 200, content_type: str = "text/html",
+            etag: str = "", last_modified: str = "", cache_control: str = "") -> bool:
+        """Store a page; returns False if it is not cacheable (TTL 0, no-store, too large, not a 200)."""
+        key = normalize_page_url(url)
+        if status != 200 or not body or len(body) > self.max_body_bytes or not self.cacheable(key):
+            return False
+        if "no-store" in (cache_control or "").lower():
+            return False
+        blob = zlib.compress(body, 6)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM page_cache WHERE url=? AND variant=?", (key, variant)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_cache "
+                "(url, variant, status, content_type, body, size, etag, last_modified, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, variant, status, content_type or "", blob, len(blob), etag or "", last_modified or "", now, now),
+            )
+            self._total_bytes += len(blob) - (row[0] if row else 0)
+            self.stores += 1
+            self._evict_locked()
+            self._conn.commit()
+        return True
+
+    def refresh(self, url: str, variant: str = RAW, etag: str = "", last_modified: str = "") -> None:
+        """Mark an entry fresh again after a 304, updating validators the server sent back."""
+        key = normalize_page_url(url)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE page_cache SET stored_at=?, accessed_at=?, "
+                "etag=CASE WHEN ?='' THEN etag ELSE ? END, "
+                "last_modified=CASE WHEN ?='' THEN last_modified ELSE ? END "
+                "WHERE url=? AND variant=?",
+                (now, now, etag or "", etag or "", last_modified or "", last_modified or "", key, variant),
+            )
+            self._conn.commit()
+            self.revalidated += 1
+
+    def delete(self, url: str, variant: str = RAW) -> None:
+        key = normalize_page_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM page_cache WHERE url=? AND variant=?", (key, variant)
+            ).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM page_cache WHERE url=? AND variant=?", (key, variant))
+            self._total_bytes -= row[0]
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT rowid, size FROM page_cache ORDER BY accessed_at ASC LIMIT 32"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for rowid, size in rows:
+                self._conn.execute("DELETE FROM page_cache WHERE rowid=?", (rowid,))
+                self._total_bytes -= size
+                self.evictions += 1
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM page_cache").fetchone()
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "default_ttl_s": self.default_ttl_s,
+                "domain_ttls": dict(self.domain_ttls),
+                "hits": self.hits,
+                "stale": self.stale,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "stores": self.stores,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM page_cache")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[PageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """Return the process-wide page cache, or None when disabled via PAGE_CACHE=0."""
+    global _cache
+    if os.getenv("PAGE_CACHE", "1").lower() not in ("1", "true", "yes"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = PageCache(
+                        os.getenv("PAGE_CACHE_PATH", _DEFAULT_PATH),
+                        default_ttl_s=float(os.getenv("PAGE_CACHE_TTL_S", str(6 * 3600))),
+                        domain_ttls=parse_domain_ttls(os.getenv("PAGE_CACHE_DOMAIN_TTLS", "")),
+                        max_bytes=int(os.getenv("PAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+                        max_body_bytes=int(os.getenv("PAGE_CACHE_MAX_BODY_BYTES", str(5 * 1024 * 1024))),
+                    )
+                except Exception:
+                    logger.exception("Page cache unavailable; continuing without it")
+                    return None
+    return _cache
+
+
+class PageCacheMiddleware:
+    """Scrapy downloader middleware serving and storing pages through the page cache.
+
+    Plain-HTTP requests use the "raw" variant and are revalidated with
+    conditional GETs; Playwright requests use the "rendered" variant, which has
+    no validators and is simply refetched once stale. Set
+    `meta["page_cache"] = False` on a request to bypass the cache.
+    """
+
+    def __init__(self, cache: Optional[PageCache]):
+        self.cache = cache
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("PAGE_CACHE_ENABLED", True):
+            return cls(None)
+        return cls(get_page_cache())
+
+    @staticmethod
+    def _variant(request) -> str:
+        return RENDERED if request.meta.get("playwright") else RAW
+
+    def _build_response(self, request, page: CachedPage, flag: str):
+        from scrapy.http import Headers
+        from scrapy.responsetypes import responsetypes
+
+        headers = Headers({"Content-Type": page.content_type} if page.content_type else {})
+        respcls = responsetypes.from_args(headers=headers, url=request.url, body=page.body)
+        return respcls(url=request.url, status=page.status, headers=headers, body=page.body,
+                       request=request, flags=[flag])
+
+    def process_request(self, request, spider):
+        if self.cache is None or request.method != "GET" or request.meta.get("page_cache") is False:
+            return None
+        page = self.cache.get(request.url, self._variant(request))
+        if page is None:
+            request.meta["page_cache"] = "miss"
+            return None
+        if page.fresh:
+            request.meta["page_cache"] = "hit"
+            if getattr(spider, "crawler", None) is not None:
+                spider.crawler.stats.inc_value("page_cache/hit")
+            return self._build_response(request, page, "cached")
+        conditional = page.conditional_headers()
+        if page.variant == RAW and conditional:
+            for name, value in conditional.items():
+                request.headers[name] = value
+            request.meta["page_cache"] = "revalidate"
+        else:
+            request.meta["page_cache"] = "stale"
+        return None
+
+    def process_response(self, request, response, spider):
+        if self.cache is None or request.method != "GET" or request.meta.get("page_cache") is False:
+            return response
+        variant = self._variant(request)
+        stats = spider.crawler.stats if getattr(spider, "crawler", None) is not None else None
+        if "cached" in response.flags:
+            return response
+
+        def header(name):
+            value = response.headers.get(name)
+            return value.decode("latin-1") if value else ""
+
+        if response.status == 304 and request.meta.get("page_cache") == "revalidate":
+            self.cache.refresh(request.url, variant, header("ETag"), header("Last-Modified"))
+            page = self.cache.get(request.url, variant)
+            if page is not None:
+                if stats is not None:
+                    stats.inc_value("page_cache/revalidated")
+                return self._build_response(request, page, "revalidated")
+            return response
+
+        if response.status == 200 and self.cache.put(
+            response.url,
+            response.body,
+            variant=variant,
+            content_type=header("Content-Type"),
+            etag=header("ETag"),
+            last_modified=header("Last-Modified"),
+            cache_control=header("Cache-Control"),
+        ):
+            if stats is not None:
+                stats.inc_value("page_cache/stored")
+        return response
+
+
+def serve_document_route(route, request, cache: Optional[PageCache]) -> bool:
+    """Playwright route handler step: answer a GET document request from the cache.
+
+    Fresh entries are fulfilled without network. Stale ones are revalidated with
+    a conditional `route.fetch()` and fulfilled from the cache on 304. Fetched
+    200s are stored and passed through. Returns False when the request was not
+    handled, so the caller should `route.continue_()` it.
+    """
+    if cache is None or request.method != "GET" or request.resource_type != "document":
+        return False
+    url = request.url
+    if not cache.cacheable(url):
+        return False
+
+    page = cache.get(url, RAW)
+    if page is not None and page.fresh:
+        route.fulfill(status=page.status, content_type=page.content_type or None, body=page.body)
+        return True
+
+    headers = dict(request.headers)
+    if page is not None:
+        headers.update(page.conditional_headers())
+    response = route.fetch(headers=headers)
+    resp_headers = {k.lower(): v for k, v in (response.headers or {}).items()}
+
+    if response.status == 304 and page is not None:
+        cache.refresh(url, RAW, resp_headers.get("etag", ""), resp_headers.get("last-modified", ""))
+        route.fulfill(status=page.status, content_type=page.content_type or None, body=page.body)
+        return True
+
+    body = response.body()
+    if response.status == 200:
+        cache.put(
+            url,
+            body,
+            content_type=resp_headers.get("content-type", ""),
+            etag=resp_headers.get("etag", ""),
+            last_modified=resp_headers.get("last-modified", ""),
+            cache_control=resp_headers.get("cache-control", ""),
+        )
+    route.fulfill(response=response, body=body)
+    return True
+
+
+async def serve_document_route_async(route, request, cache: Optional[PageCache]) -> bool:
+    """`serve_document_route` for `playwright.async_api` routes."""
+    if cache is None or request.method != "GET" or request.resource_type != "document":
+        return False
+    url = request.url
+    if not cache.cacheable(url):
+        return False
+
+    page = cache.get(url, RAW)
+    if page is not None and page.fresh:
+        await route.fulfill(status=page.status, content_type=page.content_type or None, body=page.body)
+        return True
+
+    headers = dict(request.headers)
+    if page is not None:
+        headers.update(page.conditional_headers())
+    response = await route.fetch(headers=headers)
+    resp_headers = {k.lower(): v for k, v in (response.headers or {}).items()}
+
+    if response.status == 304 and page is not None:
+        cache.refresh(url, RAW, resp_headers.get("etag", ""), resp_headers.get("last-modified", ""))
+        await route.fulfill(status=page.status, content_type=page.content_type or None, body=page.body)
+        return True
+
+    body = await response.body()
+    if response.status == 200:
+        cache.put(
+            url,
+            body,
+            content_type=resp_headers.get("content-type", ""),
+            etag=resp_headers.get("etag", ""),
+            last_modified=resp_headers.get("last-modified", ""),
+            cache_control=resp_headers.get("cache-control", ""),
+        )
+    await route.fulfill(response=response, body=body)
+    return True
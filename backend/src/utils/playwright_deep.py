@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import logging
-import re
 import time
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse, urldefrag
 
+from src.utils.browser_pool import DEFAULT_USER_AGENT, BrowserPool, browser_pool_enabled, get_browser_pool
+from src.utils.extract import extract_contacts
+from src.utils.frontier import CrawlFrontier
+from src.utils.identity import canonical_profile_url
+from src.utils.page_cache import get_page_cache, serve_document_route, serve_document_route_async
+from src.utils.throttle import get_throttle
+
 
 logger = logging.getLogger(__name__)
 
@@ -15,18 +24,22 @@ logger = logging.getLogger(__name__)
 ProgressCallback = Callable[[Dict[str, Any]], None]
 
 
-_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
-_PHONE_RE = re.compile(
-    r"(?:(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?)?\d{3,4}[\s.-]?\d{3,4}"
-)
-
-
 @dataclass(frozen=True)
 class CrawlConfig:
     max_pages: int = 25
     max_depth: int = 3
     total_timeout_s: int = 120
     navigation_timeout_ms: int = 45_000
+    # Tabs loading pages at once within one crawl (1 = one page at a time)
+    concurrency: int = 1
+    # Visible text read per page (contacts, profile scoring); longer pages are cut
+    max_text_chars: int = 200_000
+    # Drop fragment/javascript:/mailto:/tel: and repeated anchors inside the page
+    prefilter_anchors: bool = True
+    # "priority": visit the best-scored links first (see _link_priority); "fifo": breadth-first
+    frontier: str = "priority"
+    # Links waiting in the frontier; the lowest-scored are evicted beyond this
+    max_frontier: int = 2000
     same_domain_only: bool = True
     deny_domains: Tuple[str, ...] = (
         # Default deny list for sites that often block automation or require auth.
@@ -87,6 +100,39 @@ def _looks_like_people_directory(u: str) -> bool:
     return any(t in path for t in tokens)
 
 
+_POSITIVE_ANCHOR_CUES = (
+    "team", "people", "staff", "leadership", "faculty", "directory", "members", "management",
+    "board", "our lab", "who we are", "bio", "profile", "researchers", "experts",
+)
+_NEGATIVE_ANCHOR_CUES = (
+    "privacy", "terms", "cookie", "login", "log in", "sign in", "register", "careers", "jobs",
+    "blog", "news", "press", "events", "shop", "cart", "download",
+)
+
+
+def _site_section(u: str) -> str:
+    """First path segment ("/team/jane" -> "team"); pages in a section tend to yield alike."""
+    path = (urlparse(u).path or "").strip("/").lower()
+    return path.split("/", 1)[0]
+
+
+def _link_priority(depth: int, is_directory: bool, profile_score: int, anchor_text: str,
+                   section_yield: float) -> float:
+    """Frontier score of a link; higher is visited sooner."""
+    score = -10.0 * depth
+    if is_directory:
+        score += 30
+    score += 0.5 * min(profile_score, 100)
+    text = anchor_text.lower()
+    if any(cue in text for cue in _POSITIVE_ANCHOR_CUES):
+        score += 15
+    if any(cue in text for cue in _NEGATIVE_ANCHOR_CUES):
+        score -= 15
+    # sections that already produced people are likely to produce more
+    score += 8 * min(section_yield, 5.0)
+    return score
+
+
 def _safe_json_loads(s: str) -> Optional[Any]:
     try:
         return json.loads(s)
@@ -160,49 +206,609 @@ def _extract_people_from_jsonld(jsonld_texts: List[str]) -> List[Dict[str, Any]]
 
 
 def _extract_contacts(text: str) -> Tuple[List[str], List[str]]:
-    emails = []
-    phones = []
+    contacts = extract_contacts(text, max_emails=10, max_phones=10)
+    return contacts.emails, contacts.phones
+
+
+# One evaluate() roundtrip per page instead of title(), inner_text() and two
+# eval_on_selector_all() calls. With `prefilter` set, anchors that the crawler
+# would discard anyway (fragments, javascript:, mailto:/tel:, repeated hrefs)
+# are dropped in the page so they never cross the driver connection.
+_EXTRACT_JS = """
+({maxText, prefilter}) => {
+  const body = document.body;
+  let text = body ? (body.innerText || '') : '';
+  const truncated = text.length > maxText;
+  if (truncated) text = text.slice(0, maxText);
+
+  const anchors = [], mailto = [], tel = [], seen = new Set();
+  for (const a of document.querySelectorAll('a[href]')) {
+    const href = a.getAttribute('href') || '';
+    const lower = href.trim().toLowerCase();
+    if (lower.startsWith('mailto:')) {
+      mailto.push(href.trim().slice(7).split('?')[0]);
+      if (prefilter) continue;
+    } else if (lower.startsWith('tel:')) {
+      tel.push(href.trim().slice(4));
+      if (prefilter) continue;
+    } else if (prefilter && (!lower || lower.startsWith('#') || lower.startsWith('javascript:'))) {
+      continue;
+    }
+    if (prefilter) {
+      if (seen.has(href)) continue;
+      seen.add(href);
+    }
+    anchors.push({href, text: (a.innerText || '').trim()});
+  }
+
+  const jsonld = Array.from(document.querySelectorAll('script[type="application/ld+json"]'), s => s.textContent || '');
+  const meta = {};
+  for (const m of document.querySelectorAll('meta[name], meta[property]')) {
+    const key = (m.getAttribute('name') || m.getAttribute('property') || '').toLowerCase();
+    if (key && !(key in meta)) meta[key] = m.getAttribute('content') || '';
+  }
+  return {title: document.title || '', text, truncated, anchors, jsonld, mailto, tel, meta};
+}
+"""
+
+_ANCHORS_JS = "els => els.map(a => ({href: a.getAttribute('href') || '', text: (a.innerText || '').trim()}))"
+_JSONLD_JS = "els => els.map(s => s.textContent || '')"
+
+
+@dataclass
+class PageSnapshot:
+    """Everything the deep crawler reads from a loaded page."""
+
+    title: str = ""
+    text: str = ""
+    anchors: List[Dict[str, Any]] = field(default_factory=list)
+    jsonld: List[str] = field(default_factory=list)
+    mailto: List[str] = field(default_factory=list)
+    tel: List[str] = field(default_factory=list)
+    meta: Dict[str, str] = field(default_factory=dict)
+    truncated: bool = False
+
+    @classmethod
+    def from_script(cls, data: Dict[str, Any]) -> "PageSnapshot":
+        return cls(
+            title=str(data.get("title") or ""),
+            text=str(data.get("text") or ""),
+            anchors=list(data.get("anchors") or []),
+            jsonld=[str(x) for x in (data.get("jsonld") or [])],
+            mailto=[str(x) for x in (data.get("mailto") or [])],
+            tel=[str(x) for x in (data.get("tel") or [])],
+            meta=dict(data.get("meta") or {}),
+            truncated=bool(data.get("truncated")),
+        )
 
-    if text:
-        emails = list({e for e in _EMAIL_RE.findall(text) if "example.com" not in e.lower()})
-        phones = list({p.strip() for p in _PHONE_RE.findall(text) if p and len(re.sub(r"\D", "", p)) >= 7})
+    def contact_text(self) -> str:
+        """Visible text plus mailto:/tel: link targets, for contact extraction."""
+        links = [f"mailto:{m}" for m in self.mailto] + [f"tel:{t}" for t in self.tel]
+        return self.text + ("\n" + "\n".join(links) if links else "")
 
-    return emails[:10], phones[:10]
 
+def _script_args(cfg: CrawlConfig) -> Dict[str, Any]:
+    return {"maxText": cfg.max_text_chars, "prefilter": cfg.prefilter_anchors}
 
-def crawl_people_deep(
-    start_url: str,
-    *,
-    config: Optional[CrawlConfig] = None,
-    progress_callback: Optional[ProgressCallback] = None,
-) -> List[Dict[str, Any]]:
-    """Crawl a site using Playwright, following internal links, extracting people signals.
 
-    Outputs a list of "person" dicts (name/title/company/email/phone/profile_url) plus
-    a few metadata fields: source_url, page_url.
+def _read_page_legacy(page) -> PageSnapshot:
+    """Per-part driver calls; fallback when the extraction script fails. Parts that fail are empty."""
+    snap = PageSnapshot()
+    try:
+        snap.title = page.title() or ""
+    except Exception:
+        pass
 
-    Notes:
-    - By default it only visits URLs on the same domain as start_url.
-    - It does NOT attempt to bypass logins or scrape restricted sites.
+    try:
+        snap.text = page.inner_text("body")
+    except Exception:
+        pass
+
+    # Extract anchor links (href + visible text)
+    try:
+        snap.anchors = page.eval_on_selector_all("a[href]", _ANCHORS_JS)
+    except Exception:
+        pass
+
+    # Extract json-ld blobs
+    try:
+        snap.jsonld = [str(x) for x in page.eval_on_selector_all('script[type="application/ld+json"]', _JSONLD_JS)]
+    except Exception:
+        pass
+
+    return snap
+
+
+def _read_page(page, cfg: CrawlConfig) -> PageSnapshot:
+    try:
+        return PageSnapshot.from_script(page.evaluate(_EXTRACT_JS, _script_args(cfg)))
+    except Exception:
+        logger.debug("extraction script failed on %s; using per-part reads", getattr(page, "url", ""), exc_info=True)
+        return _read_page_legacy(page)
+
+
+async def _read_page_async(page, cfg: CrawlConfig) -> PageSnapshot:
+    """`_read_page` for a `playwright.async_api` page."""
+    try:
+        return PageSnapshot.from_script(await page.evaluate(_EXTRACT_JS, _script_args(cfg)))
+    except Exception:
+        logger.debug("extraction script failed on %s; using per-part reads", getattr(page, "url", ""), exc_info=True)
+
+    snap = PageSnapshot()
+    try:
+        snap.title = await page.title() or ""
+    except Exception:
+        pass
+    try:
+        snap.text = await page.inner_text("body")
+    except Exception:
+        pass
+    try:
+        snap.anchors = await page.eval_on_selector_all("a[href]", _ANCHORS_JS)
+    except Exception:
+        pass
+    try:
+        snap.jsonld = [str(x) for x in await page.eval_on_selector_all('script[type="application/ld+json"]', _JSONLD_JS)]
+    except Exception:
+        pass
+    return snap
+
+
+class _DeepCrawlState:
+    """Frontier, dedupe sets and per-page processing shared by the serial and multi-tab crawls.
+
+    Pages are processed in pop order by both modes. With the FIFO frontier a
+    multi-tab crawl therefore visits the same pages and yields the same people,
+    in the same order, as a serial one. With the priority frontier, URLs already
+    in flight were picked before the pages ahead of them had added their links,
+    so under a tight max_pages budget a multi-tab crawl can pick a few different
+    pages than a serial one would.
     """
 
-    cfg = config or CrawlConfig()
+    def __init__(self, start_url_norm: str, cfg: CrawlConfig, emit: Callable[[Dict[str, Any]], None],
+                 page_analysis: Callable[..., Any]):
+        self.start_url_norm = start_url_norm
+        self.cfg = cfg
+        self.emit = emit
+        # page_analysis(text, jsonlds).score(url) -> (is_profile, score); see src/utils/profile.py
+        self.page_analysis = page_analysis
+        self.url_analysis = page_analysis()
+        self.visited: Set[str] = set()
+        self.queued: Set[str] = {start_url_norm}
+        self.frontier = CrawlFrontier(cfg.max_frontier)
+        self.frontier.push(start_url_norm, 0)
+        # people found / pages visited per site section, learned as the crawl goes
+        self.section_pages: Dict[str, int] = {}
+        self.section_people: Dict[str, int] = {}
+        self.people_out: List[Dict[str, Any]] = []
+        self.seen_people_keys: Set[str] = set()
+        self.pages_visited = 0
+        self.timings: Dict[str, float] = {"navigate_s": 0.0, "extract_s": 0.0, "process_s": 0.0}
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """Next crawlable (url, depth), marking it visited; None when the frontier is empty."""
+        while self.frontier:
+            url, depth = self.frontier.pop()
+            if url in self.visited:
+                continue
+            self.visited.add(url)
+
+            # Skip denied domains (still allow extraction from pages we did visit).
+            try:
+                host = (urlparse(url).hostname or "").lower()
+            except Exception:
+                host = ""
+            if host in self.cfg.deny_domains:
+                continue
 
-    visited: Set[str] = set()
-    queued: Set[str] = set()
+            self.emit({"type": "progress", "phase": "deep", "url": url, "depth": depth})
+            return url, depth
+        return None
 
-    start_url_norm = _normalize_url(start_url, start_url)
-    if not start_url_norm:
-        return []
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def timing_summary(self) -> Dict[str, float]:
+        """Seconds spent per phase, summed over pages (tabs overlap, so this can exceed wall time)."""
+        return {k: round(v, 3) for k, v in self.timings.items()}
+
+    def section_yield(self, url: str) -> float:
+        """People per visited page in the url's site section so far (0 while unexplored)."""
+        section = _site_section(url)
+        return self.section_people.get(section, 0) / (self.section_pages.get(section, 0) + 1)
+
+    def done_event(self) -> Dict[str, Any]:
+        return {
+            "type": "progress",
+            "phase": "deep",
+            "msg": f"deep crawl done: pages={len(self.visited)} people={len(self.people_out)}",
+            "timings": self.timing_summary(),
+        }
+
+    def process_page(self, page, url: str, depth: int) -> List[Dict[str, Any]]:
+        """Extract people from a loaded page and enqueue its links; returns the newly found people."""
+        started = time.monotonic()
+        snap = _read_page(page, self.cfg)
+        self.add_time("extract_s", time.monotonic() - started)
+        return self.ingest(url, depth, snap)
+
+    async def process_page_async(self, page, url: str, depth: int) -> List[Dict[str, Any]]:
+        """`process_page` for a `playwright.async_api` page."""
+        started = time.monotonic()
+        snap = await _read_page_async(page, self.cfg)
+        self.add_time("extract_s", time.monotonic() - started)
+        return self.ingest(url, depth, snap)
+
+    def ingest(self, url: str, depth: int, snap: PageSnapshot) -> List[Dict[str, Any]]:
+        started = time.monotonic()
+        try:
+            return self._ingest(url, depth, snap)
+        finally:
+            self.add_time("process_s", time.monotonic() - started)
+
+    def _ingest(self, url: str, depth: int, snap: PageSnapshot) -> List[Dict[str, Any]]:
+        cfg = self.cfg
+        analysis = self.page_analysis(snap.text, snap.jsonld)
+        self.pages_visited += 1
+        found_from = len(self.people_out)
+        title, body_text, anchors, jsonlds = snap.title, snap.text, snap.anchors, snap.jsonld
+
+        emails, phones = _extract_contacts(snap.contact_text())
+
+        people = _extract_people_from_jsonld(jsonlds)
+
+        # Heuristic: LinkedIn person profile links found on-page
+        for a in anchors or []:
+            href = str(a.get("href") or "")
+            text = str(a.get("text") or "")
+            abs_u = _normalize_url(url, href)
+            if not abs_u:
+                continue
+            if "linkedin.com/in/" in abs_u:
+                people.append(
+                    {
+                        "name": text,
+                        "title": "",
+                        "company": "",
+                        "email": "",
+                        "phone": "",
+                        "profile_url": abs_u,
+                        "linkedin_url": abs_u,
+                    }
+                )
+
+            # Use the profile URL heuristic to detect other profile links
+            try:
+                is_profile, score = analysis.score(abs_u)
+            except Exception:
+                is_profile, score = False, 0
+
+            if is_profile:
+                # If it's a profile link but not already captured, add as a person
+                people.append(
+                    {
+                        "name": text,
+                        "title": "",
+                        "company": "",
+                        "email": "",
+                        "phone": "",
+                        "profile_url": abs_u,
+                        "linkedin_url": abs_u if "linkedin.com" in abs_u else "",
+                        "_profile_score": score,
+                    }
+                )
+
+        # Attach metadata and de-dupe
+        for person in people:
+            profile_url = (person.get("profile_url") or "").strip()
+            linkedin_url = (person.get("linkedin_url") or profile_url).strip()
+            email = (person.get("email") or "").strip().lower()
+            name = (person.get("name") or "").strip().lower()
+
+            # canonical form, so /in/jane-doe/?trk=... and uk.linkedin.com/in/Jane-Doe count once
+            key = canonical_profile_url(profile_url or linkedin_url) or email or (name + "|" + url)
+            if not key or key in self.seen_people_keys:
+                continue
+
+            self.seen_people_keys.add(key)
+
+            enriched = {
+                **person,
+                "profile_url": profile_url or linkedin_url,
+                "page_url": url,
+                "source_url": self.start_url_norm,
+                "page_title": title,
+                "page_emails": emails,
+                "page_phones": phones,
+                "page_text": (body_text or "")[:2000],
+            }
+            self.people_out.append(enriched)
+
+        section = _site_section(url)
+        self.section_pages[section] = self.section_pages.get(section, 0) + 1
+        self.section_people[section] = self.section_people.get(section, 0) + len(self.people_out) - found_from
+
+        # Enqueue next links
+        if depth < cfg.max_depth:
+            # FIFO: directory and profile links first, then the rest, in page order
+            next_links: List[Tuple[str, float]] = []
+            preferred: List[Tuple[str, float]] = []
+
+            for a in anchors or []:
+                href = str(a.get("href") or "")
+                abs_u = _normalize_url(url, href)
+                if not abs_u:
+                    continue
+                if abs_u in self.visited or abs_u in self.queued:
+                    continue
+
+                if cfg.same_domain_only and not _is_same_domain(self.start_url_norm, abs_u):
+                    continue
+
+                if "linkedin.com" in abs_u:
+                    # keep as extracted link, but don't crawl
+                    continue
+
+                is_directory = _looks_like_people_directory(abs_u)
+                try:
+                    is_profile, profile_score = self.url_analysis.score(abs_u)
+                except Exception:
+                    is_profile, profile_score = False, 0
+
+                priority = 0.0
+                if cfg.frontier == "priority":
+                    priority = _link_priority(depth + 1, is_directory, profile_score, str(a.get("text") or ""),
+                                              self.section_yield(abs_u))
+                # Prioritize single-person profile links as preferred so we crawl them early
+                if is_directory or is_profile:
+                    preferred.append((abs_u, priority))
+                else:
+                    next_links.append((abs_u, priority))
+
+            for link, priority in preferred + next_links:
+                if link in self.visited or link in self.queued:
+                    continue
+                added, evicted = self.frontier.push(link, depth + 1, priority)
+                if evicted is not None:
+                    # may be queued again if a later page links it with a better score
+                    self.queued.discard(evicted)
+                if added:
+                    self.queued.add(link)
+
+        return self.people_out[found_from:]
+
+
+def _install_routes(context) -> None:
+    page_cache = get_page_cache()
+
+    # Speed: block heavy resources and serve documents from the shared page cache
+    def _route(route, request):
+        try:
+            if request.resource_type in ("image", "media", "font"):
+                route.abort()
+            elif not serve_document_route(route, request, page_cache):
+                route.continue_()
+        except Exception:
+            try:
+                route.continue_()
+            except Exception:
+                pass
+
+    try:
+        context.route("**/*", _route)
+    except Exception:
+        # Some environments disallow routing; continue without it.
+        pass
+
+
+def _crawl_serial(context, state: _DeepCrawlState, deadline: float, timeout_error: type) -> None:
+    cfg = state.cfg
+    emit = state.emit
+    throttle = get_throttle()
+
+    page = context.new_page()
+    page.set_default_timeout(cfg.navigation_timeout_ms)
+
+    while state.frontier and state.pages_visited < cfg.max_pages and time.time() < deadline:
+        popped = state.pop()
+        if popped is None:
+            break
+        url, depth = popped
+
+        # Per-domain pacing shared with the Scrapy crawls (see src/utils/throttle.py)
+        if not throttle.acquire(url, timeout=max(0.0, deadline - time.time())):
+            break
+        nav_started = time.monotonic()
+        status, retry_after, nav_error = 0, None, False
+        try:
+            response = page.goto(url, wait_until="domcontentloaded")
+            if response is not None:
+                status = response.status
+                retry_after = response.headers.get("retry-after")
+        except timeout_error:
+            nav_error = True
+            emit({"type": "error", "phase": "deep", "url": url, "msg": "navigation timeout"})
+            continue
+        except Exception as e:
+            nav_error = True
+            emit({"type": "error", "phase": "deep", "url": url, "msg": str(e)})
+            continue
+        finally:
+            state.add_time("navigate_s", time.monotonic() - nav_started)
+            throttle.release(url, status=status, latency_s=time.monotonic() - nav_started,
+                             retry_after=retry_after, error=nav_error)
+
+        state.process_page(page, url, depth)
+
+    try:
+        page.close()
+    except Exception:
+        pass
+
+
+class _TabNavigation:
+    """A navigation in flight on one tab, tracked through page events.
+
+    The sync API blocks in `page.goto()`, so several tabs cannot each await
+    their own goto. Instead the navigation is started from script (returns at
+    once) and finishes when the tab fires "domcontentloaded", when its main
+    document request fails, or when the navigation timeout passes.
+    """
+
+    def __init__(self, page, url: str, timeout_s: float):
+        self.page = page
+        self.url = url
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout_s
+        self.done = False
+        self.error: Optional[str] = None
+        self.status = 0
+        self.retry_after: Optional[str] = None
+        page.on("response", self._on_response)
+        page.on("requestfailed", self._on_request_failed)
+        page.on("domcontentloaded", self._on_dom_content_loaded)
+        try:
+            page.evaluate("u => { setTimeout(() => { window.location.href = u; }, 0); }", url)
+        except Exception as e:
+            self._finish(str(e))
+
+    def _is_main_document(self, request) -> bool:
+        try:
+            return request.is_navigation_request() and request.frame == self.page.main_frame
+        except Exception:
+            return False
+
+    def _on_response(self, response) -> None:
+        if self._is_main_document(response.request):
+            self.status = response.status
+            self.retry_after = response.headers.get("retry-after")
+
+    def _on_request_failed(self, request) -> None:
+        if self._is_main_document(request):
+            self._finish(request.failure or "navigation failed")
+
+    def _on_dom_content_loaded(self, _page) -> None:
+        self._finish(None)
+
+    def _finish(self, error: Optional[str]) -> None:
+        if self.done:
+            return
+        self.done = True
+        self.error = error
+        for event, handler in (("response", self._on_response), ("requestfailed", self._on_request_failed),
+                               ("domcontentloaded", self._on_dom_content_loaded)):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+
+    def check_timeout(self) -> None:
+        if not self.done and time.monotonic() >= self.deadline:
+            self._finish("navigation timeout")
+
+
+def _crawl_concurrent(context, state: _DeepCrawlState, deadline: float) -> None:
+    """Keep up to cfg.concurrency tabs loading while finished pages are processed in pop order."""
+    cfg = state.cfg
+    emit = state.emit
+    throttle = get_throttle()
+    # the configured tab count, not the throttle's starting guess, sets the parallelism
+    # until the site pushes back
+    throttle.allow_concurrency(state.start_url_norm, cfg.concurrency)
+    nav_timeout_s = cfg.navigation_timeout_ms / 1000
+
+    def new_tab():
+        tab = context.new_page()
+        tab.set_default_timeout(cfg.navigation_timeout_ms)
+        return tab
+
+    idle_tabs = [new_tab() for _ in range(cfg.concurrency)]
+    # [url, depth, tab, navigation]; tab/navigation are None until the throttle lets it start
+    window: List[List[Any]] = []
+
+    def release(entry: List[Any]) -> None:
+        nav = entry[3]
+        state.add_time("navigate_s", time.monotonic() - nav.started)
+        throttle.release(entry[0], status=nav.status, latency_s=time.monotonic() - nav.started,
+                         retry_after=nav.retry_after, error=nav.error is not None)
+
+    try:
+        while time.time() < deadline:
+            # Fill the window from the frontier; in-flight pages count against max_pages.
+            while len(window) < cfg.concurrency and state.pages_visited + len(window) < cfg.max_pages:
+                popped = state.pop()
+                if popped is None:
+                    break
+                window.append([popped[0], popped[1], None, None])
+            if not window:
+                break
+
+            for entry in window:
+                if entry[3] is None and idle_tabs and throttle.acquire(entry[0], timeout=0):
+                    entry[2] = idle_tabs.pop()
+                    entry[3] = _TabNavigation(entry[2], entry[0], nav_timeout_s)
+                if entry[3] is not None:
+                    entry[3].check_timeout()
+
+            head = window[0]
+            if head[3] is None or not head[3].done:
+                # Let Playwright dispatch page events while the tabs load.
+                pump = head[2] or next((e[2] for e in window if e[2] is not None), None) or idle_tabs[0]
+                pump.wait_for_timeout(20)
+                continue
+
+            window.pop(0)
+            url, depth, tab, nav = head
+            release(head)
+            if nav.error is not None:
+                emit({"type": "error", "phase": "deep", "url": url, "msg": nav.error})
+                # the tab is in an unknown state (error page, pending download); replace it
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+                idle_tabs.append(new_tab())
+                continue
 
-    q: List[Tuple[str, int]] = [(start_url_norm, 0)]
-    queued.add(start_url_norm)
+            state.process_page(tab, url, depth)
+            idle_tabs.append(tab)
+    finally:
+        for entry in window:
+            if entry[3] is not None:
+                entry[3]._finish("deadline reached")
+                release(entry)
+        for tab in idle_tabs + [e[2] for e in window if e[2] is not None]:
+            try:
+                tab.close()
+            except Exception:
+                pass
 
-    people_out: List[Dict[str, Any]] = []
-    seen_people_keys: Set[str] = set()
 
+def _crawl_in_context(
+    context,
+    start_url_norm: str,
+    cfg: CrawlConfig,
+    emit: Callable[[Dict[str, Any]], None],
+    page_analysis: Callable[..., Any],
+    timeout_error: type,
+) -> _DeepCrawlState:
+    """Run the deep crawl inside an open browser context; returns the finished crawl state.
+
+    The context is owned by the caller (a pooled lease or a one-off browser).
+    With cfg.concurrency > 1 pages are loaded in that many tabs at once.
+    """
+    state = _DeepCrawlState(start_url_norm, cfg, emit, page_analysis)
     deadline = time.time() + max(5, int(cfg.total_timeout_s))
 
+    _install_routes(context)
+    if cfg.concurrency > 1:
+        _crawl_concurrent(context, state, deadline)
+    else:
+        _crawl_serial(context, state, deadline, timeout_error)
+    return state
+
+
+def _emitter(progress_callback: Optional[ProgressCallback]) -> Callable[[Dict[str, Any]], None]:
     def emit(evt: Dict[str, Any]) -> None:
         if progress_callback is None:
             return
@@ -211,13 +817,55 @@ def crawl_people_deep(
         except Exception:
             logger.exception("progress_callback failed")
 
+    return emit
+
+
+class _NoProfileAnalysis:
+    # Fallback stub; safest default is to not mark things as profiles
+    def __init__(self, page_text: Optional[str] = None, jsonld_texts: Optional[List[str]] = None):
+        pass
+
+    def score(self, url: str) -> Tuple[bool, int]:
+        return (False, 0)
+
+
+def _load_page_analysis() -> Callable[..., Any]:
     # Local import to avoid adding startup cost when module is imported
     try:
-        from src.utils.profile import is_profile_url
+        from src.utils.profile import PageAnalysis
     except Exception:
-        # Fallback stub; safest default is to not mark things as profiles
-        def is_profile_url(url: str, page_text: Optional[str] = None, jsonld_texts: Optional[List[str]] = None):
-            return (False, 0)
+        return _NoProfileAnalysis
+    return PageAnalysis
+
+
+def crawl_people_deep(
+    start_url: str,
+    *,
+    config: Optional[CrawlConfig] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    browser_pool: Optional[BrowserPool] = None,
+) -> List[Dict[str, Any]]:
+    """Crawl a site using Playwright, following internal links, extracting people signals.
+
+    Outputs a list of "person" dicts (name/title/company/email/phone/profile_url) plus
+    a few metadata fields: source_url, page_url.
+
+    Notes:
+    - By default it only visits URLs on the same domain as start_url.
+    - It does NOT attempt to bypass logins or scrape restricted sites.
+    - The crawl runs in a fresh context leased from the shared browser pool
+      (`browser_pool`, default `get_browser_pool()`); set DEEP_BROWSER_POOL=0 to
+      launch a dedicated browser per call instead.
+    """
+
+    cfg = config or CrawlConfig()
+
+    start_url_norm = _normalize_url(start_url, start_url)
+    if not start_url_norm:
+        return []
+
+    emit = _emitter(progress_callback)
+    page_analysis = _load_page_analysis()
 
     # Import Playwright lazily inside the function to avoid import-time side effects
     try:
@@ -231,222 +879,208 @@ def crawl_people_deep(
     if sync_playwright is None:
         # If Playwright isn't installed, emit and return early from the function
         emit({"type": "progress", "phase": "deep", "msg": f"playwright not available, skipping deep crawl: {start_url_norm}"})
-        return people_out
+        return []
 
     emit({"type": "progress", "phase": "deep", "msg": f"deep crawl started: {start_url_norm}"})
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            ),
-        )
+    def _crawl(context):
+        return _crawl_in_context(context, start_url_norm, cfg, emit, page_analysis, PlaywrightTimeoutError)
+
+    if browser_pool is None and browser_pool_enabled():
+        browser_pool = get_browser_pool()
 
-        # Speed: block heavy resources
-        def _route(route, request):
+    if browser_pool is not None:
+        # Lease an isolated context on a long-lived browser instead of launching one
+        state = browser_pool.run(_crawl)
+    else:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            context = browser.new_context(user_agent=DEFAULT_USER_AGENT)
             try:
-                if request.resource_type in ("image", "media", "font"):
-                    route.abort()
-                else:
-                    route.continue_()
-            except Exception:
+                state = _crawl(context)
+            finally:
                 try:
-                    route.continue_()
+                    context.close()
+                except Exception:
+                    pass
+                try:
+                    browser.close()
                 except Exception:
                     pass
 
-        try:
-            context.route("**/*", _route)
-        except Exception:
-            # Some environments disallow routing; continue without it.
-            pass
+    emit(state.done_event())
+    return state.people_out
 
-        page = context.new_page()
-        page.set_default_timeout(cfg.navigation_timeout_ms)
 
-        pages_visited = 0
+# -- asyncio API --------------------------------------------------------------
 
-        while q and pages_visited < cfg.max_pages and time.time() < deadline:
-            url, depth = q.pop(0)
-            if url in visited:
-                continue
-            visited.add(url)
 
-            # Skip denied domains (still allow extraction from pages we did visit).
+async def _close_quietly(closable) -> None:
+    try:
+        await closable.close()
+    except Exception:
+        pass
+
+
+async def _install_routes_async(context) -> None:
+    page_cache = get_page_cache()
+
+    async def _route(route, request):
+        try:
+            if request.resource_type in ("image", "media", "font"):
+                await route.abort()
+            elif not await serve_document_route_async(route, request, page_cache):
+                await route.continue_()
+        except Exception:
             try:
-                host = (urlparse(url).hostname or "").lower()
+                await route.continue_()
             except Exception:
-                host = ""
-            if host in cfg.deny_domains:
-                continue
+                pass
 
-            emit({"type": "progress", "phase": "deep", "url": url, "depth": depth})
+    try:
+        await context.route("**/*", _route)
+    except Exception:
+        pass
+
+
+async def _acquire_async(throttle, url: str, deadline: float) -> bool:
+    """Wait for the shared domain throttle without blocking the event loop; False at the deadline."""
+    while not throttle.acquire(url, timeout=0):
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(max(throttle.blocked_for(url), 0.05), remaining))
+    return True
+
+
+async def _crawl_async(context, state: _DeepCrawlState, deadline: float,
+                       timeout_error: type) -> AsyncIterator[Dict[str, Any]]:
+    """Async twin of `_crawl_concurrent`: up to cfg.concurrency navigations in flight, processed in pop order."""
+    cfg = state.cfg
+    emit = state.emit
+    throttle = get_throttle()
+    throttle.allow_concurrency(state.start_url_norm, cfg.concurrency)
+    idle_tabs: List[Any] = []
+    window: deque = deque()  # (url, depth, tab, navigation task)
+
+    async def navigate(tab, url: str) -> Optional[str]:
+        """Load `url` in `tab`; returns an error message, or None once the DOM is ready."""
+        if not await _acquire_async(throttle, url, deadline):
+            return "deadline reached"
+        started = time.monotonic()
+        status, retry_after, error = 0, None, None
+        try:
+            response = await tab.goto(url, wait_until="domcontentloaded")
+            if response is not None:
+                status = response.status
+                retry_after = response.headers.get("retry-after")
+        except timeout_error:
+            error = "navigation timeout"
+        except Exception as e:
+            error = str(e)
+        finally:
+            state.add_time("navigate_s", time.monotonic() - started)
+            throttle.release(url, status=status, latency_s=time.monotonic() - started,
+                             retry_after=retry_after, error=error is not None)
+        return error
 
-            try:
-                page.goto(url, wait_until="domcontentloaded")
-            except PlaywrightTimeoutError:
-                emit({"type": "error", "phase": "deep", "url": url, "msg": "navigation timeout"})
-                continue
-            except Exception as e:
-                emit({"type": "error", "phase": "deep", "url": url, "msg": str(e)})
+    try:
+        while time.time() < deadline:
+            while len(window) < max(1, cfg.concurrency) and state.pages_visited + len(window) < cfg.max_pages:
+                popped = state.pop()
+                if popped is None:
+                    break
+                if idle_tabs:
+                    tab = idle_tabs.pop()
+                else:
+                    tab = await context.new_page()
+                    tab.set_default_timeout(cfg.navigation_timeout_ms)
+                window.append((popped[0], popped[1], tab, asyncio.ensure_future(navigate(tab, popped[0]))))
+            if not window:
+                break
+
+            url, depth, tab, task = window[0]
+            done, _pending = await asyncio.wait({task}, timeout=max(0.0, deadline - time.time()))
+            if not done:
+                break
+            window.popleft()
+            error = task.result()
+            if error is not None:
+                emit({"type": "error", "phase": "deep", "url": url, "msg": error})
+                await _close_quietly(tab)
                 continue
 
-            pages_visited += 1
-
-            # Extract content
-            try:
-                title = page.title() or ""
-            except Exception:
-                title = ""
+            found = await state.process_page_async(tab, url, depth)
+            idle_tabs.append(tab)
+            for person in found:
+                yield person
+    finally:
+        # Runs on exhaustion, on aclose() and when the consuming task is cancelled.
+        tasks = [entry[3] for entry in window]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for tab in idle_tabs + [entry[2] for entry in window]:
+            await _close_quietly(tab)
+
+
+async def iter_people_deep(
+    start_url: str,
+    *,
+    config: Optional[CrawlConfig] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    browser=None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Deep crawl on `playwright.async_api`, yielding people as their pages are processed.
+
+    Same people, order and progress events as `crawl_people_deep`, but nothing
+    blocks a thread: call it straight from the FastAPI event loop. Pass a
+    launched async `browser` to share one Chromium between crawls; otherwise one
+    is launched for this crawl. Cancelling the consuming task (or `aclose()`)
+    stops in-flight navigations and closes the context and any browser it launched.
+    """
+    cfg = config or CrawlConfig()
 
-            try:
-                body_text = page.inner_text("body")
-            except Exception:
-                body_text = ""
+    start_url_norm = _normalize_url(start_url, start_url)
+    if not start_url_norm:
+        return
 
-            emails, phones = _extract_contacts(body_text)
+    emit = _emitter(progress_callback)
+    page_analysis = _load_page_analysis()
 
-            # Extract anchor links (href + visible text)
-            try:
-                anchors = page.eval_on_selector_all(
-                    "a[href]",
-                    "els => els.map(a => ({href: a.getAttribute('href') || '', text: (a.innerText || '').trim()}))",
-                )
-            except Exception:
-                anchors = []
+    try:
+        from playwright.async_api import async_playwright
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    except Exception:
+        emit({"type": "progress", "phase": "deep", "msg": f"playwright not available, skipping deep crawl: {start_url_norm}"})
+        return
 
-            # Extract json-ld blobs
-            try:
-                jsonlds = page.eval_on_selector_all(
-                    'script[type="application/ld+json"]',
-                    "els => els.map(s => s.textContent || '')",
-                )
-            except Exception:
-                jsonlds = []
+    emit({"type": "progress", "phase": "deep", "msg": f"deep crawl started: {start_url_norm}"})
+    state = _DeepCrawlState(start_url_norm, cfg, emit, page_analysis)
+    deadline = time.time() + max(5, int(cfg.total_timeout_s))
 
-            people = _extract_people_from_jsonld([str(x) for x in (jsonlds or [])])
+    async with contextlib.AsyncExitStack() as stack:
+        if browser is None:
+            p = await stack.enter_async_context(async_playwright())
+            browser = await p.chromium.launch(headless=True)
+            stack.push_async_callback(_close_quietly, browser)
+        context = await browser.new_context(user_agent=DEFAULT_USER_AGENT)
+        stack.push_async_callback(_close_quietly, context)
 
-            # Heuristic: LinkedIn person profile links found on-page
-            for a in anchors or []:
-                href = str(a.get("href") or "")
-                text = str(a.get("text") or "")
-                abs_u = _normalize_url(url, href)
-                if not abs_u:
-                    continue
-                if "linkedin.com/in/" in abs_u:
-                    people.append(
-                        {
-                            "name": text,
-                            "title": "",
-                            "company": "",
-                            "email": "",
-                            "phone": "",
-                            "profile_url": abs_u,
-                            "linkedin_url": abs_u,
-                        }
-                    )
-
-                # Use the profile URL heuristic to detect other profile links
-                try:
-                    is_profile, score = is_profile_url(abs_u, page_text=body_text, jsonld_texts=jsonlds)
-                except Exception:
-                    is_profile, score = False, 0
-
-                if is_profile:
-                    # If it's a profile link but not already captured, add as a person
-                    people.append(
-                        {
-                            "name": text,
-                            "title": "",
-                            "company": "",
-                            "email": "",
-                            "phone": "",
-                            "profile_url": abs_u,
-                            "linkedin_url": abs_u if "linkedin.com" in abs_u else "",
-                            "_profile_score": score,
-                        }
-                    )
-
-            # Attach metadata and de-dupe
-            for person in people:
-                profile_url = (person.get("profile_url") or "").strip()
-                linkedin_url = (person.get("linkedin_url") or profile_url).strip()
-                email = (person.get("email") or "").strip().lower()
-                name = (person.get("name") or "").strip().lower()
-
-                key = profile_url or linkedin_url or email or (name + "|" + url)
-                if not key or key in seen_people_keys:
-                    continue
+        await _install_routes_async(context)
+        async for person in _crawl_async(context, state, deadline, PlaywrightTimeoutError):
+            yield person
 
-                seen_people_keys.add(key)
-
-                enriched = {
-                    **person,
-                    "profile_url": profile_url or linkedin_url,
-                    "page_url": url,
-                    "source_url": start_url_norm,
-                    "page_title": title,
-                    "page_emails": emails,
-                    "page_phones": phones,
-                    "page_text": (body_text or "")[:2000],
-                }
-                people_out.append(enriched)
-
-            # Enqueue next links
-            if depth < cfg.max_depth:
-                # prefer directory pages early
-                next_links: List[str] = []
-                preferred: List[str] = []
-
-                for a in anchors or []:
-                    href = str(a.get("href") or "")
-                    abs_u = _normalize_url(url, href)
-                    if not abs_u:
-                        continue
-                    if abs_u in visited or abs_u in queued:
-                        continue
-
-                    if cfg.same_domain_only and not _is_same_domain(start_url_norm, abs_u):
-                        continue
-
-                    if "linkedin.com" in abs_u:
-                        # keep as extracted link, but don't crawl
-                        continue
-
-                    if _looks_like_people_directory(abs_u):
-                        preferred.append(abs_u)
-                    else:
-                        # Prioritize single-person profile links as preferred so we crawl them early
-                        try:
-                            is_profile, _score = is_profile_url(abs_u)
-                        except Exception:
-                            is_profile = False
-                        if is_profile:
-                            preferred.append(abs_u)
-                        else:
-                            next_links.append(abs_u)
-
-                # Add preferred links first
-                for link in preferred + next_links:
-                    if link in visited or link in queued:
-                        continue
-                    queued.add(link)
-                    q.append((link, depth + 1))
+    emit(state.done_event())
 
-        try:
-            page.close()
-        except Exception:
-            pass
-        try:
-            context.close()
-        except Exception:
-            pass
-        try:
-            browser.close()
-        except Exception:
-            pass
 
-    emit({"type": "progress", "phase": "deep", "msg": f"deep crawl done: pages={len(visited)} people={len(people_out)}"})
-    return people_out
+async def crawl_people_deep_async(
+    start_url: str,
+    *,
+    config: Optional[CrawlConfig] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    browser=None,
+) -> List[Dict[str, Any]]:
+    """Async `crawl_people_deep`: the same list of people, collected from `iter_people_deep`."""
+    return [person async for person in iter_people_deep(
+        start_url, config=config, progress_callback=progress_callback, browser=browser)]
@@ -1,10 +1,12 @@
 """Heuristics to detect person/profile pages from URLs and page content.
 
-Provides a single function `is_profile_url(url, page_text=None, jsonld_texts=None)`
-that returns (is_profile: bool, score: int).
+Provides `is_profile_url(url, page_text=None, jsonld_texts=None)` that returns
+(is_profile: bool, score: int), and `PageAnalysis` for scoring many links found
+on the same page.
 """
 import json
 import re
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
 
@@ -50,15 +52,9 @@ def _looks_like_person_schema(jsonld_texts: Optional[List[str]]) -> bool:
     return False
 
 
-def is_profile_url(url: str, page_text: Optional[str] = None, jsonld_texts: Optional[List[str]] = None) -> Tuple[bool, int]:
-    """Return (is_profile, score) where score >= 60 indicates a likely profile.
-
-    The function is conservative and can be called with just a URL (fast), or with
-    page_text and jsonld_texts for higher confidence.
-    """
-    if not url:
-        return False, 0
-
+@lru_cache(maxsize=65536)
+def url_score(url: str) -> int:
+    """URL-only part of the profile score; cached because a site's pages link to the same URLs."""
     u = url.lower()
     score = 0
 
@@ -85,6 +81,13 @@ def is_profile_url(url: str, page_text: Optional[str] = None, jsonld_texts: Opti
     if "/author" in u or "?author=" in u or "&author=" in u:
         score += 10
 
+    return score
+
+
+def content_score(page_text: Optional[str] = None, jsonld_texts: Optional[List[str]] = None) -> int:
+    """Page-level part of the profile score (visible text and JSON-LD); the same for every link on a page."""
+    score = 0
+
     # content signals
     if page_text:
         if _NAME_RE.search(page_text[:200]):
@@ -99,4 +102,35 @@ def is_profile_url(url: str, page_text: Optional[str] = None, jsonld_texts: Opti
     except Exception:
         pass
 
-    return (score >= 60, score)
+    return score
+
+
+class PageAnalysis:
+    """Profile signals of one page, computed once and combined with cached URL scores per link.
+
+    `PageAnalysis(text, jsonlds).score(url)` equals `is_profile_url(url, text, jsonlds)`,
+    but parses the JSON-LD and scans the text once per page instead of once per link.
+    """
+
+    __slots__ = ("content_score",)
+
+    def __init__(self, page_text: Optional[str] = None, jsonld_texts: Optional[List[str]] = None):
+        self.content_score = content_score(page_text, jsonld_texts)
+
+    def score(self, url: str) -> Tuple[bool, int]:
+        if not url:
+            return False, 0
+        score = url_score(url) + self.content_score
+        return (score >= 60, score)
+
+
+def is_profile_url(url: str, page_text: Optional[str] = None, jsonld_texts: Optional[List[str]] = None) -> Tuple[bool, int]:
+    """Return (is_profile, score) where score >= 60 indicates a likely profile.
+
+    The function is conservative and can be called with just a URL (fast), or with
+    page_text and jsonld_texts for higher confidence. To score many links from one
+    page, build a `PageAnalysis` once instead.
+    """
+    if not url:
+        return False, 0
+    return PageAnalysis(page_text, jsonld_texts).score(url)
@@ -0,0 +1,146 @@
+"""Propensity scoring with all keyword categories compiled into one matcher.
+
+`calculate_propensity_score` used to run one `keyword in text` scan per
+keyword (35 over every item's page text, the role keywords twice). Here the
+categories are compiled once into a `KeywordMatcher`:
+
+- with pyahocorasick installed, an Aho-Corasick automaton that finds every
+  keyword, overlapping ones included, in a single pass over the text;
+- otherwise one `in` scan per distinct keyword.
+
+The title, which only counts for the role keywords, is short and checked
+against those alone. `hits()` returns the distinct keywords found per category, and
+`PropensityScorer` turns those into the same capped scores as before. A
+keyword counts once however often it appears, as with the `in` checks.
+"""
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class KeywordCategory:
+    name: str
+    keywords: Tuple[str, ...]
+    points: int  # per distinct keyword found
+    cap: int
+    in_title: bool = False  # also match the title, not only the page text
+
+
+PROPENSITY_CATEGORIES: Tuple[KeywordCategory, ...] = (
+    # Role Fit: relevant titles/roles
+    KeywordCategory("role", ("toxicology", "safety", "hepatic", "3d", "preclinical",
+                             "drug development", "director", "head of", "vp", "chief"), 5, 30, in_title=True),
+    # Company Intent: funding indicators
+    KeywordCategory("funding", ("series a", "series b", "funding", "raised", "investment", "ipo"), 5, 20),
+    # Technographic: tech adoption
+    KeywordCategory("tech", ("in vitro", "3d model", "organ-on-chip", "spheroid", "nam",
+                             "new approach methodologies"), 5, 15),
+    # Location: hub detection
+    KeywordCategory("location", ("boston", "cambridge", "bay area", "basel", "san francisco", "uk"), 5, 10),
+    # Scientific Intent: publication indicators
+    KeywordCategory("science", ("publication", "published", "research", "dili", "liver injury", "toxicity"), 8, 40),
+)
+
+LINKEDIN_BONUS = 5
+BUSINESS_EMAIL_BONUS = 5
+_FREE_MAIL_RE = re.compile(r"gmail|yahoo|hotmail")
+
+
+class KeywordMatcher:
+    def __init__(self, categories: Sequence[KeywordCategory]):
+        self.categories = tuple(categories)
+        owners: Dict[str, List[int]] = {}  # keyword -> indexes of the categories listing it
+        for index, category in enumerate(self.categories):
+            for keyword in category.keywords:
+                indexes = owners.setdefault(keyword.lower(), [])
+                if index not in indexes:
+                    indexes.append(index)
+        self._owners = owners
+        self._keywords = tuple(owners)
+        title_indexes = {i for i, c in enumerate(self.categories) if c.in_title}
+        # title hits only count for in_title categories
+        self._title_owners = {k: [i for i in v if i in title_indexes] for k, v in owners.items()
+                              if not title_indexes.isdisjoint(v)}
+        self._title_keywords = tuple(self._title_owners)
+        self._automaton = self._build_automaton(self._keywords)
+        self.backend = "aho-corasick" if self._automaton is not None else "substring"
+
+    @staticmethod
+    def _build_automaton(keywords: Sequence[str]):
+        try:
+            import ahocorasick
+        except ImportError:
+            return None
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+
+    def found(self, text: str) -> set:
+        """Distinct keywords occurring in `text` (already lowercased)."""
+        if not text:
+            return set()
+        if self._automaton is not None:
+            return {keyword for _end, keyword in self._automaton.iter(text)}
+        return {keyword for keyword in self._keywords if keyword in text}
+
+    def hits(self, text: str, title: str = "") -> List[set]:
+        """Keywords found, per category (in `categories` order)."""
+        result: List[set] = [set() for _ in self.categories]
+        for keyword in self.found(text):
+            for index in self._owners[keyword]:
+                result[index].add(keyword)
+        if title:
+            # a handful of short checks; not worth a pass of the automaton
+            for keyword in self._title_keywords:
+                if keyword in title:
+                    for index in self._title_owners[keyword]:
+                        result[index].add(keyword)
+        return result
+
+
+class PropensityScorer:
+    """Score 0-100: capped per-category keyword points plus LinkedIn and business-email bonuses."""
+
+    def __init__(self, categories: Sequence[KeywordCategory] = PROPENSITY_CATEGORIES):
+        self.matcher = KeywordMatcher(categories)
+
+    def _parts(self, data: Dict[str, Any]):
+        hits = self.matcher.hits((data.get("text_content") or "").lower(), (data.get("title") or "").lower())
+        scores = [min(c.points * len(found), c.cap) for c, found in zip(self.matcher.categories, hits)]
+        linkedin = LINKEDIN_BONUS if data.get("linkedin_urls") else 0
+        emails = data.get("emails", [])
+        business = any("@" in email and not _FREE_MAIL_RE.search(email.lower()) for email in emails)
+        return hits, scores, linkedin, BUSINESS_EMAIL_BONUS if business else 0
+
+    def score(self, data: Dict[str, Any]) -> int:
+        _hits, scores, linkedin, email_bonus = self._parts(data)
+        return min(sum(scores) + linkedin + email_bonus, 100)
+
+    def breakdown(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-category hit counts and capped scores behind `score()`."""
+        hits, scores, linkedin, email_bonus = self._parts(data)
+        names = [c.name for c in self.matcher.categories]
+        return {
+            "hits": {name: len(found) for name, found in zip(names, hits)},
+            "scores": dict(zip(names, scores)),
+            "linkedin_bonus": linkedin,
+            "email_bonus": email_bonus,
+            "total": min(sum(scores) + linkedin + email_bonus, 100),
+        }
+
+
+_scorer: Optional[PropensityScorer] = None
+_scorer_lock = threading.Lock()
+
+
+def get_propensity_scorer() -> PropensityScorer:
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = PropensityScorer()
+    return _scorer
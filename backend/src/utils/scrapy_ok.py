@@ -1,11 +1,61 @@
 import scrapy
 import re
 import importlib
+import weakref
 from urllib.parse import urljoin
 from scrapy.settings import Settings
+from scrapy.spidermiddlewares.httperror import HttpError
 from scrapy.utils.project import get_project_settings
 import logging
 
+from src.utils.extract import extract_contacts
+
+
+# Markup left behind by client-rendered apps when served without JavaScript:
+# an empty mount point, Angular bootstrapping, or a "please enable JavaScript" notice.
+_SPA_MARKERS_RE = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt|svelte)["\'][^>]*>\s*</div>'
+    r'|\bng-app\b|\bng-version=|<app-root[^>]*>\s*</app-root>'
+    r'|<noscript>[^<]{0,300}(?:enable|requires?) javascript',
+    re.IGNORECASE,
+)
+
+
+_BOT_WALL_STATUSES = (403, 429, 503)
+
+
+def _bot_wall_status(failure):
+    """The status of an HttpError failure with a bot-wall status (403/429/503), else None."""
+    if not failure.check(HttpError):
+        return None
+    status = getattr(getattr(failure.value, "response", None), "status", None)
+    return status if status in _BOT_WALL_STATUSES else None
+
+
+def needs_javascript(response, min_text_chars=200, expected_selector="p, h1, h2, h3"):
+    """Return (needs_js, reason) for a response fetched without a browser.
+
+    Flags pages whose content is likely rendered client-side: no visible body
+    text, SPA bootstrap markers, or none of the elements we extract text from.
+    """
+    try:
+        html = response.text
+    except AttributeError:
+        # binary / non-text response: a browser would not help
+        return False, ""
+
+    if _SPA_MARKERS_RE.search(html[:200_000]):
+        return True, "spa-marker"
+
+    body_text = " ".join(t.strip() for t in response.css("body :not(script):not(style)::text").getall() if t.strip())
+    if len(body_text) < min_text_chars:
+        return True, "empty-body-text"
+
+    if expected_selector and not response.css(expected_selector):
+        return True, "missing-selectors"
+
+    return False, ""
+
 
 class MySpider(scrapy.Spider):
     name = "myspider"
@@ -13,14 +63,17 @@ class MySpider(scrapy.Spider):
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
     }
 
-    def __init__(self, start_url=None, collected=None, *args, **kwargs):
+    def __init__(self, start_url=None, collected=None, item_callback=None, *args, **kwargs):
         super(MySpider, self).__init__(*args, **kwargs)
         # honor either start_url (single) or start_urls (list) if provided
         self.start_url = start_url or (getattr(self, 'start_urls', [None])[0]) or "https://example.com"
         self.extracted_data = {}
         # External collector (list) can be passed in for programmatic use
         self.collected = collected if isinstance(collected, list) else []
-        self.logger = logging.getLogger(__name__)
+        # Optional item_callback(start_url, item), invoked as soon as each page is parsed
+        self.item_callback = item_callback
+        # extract_contacts result per response, shared by parse and the extract_* helpers
+        self._contacts = weakref.WeakKeyDictionary()
 
     def start_requests(self):
         # If start_urls class attribute present, iterate those; otherwise use start_url
@@ -30,30 +83,39 @@ class MySpider(scrapy.Spider):
         else:
             urls = [self.start_url]
 
+        # FETCH_MODE: "tiered" (plain HTTP first, escalate to Playwright only when the
+        # page needs JavaScript), "playwright" (always render) or "http" (never render).
+        use_browser = self._fetch_mode() == "playwright"
         for u in urls:
             self.logger.info("Starting request for URL: %s", u)
             yield scrapy.Request(
                 url=u,
                 callback=self.parse,
                 errback=self.errback_handler,
-                meta={"playwright": True}  # Triggers headless browser
+                # playwright triggers the headless browser; start_url survives redirects
+                meta={
+                    "playwright": use_browser,
+                    "fetch_tier": "playwright" if use_browser else "http",
+                    "start_url": u,
+                },
             )
 
-    def start_requests(self):
-        # If start_urls class attribute present, iterate those; otherwise use start_url
-        urls = []
-        if getattr(self, 'start_urls', None):
-            urls = list(self.start_urls)
-        else:
-            urls = [self.start_url]
-
-        for u in urls:
-            yield scrapy.Request(
-                url=u,
-                callback=self.parse,
-                errback=self.errback_handler,
-                meta={"playwright": True}  # Triggers headless browser
-            )
+    def _fetch_mode(self):
+        settings = getattr(self, "settings", None)
+        return (settings.get("FETCH_MODE", "tiered") if settings is not None else "tiered").lower()
+
+    def _escalate(self, request, reason):
+        """Re-issue a plain-HTTP request through Playwright, or return None if not applicable."""
+        if self._fetch_mode() != "tiered" or request.meta.get("fetch_tier") != "http":
+            return None
+        self.logger.info("Escalating %s to Playwright (%s)", request.url, reason)
+        if getattr(self, "crawler", None) is not None:
+            self.crawler.stats.inc_value(f"fetch_tier/escalated/{reason}")
+        escalated = request.replace(dont_filter=True)
+        escalated.meta["playwright"] = True
+        escalated.meta["fetch_tier"] = "playwright"
+        escalated.meta["escalation_reason"] = reason
+        return escalated
 
     async def start(self):
         """Async-compatible start() for Scrapy 2.13+ (keeps backward compat with start_requests)."""
@@ -63,22 +125,29 @@ class MySpider(scrapy.Spider):
     def parse(self, response):
         """Extract lead enrichment data from the webpage"""
         self.logger.info("Parsing response for URL: %s, status: %s", response.url, response.status)
+        if response.meta.get("fetch_tier") == "http":
+            settings = getattr(self, "settings", None)
+            needs_js, reason = needs_javascript(
+                response,
+                min_text_chars=settings.getint("FETCH_JS_MIN_TEXT", 200) if settings is not None else 200,
+                expected_selector=settings.get("FETCH_EXPECTED_SELECTOR", "p, h1, h2, h3") if settings is not None else "p, h1, h2, h3",
+            )
+            if needs_js:
+                escalated = self._escalate(response.request, reason)
+                if escalated is not None:
+                    yield escalated
+                    return
+        fetch_tier = response.meta.get("fetch_tier") or ("playwright" if response.meta.get("playwright") else "http")
+        if getattr(self, "crawler", None) is not None:
+            self.crawler.stats.inc_value(f"fetch_tier/{fetch_tier}")
         try:
-            # Extract emails
-            emails = self.extract_emails(response)
-            self.logger.debug("Extracted emails: %s", emails)
-
-            # Extract phone numbers
-            phones = self.extract_phones(response)
-            self.logger.debug("Extracted phones: %s", phones)
-
-            # Extract LinkedIn URLs
-            linkedin_urls = self.extract_linkedin(response)
-            self.logger.debug("Extracted LinkedIn URLs: %s", linkedin_urls)
-
-            # Extract location/HQ info
-            location = self.extract_location(response)
-            self.logger.debug("Extracted location: %s", location)
+            # One pass over the page for emails, phones, LinkedIn links and location snippets
+            contacts = self.extract_contacts(response)
+            emails = contacts.emails
+            phones = contacts.phones
+            linkedin_urls = contacts.linkedin_urls
+            location = contacts.locations
+            self.logger.debug("Extracted contacts: %s", contacts)
 
             # Extract company info
             company_info = self.extract_company_info(response)
@@ -92,7 +161,9 @@ class MySpider(scrapy.Spider):
                 "linkedin_urls": linkedin_urls,
                 "location": location,
                 "company_info": company_info,
-                "text_content": self.extract_text(response)
+                "text_content": self.extract_text(response),
+                # which fetch tier served this page: "http" or "playwright"
+                "fetch_tier": fetch_tier,
             }
 
             self.logger.info("Successfully extracted data for URL: %s", response.url)
@@ -104,52 +175,45 @@ class MySpider(scrapy.Spider):
                 except Exception:
                     self.logger.exception("Failed to append extracted data to collector")
 
+            if self.item_callback is not None:
+                try:
+                    self.item_callback(response.meta.get("start_url", response.url), self.extracted_data)
+                except Exception:
+                    self.logger.exception("item_callback failed for URL: %s", response.url)
+
             yield self.extracted_data
         except Exception as e:
             self.logger.exception("Error during parsing for URL: %s", response.url)
             yield {"error": str(e), "url": response.url}
 
+    def extract_contacts(self, response):
+        """Extract emails, phones, LinkedIn URLs and location snippets in a single pass (once per response)"""
+        contacts = self._contacts.get(response)
+        if contacts is None:
+            contacts = self._contacts[response] = extract_contacts(
+                response.text,
+                max_emails=5,
+                max_phones=5,
+                max_locations=3,
+                max_linkedin=5,
+            )
+        return contacts
+
     def extract_emails(self, response):
         """Extract email addresses from page"""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        text = response.text
-        emails = list(set(re.findall(email_pattern, text)))
-        # Filter out common false positives
-        emails = [e for e in emails if not any(x in e.lower() for x in ['example.com', 'sentry.io', 'w3.org'])]
-        return emails[:5]  # Limit to top 5
+        return self.extract_contacts(response).emails
 
     def extract_phones(self, response):
         """Extract phone numbers from page"""
-        phone_patterns = [
-            r'\+?1?[-.]?\(?\d{3}\)?[-.]?\d{3}[-.]?\d{4}',  # US format
-            r'\+\d{1,3}[-.]?\d{1,4}[-.]?\d{1,4}[-.]?\d{1,9}',  # International
-        ]
-        phones = []
-        for pattern in phone_patterns:
-            phones.extend(re.findall(pattern, response.text))
-        return list(set(phones))[:5]
+        return self.extract_contacts(response).phones
 
     def extract_linkedin(self, response):
         """Extract LinkedIn profile URLs"""
-        linkedin_urls = response.css('a[href*="linkedin.com"]::attr(href)').getall()
-        linkedin_urls = [url for url in linkedin_urls if '/in/' in url or '/company/' in url]
-        return list(set(linkedin_urls))[:5]
+        return self.extract_contacts(response).linkedin_urls
 
     def extract_location(self, response):
         """Extract location/HQ information"""
-        # Look for common location keywords
-        location_keywords = ['headquarters', 'hq', 'location', 'office', 'address', 'based in']
-        text_lower = response.text.lower()
-
-        locations = []
-        for keyword in location_keywords:
-            if keyword in text_lower:
-                # Extract surrounding text
-                idx = text_lower.find(keyword)
-                snippet = response.text[max(0, idx-50):min(len(response.text), idx+100)]
-                locations.append(snippet.strip())
-
-        return locations[:3] if locations else []
+        return self.extract_contacts(response).locations
 
     def extract_company_info(self, response):
         """Extract company information"""
@@ -168,6 +232,14 @@ class MySpider(scrapy.Spider):
     def errback_handler(self, failure):
         """Handle request failures"""
         url = failure.request.url if hasattr(failure, 'request') else "unknown"
+        # Bot walls and JS challenges often answer plain HTTP clients with 403/429/503;
+        # retry those through the browser before giving up. A 404 or a DNS error
+        # would fail the same way in a browser.
+        status = _bot_wall_status(failure)
+        if status is not None and hasattr(failure, 'request'):
+            escalated = self._escalate(failure.request, f"http-{status}")
+            if escalated is not None:
+                return escalated
         self.logger.error("Request failed for URL: %s, failure: %s", url, failure)
         self.logger.error("Failure type: %s, failure value: %s", type(failure), failure.value if hasattr(failure, 'value') else 'N/A')
         if hasattr(failure, 'request') and hasattr(failure.request, 'meta'):
@@ -179,9 +251,6 @@ class MySpider(scrapy.Spider):
             "failure_value": str(failure.value) if hasattr(failure, 'value') else 'N/A'
         }
 
-from scrapy.crawler import CrawlerProcess
-from scrapy.utils.project import get_project_settings
-
 
 def _load_spider_settings(module_name='src.utils.settings'):
     """Load uppercase settings from the project's settings module into a Scrapy Settings object."""
@@ -197,75 +266,81 @@ def _load_spider_settings(module_name='src.utils.settings'):
 
 
 def crawl_url(start_url, settings=None, timeout=None):
-    """Run MySpider synchronously against a single URL and return collected items.
+    """Run MySpider against a single URL and return collected items.
 
-    This convenience helper is suitable for local POCs. For production you
-    should run Scrapy in a worker process or use a queue.
+    The crawl runs on the process-wide reactor owned by `CrawlerService`, so this
+    can be called repeatedly and from any thread. Blocks for at most `timeout`
+    seconds (default: CRAWL_TIMEOUT env, 120); a crawl that overruns is stopped
+    and whatever was collected so far is returned.
     """
-    import logging
+    import concurrent.futures
+    import os
+    from src.utils.crawler_service import get_crawler_service
+
     logger = logging.getLogger(__name__)
     logger.info("Starting crawl_url for URL: %s", start_url)
     collected = []
     # Reduce Scrapy logger noise for programmatic runs (avoid repeated startup messages)
     try:
-        import logging
         logging.getLogger('scrapy').setLevel(logging.WARNING)
         logging.getLogger('scrapy.utils.log').setLevel(logging.WARNING)
     except Exception:
         pass
 
-    if settings is None:
-        try:
-            proc_settings = _load_spider_settings()
-            if proc_settings is None:
-                proc_settings = get_project_settings()
-        except NameError:
-            # If helper is not present for any reason, fallback to project settings
-            proc_settings = get_project_settings()
-    else:
-        s = Settings()
-        s.setdict(settings)
-        proc_settings = s
+    if timeout is None:
+        timeout = int(os.getenv("CRAWL_TIMEOUT", "120"))
 
-    logger.debug("Using settings: %s", dict(proc_settings))
+    service = get_crawler_service()
+    fut = service.submit(MySpider, settings=settings, start_url=start_url, collected=collected)
+    try:
+        fut.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        logger.warning("Crawl timed out for URL: %s after %s seconds; stopping it", start_url, timeout)
+        service.stop(fut)
+    except Exception as e:
+        logger.exception("Crawl failed for URL: %s: %s", start_url, e)
 
-    # Run using CrawlerRunner so we can control reactor startup safely across threads
-    from scrapy.crawler import CrawlerRunner
-    from twisted.internet import reactor, defer
-    import threading
+    logger.info("Crawl completed for URL: %s, collected %d items", start_url, len(collected))
+    return list(collected)
 
-    runner = CrawlerRunner(settings=proc_settings)
 
-    @defer.inlineCallbacks
-    def _run():
-        logger.info("CrawlerRunner starting crawl for URL: %s", start_url)
-        yield runner.crawl(MySpider, start_url=start_url, collected=collected)
+def crawl_urls(urls, on_item=None, settings=None, timeout=None):
+    """Crawl many URLs in one MySpider run and return all collected items.
 
-    d = _run()
+    All start URLs are scheduled together, so Scrapy fetches them concurrently
+    within CONCURRENT_REQUESTS / CONCURRENT_REQUESTS_PER_DOMAIN. `on_item(start_url, item)`
+    is called as soon as each page is parsed; it runs on the reactor thread, so
+    keep it cheap (e.g. push onto a queue). Blocks for at most `timeout` seconds
+    (default: CRAWL_TIMEOUT env, 120) for the whole batch; on timeout the crawl is
+    stopped and the items collected so far are returned.
+    """
+    import concurrent.futures
+    import os
+    from src.utils.crawler_service import get_crawler_service
 
-    def _stop(_=None):
-        try:
-            logger.info("Stopping reactor for URL: %s", start_url)
-            reactor.stop()
-        except Exception as e:
-            logger.exception("Error stopping reactor: %s", e)
+    logger = logging.getLogger(__name__)
+    # dedupe while keeping order
+    urls = [u for u in dict.fromkeys(urls or []) if u]
+    if not urls:
+        return []
 
-    d.addBoth(_stop)
+    if timeout is None:
+        timeout = int(os.getenv("CRAWL_TIMEOUT", "120"))
 
+    logger.info("Starting crawl_urls for %d URLs", len(urls))
+    collected = []
+    service = get_crawler_service()
+    fut = service.submit(MySpider, settings=settings, start_urls=urls, collected=collected, item_callback=on_item)
     try:
-        # If we're in the main thread allow reactor to install signal handlers; otherwise avoid it.
-        if threading.current_thread() is threading.main_thread():
-            logger.debug("Running reactor in main thread for URL: %s", start_url)
-            reactor.run()
-        else:
-            logger.debug("Running reactor in worker thread for URL: %s", start_url)
-            reactor.run(installSignalHandlers=False)
+        fut.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        logger.warning("Batch crawl of %d URLs timed out after %s seconds; stopping it", len(urls), timeout)
+        service.stop(fut)
     except Exception as e:
-        # reactor may already be running in some environments; just return what we have
-        logger.exception("Error running reactor for URL: %s", e)
+        logger.exception("Batch crawl failed: %s", e)
 
-    logger.info("Crawl completed for URL: %s, collected %d items", start_url, len(collected))
-    return collected
+    logger.info("Batch crawl completed: %d URLs, collected %d items", len(urls), len(collected))
+    return list(collected)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+"""On-disk TTL cache for search backend results.
+
+Results are stored in a local SQLite file keyed by (backend, normalized query,
+max_results) so repeated campaign queries skip DDGS/Google/Bing entirely.
+
+- Entries younger than `ttl_s` are served directly (hit).
+- Entries older than `ttl_s` but within `stale_s` are served immediately and
+  refreshed on a background thread (stale-while-revalidate).
+- The table is bounded to `max_entries`; the least recently used rows are evicted.
+
+Configure with SEARCH_CACHE (0 disables), SEARCH_CACHE_PATH, SEARCH_CACHE_TTL_S,
+SEARCH_CACHE_STALE_S and SEARCH_CACHE_MAX_ENTRIES.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "cache",
+    "search_cache.sqlite3",
+)
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share an entry."""
+    return " ".join((query or "").lower().split())
+
+
+class SearchCache:
+    def __init__(self, path: str, ttl_s: float = 3600, stale_s: float = 86400, max_entries: int = 5000):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.stale_s = stale_s
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    backend TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    max_results INTEGER NOT NULL,
+                    results TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (backend, query, max_results)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache (accessed_at)")
+            self._conn.commit()
+
+    def get(self, backend: str, query: str, max_results: int) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """Return (results, age_seconds) for a cached entry, or None. Does not update counters."""
+        key = (backend, normalize_query(query), int(max_results))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, created_at FROM search_cache WHERE backend=? AND query=? AND max_results=?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE search_cache SET accessed_at=? WHERE backend=? AND query=? AND max_results=?",
+                (now,) + key,
+            )
+            self._conn.commit()
+        try:
+            return json.loads(row[0]), now - row[1]
+        except ValueError:
+            return None
+
+    def set(self, backend: str, query: str, max_results: int, results: List[Dict[str, Any]]) -> None:
+        key = (backend, normalize_query(query), int(max_results))
+        now = time.time()
+        payload = json.dumps(results, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (backend, query, max_results, results, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                key + (payload, now, now),
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM search_cache WHERE rowid IN ("
+            "SELECT rowid FROM search_cache ORDER BY accessed_at ASC LIMIT ?)",
+            (overflow,),
+        )
+        self.evictions += overflow
+
+    def fetch(self, backend: str, query: str, max_results: int, loader: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Return cached results for the key, calling `loader` on a miss.
+
+        Empty loader results are not stored: the backends swallow their own errors
+        and return [], and caching that would pin a transient failure for a full TTL.
+        """
+        entry = self.get(backend, query, max_results)
+        if entry is not None:
+            results, age = entry
+            if age <= self.ttl_s:
+                with self._lock:
+                    self.hits += 1
+                return results
+            if age <= self.ttl_s + self.stale_s:
+                with self._lock:
+                    self.stale_hits += 1
+                self._refresh_in_background(backend, query, max_results, loader)
+                return results
+
+        with self._lock:
+            self.misses += 1
+        results = list(loader() or [])
+        if results:
+            self.set(backend, query, max_results, results)
+        return results
+
+    def _refresh_in_background(self, backend: str, query: str, max_results: int, loader: Callable[[], List[Dict[str, Any]]]) -> None:
+        key = (backend, normalize_query(query), int(max_results))
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                results = list(loader() or [])
+                if results:
+                    self.set(backend, query, max_results, results)
+                with self._lock:
+                    self.refreshes += 1
+            except Exception:
+                logger.exception("Background refresh failed for %s query=%s", backend, query)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_refresh, name="search-cache-refresh", daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+            return {
+                "path": self.path,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "stale_s": self.stale_s,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[SearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Return the process-wide cache, or None when disabled via SEARCH_CACHE=0."""
+    global _cache
+    if os.getenv("SEARCH_CACHE", "1").lower() not in ("1", "true", "yes"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = SearchCache(
+                        os.getenv("SEARCH_CACHE_PATH", _DEFAULT_PATH),
+                        ttl_s=float(os.getenv("SEARCH_CACHE_TTL_S", "3600")),
+                        stale_s=float(os.getenv("SEARCH_CACHE_STALE_S", "86400")),
+                        max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000")),
+                    )
+                except Exception:
+                    logger.exception("Search cache unavailable; continuing without it")
+                    return None
+    return _cache
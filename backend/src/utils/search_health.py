@@ -0,0 +1,164 @@
+"""Rolling health tracking and circuit breaking for search backends.
+
+`duck()` records every real backend call (cache hits are not counted) here:
+latency, whether it raised, and how many results it returned. The registry
+uses that to:
+
+- open a backend's circuit after SEARCH_CB_FAILURES consecutive failures, skip
+  it for SEARCH_CB_COOLDOWN_S, then let a single half-open probe through;
+- order backends by observed cost per useful result (mean latency / mean
+  yield), so cheap, productive backends go first in sequential mode.
+
+Stats are exposed via `GET /search/backends`.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BackendHealth:
+    def __init__(self, name: str, window: int):
+        self.name = name
+        # (latency_s, ok, yielded) for the most recent calls
+        self.samples: deque = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.skipped = 0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.last_error = ""
+
+    def avg_latency_s(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(s[0] for s in self.samples) / len(self.samples)
+
+    def avg_yield(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(s[2] for s in self.samples) / len(self.samples)
+
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for s in self.samples if not s[1]) / len(self.samples)
+
+    def cost_per_result_s(self) -> Optional[float]:
+        """Seconds spent per result returned; None until the backend has been observed."""
+        if not self.samples:
+            return None
+        return self.avg_latency_s() / max(self.avg_yield(), 0.1)
+
+
+class BackendRegistry:
+    def __init__(self, failure_threshold: int = 3, cooldown_s: float = 60.0, window: int = 50):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.window = window
+        self._lock = threading.Lock()
+        self._backends: Dict[str, BackendHealth] = {}
+
+    def _get(self, name: str) -> BackendHealth:
+        health = self._backends.get(name)
+        if health is None:
+            health = self._backends[name] = BackendHealth(name, self.window)
+        return health
+
+    def allow(self, name: str) -> bool:
+        """Return True if a call to `name` should be made now.
+
+        An open circuit turns half-open once the cooldown has elapsed and admits
+        exactly one probe; its outcome closes or re-opens the circuit.
+        """
+        with self._lock:
+            health = self._get(name)
+            if health.state == CLOSED:
+                return True
+            if health.state == OPEN and time.monotonic() - health.opened_at >= self.cooldown_s:
+                health.state = HALF_OPEN
+            if health.state == HALF_OPEN and not health.probe_in_flight:
+                health.probe_in_flight = True
+                return True
+            health.skipped += 1
+            return False
+
+    def record_success(self, name: str, latency_s: float, yielded: int) -> None:
+        with self._lock:
+            health = self._get(name)
+            health.calls += 1
+            health.samples.append((latency_s, True, yielded))
+            health.consecutive_failures = 0
+            health.probe_in_flight = False
+            health.state = CLOSED
+
+    def record_failure(self, name: str, latency_s: float, error: str = "") -> None:
+        with self._lock:
+            health = self._get(name)
+            health.calls += 1
+            health.errors += 1
+            health.samples.append((latency_s, False, 0))
+            health.consecutive_failures += 1
+            health.last_error = error[:200]
+            health.probe_in_flight = False
+            if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                health.state = OPEN
+                health.opened_at = time.monotonic()
+
+    def order(self, names: Iterable[str]) -> List[str]:
+        """Sort backend names by cost per useful result; unobserved backends first."""
+        names = list(names)
+        with self._lock:
+            costs = {n: self._get(n).cost_per_result_s() for n in names}
+        # stable sort keeps SEARCH_BACKENDS order among ties (and among unobserved backends)
+        return sorted(names, key=lambda n: -1.0 if costs[n] is None else costs[n])
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            out = {}
+            for name, h in self._backends.items():
+                cost = h.cost_per_result_s()
+                out[name] = {
+                    "state": h.state,
+                    "calls": h.calls,
+                    "errors": h.errors,
+                    "skipped": h.skipped,
+                    "consecutive_failures": h.consecutive_failures,
+                    "error_rate": round(h.error_rate(), 3),
+                    "avg_latency_ms": round(h.avg_latency_s() * 1000, 1),
+                    "avg_yield": round(h.avg_yield(), 2),
+                    "cost_per_result_ms": None if cost is None else round(cost * 1000, 1),
+                    "retry_in_s": round(max(0.0, self.cooldown_s - (now - h.opened_at)), 1) if h.state == OPEN else 0,
+                    "last_error": h.last_error,
+                }
+            return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._backends.clear()
+
+
+_registry: Optional[BackendRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_backend_registry() -> BackendRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = BackendRegistry(
+                    failure_threshold=int(os.getenv("SEARCH_CB_FAILURES", "3")),
+                    cooldown_s=float(os.getenv("SEARCH_CB_COOLDOWN_S", "60")),
+                    window=int(os.getenv("SEARCH_HEALTH_WINDOW", "50")),
+                )
+    return _registry
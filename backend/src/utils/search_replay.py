@@ -0,0 +1,175 @@
+"""Offline record/replay for search backends.
+
+Record mode wraps backend functions so every call writes its query, results
+(or error) and latency to a JSON fixture. Replay backends serve those fixtures
+back with configurable injected latency and error rate, so `duck()` can be
+benchmarked and regression-tested without the network. `StubBackend` produces
+synthetic results when no fixtures are available.
+
+Fixture layout: <fixture_dir>/<backend>/<sha1(normalized query)[:16]>.json
+
+Recording can be switched on for a whole process with SEARCH_RECORD_DIR=<dir>
+(see `src/utils/duck.py`). The benchmark lives in `scripts/bench_search.py`.
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.search_cache import normalize_query
+
+
+logger = logging.getLogger(__name__)
+
+SearchFunc = Callable[[str], List[Dict[str, Any]]]
+
+
+class ReplayError(RuntimeError):
+    """Injected or recorded backend failure raised during replay."""
+
+
+def fixture_path(fixture_dir: str, backend: str, query: str) -> str:
+    digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(fixture_dir, backend, f"{digest}.json")
+
+
+def record_call(fixture_dir: str, backend: str, search_func: SearchFunc, query: str, *args, **kwargs) -> List[Dict[str, Any]]:
+    """Call `search_func(query, ...)` and write the outcome to a fixture before returning/raising."""
+    started = time.monotonic()
+    entry: Dict[str, Any] = {"backend": backend, "query": query, "recorded_at": time.time()}
+    try:
+        results = list(search_func(query, *args, **kwargs))
+        entry["results"] = results
+        return results
+    except Exception as e:
+        entry["error"] = str(e)
+        raise
+    finally:
+        entry["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+        path = fixture_path(fixture_dir, backend, query)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, default=str, indent=1)
+        except OSError:
+            logger.exception("Failed to write search fixture %s", path)
+
+
+def recording_backend(fixture_dir: str, backend: str, search_func: SearchFunc) -> SearchFunc:
+    def _recorded(query, *args, **kwargs):
+        return record_call(fixture_dir, backend, search_func, query, *args, **kwargs)
+
+    _recorded.__name__ = f"recorded_{backend}"
+    return _recorded
+
+
+def recording_backends(backends: Iterable[Tuple[str, SearchFunc]], fixture_dir: str) -> List[Tuple[str, SearchFunc]]:
+    """Wrap a SEARCH_BACKENDS-style list so every call is recorded to `fixture_dir`."""
+    return [(name, recording_backend(fixture_dir, name, func)) for name, func in backends]
+
+
+class _Injector:
+    """Shared latency/error injection for replay and stub backends."""
+
+    def __init__(self, latency_s: float, jitter_s: float, error_rate: float, seed: Optional[int]):
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def apply(self, name: str, recorded_latency_s: float = 0.0) -> None:
+        with self._lock:
+            jitter = self._rng.uniform(0, self.jitter_s) if self.jitter_s else 0.0
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        delay = self.latency_s + recorded_latency_s + jitter
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise ReplayError(f"injected {name} failure")
+
+
+class ReplayBackend:
+    """Serve recorded fixtures for one backend.
+
+    Args:
+        name: backend name (fixture subdirectory).
+        fixture_dir: directory written by record mode.
+        latency_s / jitter_s: added delay per call (uniform jitter in [0, jitter_s]).
+        error_rate: probability of raising ReplayError on a call.
+        use_recorded_latency: also sleep for the latency captured at record time.
+        strict: raise KeyError for queries without a fixture instead of returning [].
+    """
+
+    def __init__(self, name: str, fixture_dir: str, latency_s: float = 0.0, jitter_s: float = 0.0,
+                 error_rate: float = 0.0, use_recorded_latency: bool = False, strict: bool = False,
+                 seed: Optional[int] = None):
+        self.name = name
+        self.fixture_dir = fixture_dir
+        self.use_recorded_latency = use_recorded_latency
+        self.strict = strict
+        self._injector = _Injector(latency_s, jitter_s, error_rate, seed)
+        self.calls = 0
+
+    def load(self, query: str) -> Optional[Dict[str, Any]]:
+        path = fixture_path(self.fixture_dir, self.name, query)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def __call__(self, query: str, *args, **kwargs) -> List[Dict[str, Any]]:
+        self.calls += 1
+        entry = self.load(query)
+        recorded_latency_s = (entry or {}).get("latency_ms", 0) / 1000 if self.use_recorded_latency else 0.0
+        self._injector.apply(self.name, recorded_latency_s)
+        if entry is None:
+            if self.strict:
+                raise KeyError(f"no {self.name} fixture for query '{query}'")
+            return []
+        if entry.get("error"):
+            raise ReplayError(entry["error"])
+        return list(entry.get("results") or [])
+
+
+class StubBackend:
+    """Synthetic backend returning `results_per_query` deterministic results per query."""
+
+    def __init__(self, name: str, results_per_query: int = 10, latency_s: float = 0.0, jitter_s: float = 0.0,
+                 error_rate: float = 0.0, hosts: Tuple[str, ...] = ("pubmed.ncbi.nlm.nih.gov", "linkedin.com"),
+                 seed: Optional[int] = None):
+        self.name = name
+        self.results_per_query = results_per_query
+        self.hosts = hosts
+        self._injector = _Injector(latency_s, jitter_s, error_rate, seed)
+        self.calls = 0
+
+    def __call__(self, query: str, *args, **kwargs) -> List[Dict[str, Any]]:
+        self.calls += 1
+        self._injector.apply(self.name)
+        digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()[:8]
+        results = []
+        for i in range(self.results_per_query):
+            host = self.hosts[i % len(self.hosts)]
+            path = f"in/{self.name}-{digest}-{i}" if "linkedin" in host else f"{self.name}-{digest}-{i}"
+            results.append({
+                "title": f"{self.name} result {i} for {query}",
+                "body": "",
+                "href": f"https://{host}/{path}",
+            })
+        return results
+
+
+def replay_backends(fixture_dir: str, names: Iterable[str] = ("ddgs", "google", "bing"), **kwargs) -> List[Tuple[str, ReplayBackend]]:
+    """Build a SEARCH_BACKENDS replacement that replays fixtures from `fixture_dir`."""
+    return [(name, ReplayBackend(name, fixture_dir, **kwargs)) for name in names]
+
+
+def stub_backends(names: Iterable[str] = ("ddgs", "google", "bing"), **kwargs) -> List[Tuple[str, StubBackend]]:
+    """Build a SEARCH_BACKENDS replacement of synthetic stub backends."""
+    return [(name, StubBackend(name, **kwargs)) for name in names]
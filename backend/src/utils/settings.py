@@ -5,12 +5,23 @@ DOWNLOAD_HANDLERS = {
     "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
 }
 
+# scrapy-playwright requires the asyncio reactor. It is installed once per process
+# by src/utils/crawler_service.py, which keeps it running across crawls.
+TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
+
 # Respect robots.txt where feasible during development; disable for full crawl in controlled envs
 ROBOTSTXT_OBEY = False
 
-# Be polite by default
-DOWNLOAD_DELAY = 1.0
+# Politeness is adaptive per domain: ThrottleMiddleware (src/utils/throttle.py)
+# retunes each downloader slot's delay and concurrency from observed latency,
+# errors, 429/503 and Retry-After. These are only the starting values for a new
+# domain's slot; tune the controller with the THROTTLE_* env vars.
+DOWNLOAD_DELAY = 0.5
 CONCURRENT_REQUESTS = 16
+# Cap per site so a batch crawl (crawl_urls) spreads across hosts instead of hammering one
+CONCURRENT_REQUESTS_PER_DOMAIN = 4
+THROTTLE_ENABLED = True
+AUTOTHROTTLE_ENABLED = False
 
 # Increase timeout for slow sites
 DOWNLOAD_TIMEOUT = 300
@@ -25,6 +36,24 @@ PLAYWRIGHT_LAUNCH_OPTIONS = {"headless": True}
 PLAYWRIGHT_BROWSER_TYPE = "chromium"
 PLAYWRIGHT_DEFAULT_NAVIGATION_TIMEOUT = 120000  # 2 minutes
 
+# Tiered fetching in MySpider: plain HTTP first, re-fetch through Playwright only
+# for pages that look client-rendered (see scrapy_ok.needs_javascript).
+# One of "tiered", "playwright" (always render) or "http" (never render).
+FETCH_MODE = "tiered"
+FETCH_JS_MIN_TEXT = 200
+FETCH_EXPECTED_SELECTOR = "p, h1, h2, h3"
+
+# Shared on-disk page cache (src/utils/page_cache.py): serves fresh pages without a
+# download and revalidates stale ones with conditional GETs. Runs after
+# HttpCompressionMiddleware (590) on the way back so bodies are stored decoded.
+DOWNLOADER_MIDDLEWARES = {
+    "src.utils.page_cache.PageCacheMiddleware": 580,
+    # After the cache on the way out (cache hits never reach the throttle),
+    # before it on the way back (304 revalidations still count as responses).
+    "src.utils.throttle.ThrottleMiddleware": 585,
+}
+PAGE_CACHE_ENABLED = True
+
 LOG_LEVEL = "INFO"
 
 # Useful sources for discovery/enrichment (not consumed automatically)
@@ -0,0 +1,311 @@
+"""Per-domain adaptive rate control shared by the Scrapy and Playwright crawlers.
+
+Each domain gets its own delay between request starts and its own concurrency
+limit, adjusted AIMD-style from what the site tells us:
+
+- every THROTTLE_INCREASE_EVERY fast, successful responses add one concurrent
+  request (up to THROTTLE_MAX_CONCURRENCY) and shrink the delay;
+- a network error or 5xx gives up one concurrent request and grows the delay;
+- a response much slower than the domain's own latency average (over
+  THROTTLE_SLOW_FACTOR times it, and over THROTTLE_TARGET_LATENCY_S) gives up
+  one concurrent request but leaves the delay alone. A site that is always
+  slow, or a browser load that always takes seconds, is not a signal;
+- 429/503 halve concurrency, at least double the delay, and honour the
+  Retry-After header (capped at THROTTLE_MAX_RETRY_AFTER_S) by blocking the
+  domain until then.
+
+Scrapy applies it through `ThrottleMiddleware`, which copies the domain's
+delay/concurrency onto its downloader slot. The deep crawler calls
+`acquire()`/`release()` around each navigation. `snapshot()` (exposed at
+`GET /crawl/throttle`) shows the current per-domain state.
+"""
+import email.utils
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+
+BACKOFF_STATUSES = (429, 503)
+
+
+def domain_key(url_or_host: str) -> str:
+    """Throttle key for a URL or host: lowercase hostname without a leading "www."."""
+    host = urlsplit(url_or_host).hostname if "://" in (url_or_host or "") else url_or_host
+    host = (host or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def parse_retry_after(value: Any, now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode("latin-1", "ignore")
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+class DomainState:
+    def __init__(self, domain: str, delay_s: float, concurrency: int):
+        self.domain = domain
+        self.delay_s = delay_s
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.last_start = 0.0
+        self.blocked_until = 0.0
+        self.latency_ewma_s: Optional[float] = None
+        self.ok_streak = 0
+        self.responses = 0
+        self.errors = 0
+        self.backoffs = 0
+        self.last_status = 0
+
+
+class DomainThrottle:
+    def __init__(self, start_delay_s: float = 0.5, min_delay_s: float = 0.0, max_delay_s: float = 30.0,
+                 start_concurrency: int = 2, max_concurrency: int = 8, target_latency_s: float = 2.0,
+                 increase_every: int = 5, max_retry_after_s: float = 300.0, slow_factor: float = 2.0):
+        self.start_delay_s = start_delay_s
+        self.min_delay_s = min_delay_s
+        self.max_delay_s = max_delay_s
+        self.start_concurrency = max(1, start_concurrency)
+        self.max_concurrency = max(self.start_concurrency, max_concurrency)
+        self.target_latency_s = target_latency_s
+        self.slow_factor = slow_factor
+        self.increase_every = max(1, increase_every)
+        self.max_retry_after_s = max_retry_after_s
+        self._cond = threading.Condition()
+        self._domains: Dict[str, DomainState] = {}
+
+    def _get(self, domain: str) -> DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            state = self._domains[domain] = DomainState(domain, self.start_delay_s, self.start_concurrency)
+        return state
+
+    def state(self, url_or_host: str) -> DomainState:
+        with self._cond:
+            return self._get(domain_key(url_or_host))
+
+    def blocked_for(self, url_or_host: str) -> float:
+        """Seconds until the domain's Retry-After block expires (0 if not blocked)."""
+        with self._cond:
+            state = self._get(domain_key(url_or_host))
+            return max(0.0, state.blocked_until - time.monotonic())
+
+    def allow_concurrency(self, url_or_host: str, concurrency: int) -> int:
+        """Let a caller that keeps `concurrency` requests open (deep-crawl tabs) start with that many.
+
+        Only raises the limit, up to max_concurrency, and only while the domain
+        has not pushed back with errors or 429/503. Returns the domain's limit.
+        """
+        with self._cond:
+            state = self._get(domain_key(url_or_host))
+            if not state.errors and not state.backoffs and concurrency > state.concurrency:
+                state.concurrency = min(concurrency, self.max_concurrency)
+                self._cond.notify_all()
+            return state.concurrency
+
+    def acquire(self, url_or_host: str, timeout: Optional[float] = None) -> bool:
+        """Block until a request to the domain may start; False if `timeout` expired first.
+
+        Every successful acquire must be paired with `release()`.
+        """
+        domain = domain_key(url_or_host)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                state = self._get(domain)
+                now = time.monotonic()
+                ready_at = max(state.blocked_until, state.last_start + state.delay_s)
+                has_slot = state.in_flight < state.concurrency
+                if has_slot and now >= ready_at:
+                    state.in_flight += 1
+                    state.last_start = now
+                    return True
+                wait = ready_at - now if has_slot else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+    def release(self, url_or_host: str, status: int = 0, latency_s: Optional[float] = None,
+                retry_after: Any = None, error: bool = False) -> None:
+        """Finish a request started with `acquire()` and feed its outcome to the controller."""
+        with self._cond:
+            state = self._get(domain_key(url_or_host))
+            state.in_flight = max(0, state.in_flight - 1)
+            self._record_locked(state, status, latency_s, retry_after, error)
+            self._cond.notify_all()
+
+    def record(self, url_or_host: str, status: int = 0, latency_s: Optional[float] = None,
+               retry_after: Any = None, error: bool = False) -> DomainState:
+        """Feed an outcome without slot accounting (Scrapy manages its own slots)."""
+        with self._cond:
+            state = self._get(domain_key(url_or_host))
+            self._record_locked(state, status, latency_s, retry_after, error)
+            self._cond.notify_all()
+            return state
+
+    def _record_locked(self, state: DomainState, status: int, latency_s: Optional[float], retry_after: Any,
+                       error: bool) -> None:
+        state.responses += 1
+        state.last_status = status
+        # judged against the average before this response, which it then joins; the first one sets it
+        baseline = state.latency_ewma_s
+        slow = latency_s is not None and baseline is not None and latency_s > max(
+            self.target_latency_s, self.slow_factor * baseline)
+        if latency_s is not None:
+            state.latency_ewma_s = latency_s if baseline is None else 0.7 * baseline + 0.3 * latency_s
+
+        if status in BACKOFF_STATUSES:
+            state.backoffs += 1
+            state.ok_streak = 0
+            state.concurrency = max(1, state.concurrency // 2)
+            state.delay_s = min(self.max_delay_s, max(state.delay_s * 2, 1.0))
+            wait = parse_retry_after(retry_after)
+            if wait is not None:
+                state.blocked_until = max(state.blocked_until, time.monotonic() + min(wait, self.max_retry_after_s))
+            return
+
+        if error or status >= 500:
+            state.errors += 1
+            state.ok_streak = 0
+            state.concurrency = max(1, state.concurrency - 1)
+            state.delay_s = min(self.max_delay_s, state.delay_s * 1.5 + 0.1)
+            return
+        if slow:
+            state.ok_streak = 0
+            state.concurrency = max(1, state.concurrency - 1)
+            return
+
+        state.ok_streak += 1
+        if state.ok_streak >= self.increase_every:
+            state.ok_streak = 0
+            state.concurrency = min(self.max_concurrency, state.concurrency + 1)
+            state.delay_s = max(self.min_delay_s, state.delay_s * 0.7)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._cond:
+            return {
+                name: {
+                    "delay_s": round(s.delay_s, 3),
+                    "concurrency": s.concurrency,
+                    "in_flight": s.in_flight,
+                    "latency_ewma_ms": None if s.latency_ewma_s is None else round(s.latency_ewma_s * 1000, 1),
+                    "responses": s.responses,
+                    "errors": s.errors,
+                    "backoffs": s.backoffs,
+                    "last_status": s.last_status,
+                    "blocked_for_s": round(max(0.0, s.blocked_until - now), 1),
+                }
+                for name, s in self._domains.items()
+            }
+
+    def reset(self) -> None:
+        with self._cond:
+            self._domains.clear()
+            self._cond.notify_all()
+
+
+_throttle: Optional[DomainThrottle] = None
+_throttle_lock = threading.Lock()
+
+
+def get_throttle() -> DomainThrottle:
+    global _throttle
+    if _throttle is None:
+        with _throttle_lock:
+            if _throttle is None:
+                _throttle = DomainThrottle(
+                    start_delay_s=float(os.getenv("THROTTLE_START_DELAY_S", "0.5")),
+                    min_delay_s=float(os.getenv("THROTTLE_MIN_DELAY_S", "0")),
+                    max_delay_s=float(os.getenv("THROTTLE_MAX_DELAY_S", "30")),
+                    start_concurrency=int(os.getenv("THROTTLE_START_CONCURRENCY", "2")),
+                    max_concurrency=int(os.getenv("THROTTLE_MAX_CONCURRENCY", "8")),
+                    target_latency_s=float(os.getenv("THROTTLE_TARGET_LATENCY_S", "2.0")),
+                    increase_every=int(os.getenv("THROTTLE_INCREASE_EVERY", "5")),
+                    max_retry_after_s=float(os.getenv("THROTTLE_MAX_RETRY_AFTER_S", "300")),
+                    slow_factor=float(os.getenv("THROTTLE_SLOW_FACTOR", "2")),
+                )
+    return _throttle
+
+
+class ThrottleMiddleware:
+    """Scrapy downloader middleware applying `DomainThrottle` to downloader slots.
+
+    Responses and errors are fed to the controller. Its per-domain delay and
+    concurrency are then copied onto the request's downloader slot. Requests
+    to a domain blocked by Retry-After are held in `process_request` until the
+    block expires.
+    """
+
+    def __init__(self, crawler, throttle: Optional[DomainThrottle]):
+        self.crawler = crawler
+        self.throttle = throttle
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("THROTTLE_ENABLED", True):
+            return cls(crawler, None)
+        return cls(crawler, get_throttle())
+
+    def _apply(self, request, state: DomainState) -> None:
+        engine = getattr(self.crawler, "engine", None)
+        downloader = getattr(engine, "downloader", None)
+        slots = getattr(downloader, "slots", None)
+        if not slots:
+            return
+        slot = slots.get(request.meta.get("download_slot"))
+        if slot is None:
+            return
+        slot.delay = state.delay_s
+        slot.concurrency = state.concurrency
+
+    def process_request(self, request, spider):
+        if self.throttle is None:
+            return None
+        wait = self.throttle.blocked_for(request.url)
+        if wait <= 0:
+            return None
+        from twisted.internet import reactor
+        from twisted.internet.task import deferLater
+
+        spider.logger.debug("Holding %s for %.1fs (Retry-After)", request.url, wait)
+        return deferLater(reactor, wait, lambda: None)
+
+    def process_response(self, request, response, spider):
+        if self.throttle is None or "cached" in response.flags:
+            return response
+        state = self.throttle.record(
+            request.url,
+            status=response.status,
+            latency_s=request.meta.get("download_latency"),
+            retry_after=response.headers.get("Retry-After"),
+        )
+        self._apply(request, state)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        if self.throttle is None:
+            return None
+        state = self.throttle.record(request.url, latency_s=request.meta.get("download_latency"), error=True)
+        self._apply(request, state)
+        return None
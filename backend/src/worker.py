@@ -0,0 +1,215 @@
+"""Scrape worker for the durable job queue (src/utils/job_queue.py).
+
+Run one or more of these next to the API (JOB_BACKEND=queue), on the same
+machine: the SQLite queue at JOB_QUEUE_PATH is not safe to share over a
+network filesystem.
+
+  python -m src.worker                    # run until SIGTERM / Ctrl-C
+  python -m src.worker --concurrency 2    # two jobs at a time
+  python -m src.worker --once             # drain the queue and exit
+
+Each job runs `handle.scrape_progress`. A heartbeat thread renews the lease
+every JOB_LEASE_S/3 seconds and flushes progress, new and updated items and
+error events to the queue; it sets the job's cancel event when the API cancels the job or
+the lease has been lost. On SIGTERM the worker stops claiming and lets
+running jobs finish; a worker that is killed outright leaves its lease to
+expire, and the job is retried by another worker.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Ensure the backend package root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.utils.job_queue import JobQueue, LeaseLost, get_job_queue
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Attempt:
+    """One run of a claimed job: buffers events between heartbeats."""
+
+    def __init__(self, job: Dict[str, Any]):
+        self.job = job
+        self.cancel_event = threading.Event()
+        self.lease_lost = False
+        self.percent = 0
+        self.final_results: Optional[List[Dict[str, Any]]] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._errors: List[Dict[str, Any]] = []
+        self._updates: Dict[str, Dict[str, Any]] = {}  # lead id -> newer copy of an already flushed item
+        self._lock = threading.Lock()
+
+    def on_event(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            if "percent" in event:
+                self.percent = max(self.percent, int(event.get("percent") or 0))
+            if event.get("type") == "item":
+                self._pending.append(event["item"])
+            elif event.get("type") == "item_update":
+                item = event["item"]
+                for i, pending in enumerate(self._pending):
+                    if pending.get("lead_id") == item.get("lead_id"):
+                        self._pending[i] = item
+                        break
+                else:
+                    self._updates[item.get("lead_id")] = item
+            elif event.get("type") == "error":
+                self._errors.append({"msg": event.get("msg"), "url": event.get("url")})
+            elif event.get("type") == "done":
+                # the final list is filtered once more; it replaces the streamed items
+                self.final_results = list(event.get("results") or [])
+
+    def take(self):
+        with self._lock:
+            items, self._pending = self._pending, []
+            errors, self._errors = self._errors, []
+            updates, self._updates = list(self._updates.values()), {}
+            return self.percent, items, errors, updates
+
+
+class QueueWorker:
+    def __init__(self, queue: JobQueue, worker_id: Optional[str] = None, heartbeat_s: Optional[float] = None):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.heartbeat_s = heartbeat_s if heartbeat_s is not None else max(0.5, queue.lease_s / 3)
+        self.stopping = threading.Event()
+
+    def run_one(self) -> bool:
+        """Claim and run a single job; returns False if none was ready."""
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+        self._run_job(job)
+        return True
+
+    def _run_job(self, job: Dict[str, Any]) -> None:
+        logger.info("Worker %s running job %s (attempt %d/%d)",
+                    self.worker_id, job["id"], job["attempts"], job["max_attempts"])
+        attempt = _Attempt(job)
+        beat_stop = threading.Event()
+        beater = threading.Thread(target=self._heartbeat_loop, args=(attempt, beat_stop),
+                                  name=f"heartbeat-{job['id'][:8]}", daemon=True)
+        beater.start()
+        error = None
+        result = None
+        try:
+            from src.handlers import handle
+
+            params = job["params"]
+            result = handle.scrape_progress(
+                job["query"],
+                max_results=params.get("max_results", 200),
+                allowed_sources=params.get("allowed_sources"),
+                progress_callback=attempt.on_event,
+                cancel_event=attempt.cancel_event,
+            )
+        except Exception as e:
+            logger.exception("Job %s failed", job["id"])
+            error = str(e) or e.__class__.__name__
+        finally:
+            beat_stop.set()
+            beater.join()
+
+        if attempt.lease_lost:
+            logger.warning("Job %s: lease lost, dropping this attempt's outcome", job["id"])
+            return
+        try:
+            if error is not None:
+                self.queue.fail(job["id"], self.worker_id, error)
+            else:
+                # without a done event the items streamed by the heartbeats stand
+                self.queue.complete(job["id"], self.worker_id, result=result, items=attempt.final_results,
+                                    cancelled=attempt.cancel_event.is_set())
+        except LeaseLost:
+            logger.warning("Job %s: lease lost before it could be recorded", job["id"])
+
+    def _heartbeat_loop(self, attempt: _Attempt, stop: threading.Event) -> None:
+        job_id = attempt.job["id"]
+        while True:
+            stopped = stop.wait(self.heartbeat_s)
+            percent, items, errors, updates = attempt.take()
+            try:
+                if self.queue.heartbeat(job_id, self.worker_id, percent=percent, items=items, errors=errors,
+                                        updates=updates):
+                    attempt.cancel_event.set()
+            except LeaseLost:
+                attempt.lease_lost = True
+                attempt.cancel_event.set()
+                return
+            except Exception:
+                # the file may be briefly locked; the lease outlives a few missed beats
+                logger.exception("Heartbeat for job %s failed", job_id)
+            if stopped:
+                return
+
+    def run(self, concurrency: int = 1, poll_s: float = 1.0, once: bool = False) -> None:
+        """Keep up to `concurrency` jobs running until stopped (with `once`, until no job is ready)."""
+        concurrency = max(1, concurrency)
+        slots = threading.Semaphore(concurrency)
+
+        def run_job(job):
+            try:
+                self._run_job(job)
+            except Exception:
+                logger.exception("Worker %s: job %s crashed", self.worker_id, job["id"])
+            finally:
+                slots.release()
+
+        logger.info("Worker %s started (queue=%s, concurrency=%d)", self.worker_id, self.queue.path, concurrency)
+        with ThreadPoolExecutor(concurrency, thread_name_prefix="queue-worker") as pool:
+            while not self.stopping.is_set():
+                slots.acquire()
+                job = None
+                if not self.stopping.is_set():
+                    try:
+                        job = self.queue.claim(self.worker_id)
+                    except Exception:
+                        logger.exception("Worker %s: claim failed", self.worker_id)
+                if job is None:
+                    slots.release()
+                    if once:
+                        break
+                    self.stopping.wait(poll_s)
+                    continue
+                pool.submit(run_job, job)
+        logger.info("Worker %s stopped", self.worker_id)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run scrape jobs from the durable job queue.")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("QUEUE_WORKER_CONCURRENCY", "1")))
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds to wait when the queue is empty")
+    parser.add_argument("--once", action="store_true", help="exit once no job is ready")
+    args = parser.parse_args(argv)
+
+    from src import logging_config  # noqa: F401  (file + console logging)
+
+    worker = QueueWorker(get_job_queue())
+
+    def _stop(signum, frame):
+        logger.info("Worker %s: signal %s, finishing running jobs", worker.worker_id, signum)
+        worker.stopping.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    started = time.time()
+    worker.run(concurrency=args.concurrency, poll_s=args.poll_interval, once=args.once)
+    logger.info("Worker %s exiting after %.0fs", worker.worker_id, time.time() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,3 +5,80 @@ import os
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+# Keep tests hermetic: the on-disk search cache would otherwise replay results
+# from earlier runs instead of calling the monkeypatched backends.
+os.environ.setdefault('SEARCH_CACHE', '0')
+os.environ.setdefault('PAGE_CACHE', '0')
+# Lead ids would otherwise persist across test runs; keep the identity index in memory.
+os.environ.setdefault('IDENTITY_INDEX', '0')
+
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _reset_search_backend_health():
+    # Backend health is process-wide; start every test with closed circuits.
+    from src.utils.search_health import get_backend_registry
+    get_backend_registry().reset()
+    yield
+
+
+@pytest.fixture(scope="session")
+def local_site():
+    """A local HTTP server: /team/<name> pages, /old/<name> redirecting to /team/<name>, /slow answering after 3s."""
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/old/"):
+                self.send_response(301)
+                self.send_header("Location", "/team/" + self.path[len("/old/"):])
+                self.end_headers()
+                return
+            if self.path == "/slow":
+                time.sleep(3)
+            name = self.path.rstrip("/").rsplit("/", 1)[-1]
+            body = (f"<html><head><title>{name}</title></head><body><h1>{name}</h1>"
+                    f"<p>{name} leads toxicology in Boston.</p>"
+                    f"<a href='https://www.linkedin.com/in/{name}'>LinkedIn</a></body></html>").encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture(scope="session")
+def crawler_service():
+    """The process-wide crawler service, on plain HTTP without delays (a reactor runs once per process)."""
+    pytest.importorskip("scrapy")
+    from src.utils import crawler_service as service_module
+    from src.utils.scrapy_ok import _load_spider_settings
+
+    settings = _load_spider_settings()
+    settings.setdict({
+        "DOWNLOAD_HANDLERS": {},  # no scrapy-playwright browser
+        "FETCH_MODE": "http",
+        "DOWNLOADER_MIDDLEWARES": {},
+        "DOWNLOAD_DELAY": 0,
+        "RETRY_ENABLED": False,
+        "LOG_LEVEL": "WARNING",
+    }, priority="cmdline")
+    previous = service_module._service
+    service = service_module._service = service_module.CrawlerService(settings)
+    yield service
+    service.shutdown()
+    service_module._service = previous
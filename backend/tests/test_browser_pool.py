@@ -0,0 +1,397 @@
+import subprocess
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from src.utils import browser_pool
+from src.utils.browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self, site):
+        self.site = site
+        self.url = ""
+        self.handlers = []
+        self.listeners = {}
+        self.main_frame = object()
+
+    def on(self, event, handler):
+        if event == "framenavigated":
+            self.handlers.append(handler)
+        else:
+            self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners.get(event, []).remove(handler)
+
+    def set_default_timeout(self, ms):
+        pass
+
+    def goto(self, url, wait_until=None):
+        if self.site.get(url, {}).get("fail"):
+            raise RuntimeError("net::ERR_FAILED")
+        self.url = url
+        for h in self.handlers:
+            h(types.SimpleNamespace(parent_frame=None))
+        return types.SimpleNamespace(status=200, headers={})
+
+    def evaluate(self, script, url):
+        if isinstance(url, dict):
+            return self._snapshot()
+        # script-started navigation; completes when any page pumps events (after "_load_s")
+        self.site.setdefault("_pending", []).append((self, url, time.monotonic()))
+        in_flight = len(self.site["_pending"])
+        self.site["_peak"] = max(self.site.get("_peak", 0), in_flight)
+
+    def wait_for_timeout(self, ms):
+        load_s = self.site.get("_load_s", 0)
+        if load_s:
+            time.sleep(ms / 1000)
+        now = time.monotonic()
+        pending = self.site.get("_pending", [])
+        self.site["_pending"] = [p for p in pending if now - p[2] < load_s]
+        for page, url, started in pending:
+            if now - started >= load_s:
+                page._load(url)
+
+    def _load(self, url):
+        request = types.SimpleNamespace(frame=self.main_frame, is_navigation_request=lambda: True,
+                                        failure="net::ERR_FAILED")
+        if self.site.get(url, {}).get("fail"):
+            for h in list(self.listeners.get("requestfailed", [])):
+                h(request)
+            return
+        self.url = url
+        for h in self.handlers:
+            h(types.SimpleNamespace(parent_frame=None))
+        for h in list(self.listeners.get("response", [])):
+            h(types.SimpleNamespace(request=request, status=200, headers={}))
+        for h in list(self.listeners.get("domcontentloaded", [])):
+            h(self)
+
+    def title(self):
+        return "Team"
+
+    def inner_text(self, selector):
+        return self.site.get(self.url, {}).get("text", "")
+
+    def _snapshot(self):
+        # what the in-page extraction script returns
+        spec = self.site.get(self.url, {})
+        if spec.get("script_error"):
+            raise RuntimeError("Execution context was destroyed")
+        links = spec.get("links", [])
+        return {
+            "title": "Team",
+            "text": spec.get("text", ""),
+            "anchors": [{"href": h, "text": t} for h, t in links if not h.startswith("mailto:")],
+            "jsonld": [],
+            "mailto": [h[7:] for h, _ in links if h.startswith("mailto:")],
+            "tel": [],
+            "meta": {},
+        }
+
+    def eval_on_selector_all(self, selector, script):
+        if selector == "a[href]":
+            return [{"href": h, "text": t} for h, t in self.site.get(self.url, {}).get("links", [])]
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.page_listeners = []
+        self.closed = False
+
+    def on(self, event, handler):
+        if event == "page":
+            self.page_listeners.append(handler)
+
+    def route(self, pattern, handler):
+        pass
+
+    def new_page(self):
+        page = FakePage(self.browser.site)
+        for listener in self.page_listeners:
+            listener(page)
+        return page
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, site):
+        self.site = site
+        self.connected = True
+        self.contexts = []
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self, **kwargs):
+        ctx = FakeContext(self)
+        self.contexts.append(ctx)
+        return ctx
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    launched = []
+    site = {}
+
+    class FakeChromium:
+        def launch(self, **kwargs):
+            browser = FakeBrowser(site)
+            launched.append(browser)
+            return browser
+
+    class FakeSyncPlaywright:
+        def start(self):
+            return types.SimpleNamespace(chromium=FakeChromium(), stop=lambda: None)
+
+        def __enter__(self):
+            return self.start()
+
+        def __exit__(self, *exc):
+            return False
+
+    mod = types.ModuleType("playwright.sync_api")
+    mod.sync_playwright = FakeSyncPlaywright
+    mod.TimeoutError = TimeoutError
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", mod)
+    return types.SimpleNamespace(launched=launched, site=site)
+
+
+def test_pool_reuses_browser_and_isolates_contexts(fake_playwright):
+    pool = BrowserPool(size=1)
+    try:
+        contexts = [pool.run(lambda ctx: ctx) for _ in range(3)]
+    finally:
+        pool.shutdown()
+    assert len(fake_playwright.launched) == 1
+    assert len({id(c) for c in contexts}) == 3 and all(c.closed for c in contexts)
+    assert pool.stats()["leases"] == 3
+
+
+def test_pool_runs_on_owner_thread_and_caps_concurrency(fake_playwright):
+    pool = BrowserPool(size=2)
+    active, peak, lock = [0], [0], threading.Lock()
+    gate = threading.Event()
+
+    def work(ctx):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        gate.wait(0.2)
+        with lock:
+            active[0] -= 1
+        return threading.current_thread().name
+
+    try:
+        futures = [pool.submit(work) for _ in range(5)]
+        names = {f.result(timeout=10) for f in futures}
+    finally:
+        pool.shutdown()
+    assert peak[0] <= 2
+    assert names <= {"browser-pool-0", "browser-pool-1"}
+
+
+def test_pool_recycles_after_max_pages_and_relaunches_dead_browser(fake_playwright):
+    pool = BrowserPool(size=1, max_pages_per_browser=2, max_rss_mb=0)
+
+    def visit(ctx, n):
+        page = ctx.new_page()
+        for i in range(n):
+            page.goto(f"https://acme.com/{i}")
+
+    try:
+        pool.run(visit, 2)  # hits the page limit -> recycled after the lease
+        pool.run(visit, 1)
+        fake_playwright.launched[-1].connected = False
+        pool.run(visit, 1)  # health check relaunches
+    finally:
+        pool.shutdown()
+    stats = pool.stats()
+    assert len(fake_playwright.launched) == 3
+    assert stats["recycles"] == 1 and stats["health_failures"] == 1
+
+
+def test_pool_recycles_only_the_slot_whose_processes_use_too_much_memory(fake_playwright, monkeypatch):
+    pytest.importorskip("psutil")
+    drivers = []
+    api = sys.modules["playwright.sync_api"]
+
+    class DriverSpawningPlaywright(api.sync_playwright):
+        def start(self):
+            pw = super().start()
+            # stands in for the node driver each sync_playwright().start() spawns
+            proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+            drivers.append(proc)
+            pw.stop = proc.kill
+            return pw
+
+    monkeypatch.setattr(api, "sync_playwright", DriverSpawningPlaywright)
+    monkeypatch.setattr(browser_pool, "_process_tree_rss_mb",
+                        lambda pids: 900.0 if drivers[0].pid in pids else 100.0)
+    pool = BrowserPool(size=2, max_pages_per_browser=100, max_rss_mb=500)
+    both_leased = threading.Barrier(2)
+
+    def work(ctx):
+        both_leased.wait(5)
+        return threading.current_thread().name
+
+    try:
+        futures = [pool.submit(work) for _ in range(2)]
+        assert {f.result(timeout=10) for f in futures} == {"browser-pool-0", "browser-pool-1"}
+        heavy = next(s for s in pool._slots if s.driver_pids == [drivers[0].pid])
+        light = next(s for s in pool._slots if s is not heavy)
+        assert light.driver_pids == [drivers[1].pid]
+        assert pool.stats()["recycles"] == 1
+        assert heavy.browser is None and light.browser is not None
+    finally:
+        pool.shutdown()
+        for proc in drivers:
+            proc.kill()
+            proc.wait()
+
+
+def test_crawl_people_deep_uses_pool(fake_playwright):
+    from src.utils.playwright_deep import CrawlConfig, crawl_people_deep
+
+    fake_playwright.site.update({
+        "https://acme.com/": {"text": "Welcome", "links": [("/team", "Team")]},
+        "https://acme.com/team": {
+            "text": "Jane Doe, jane@acme.com",
+            "links": [("https://www.linkedin.com/in/jane-doe", "Jane Doe")],
+        },
+    })
+    pool = BrowserPool(size=1)
+    try:
+        people = crawl_people_deep("https://acme.com/", config=CrawlConfig(max_pages=5), browser_pool=pool)
+        again = crawl_people_deep("https://acme.com/", config=CrawlConfig(max_pages=5), browser_pool=pool)
+    finally:
+        pool.shutdown()
+
+    assert len(fake_playwright.launched) == 1
+    assert [p["profile_url"] for p in people] == ["https://www.linkedin.com/in/jane-doe"]
+    assert people[0]["page_emails"] == ["jane@acme.com"]
+    assert people == again
+
+
+def test_multi_tab_crawl_matches_serial(fake_playwright, monkeypatch):
+    from src.utils import playwright_deep
+    from src.utils.playwright_deep import CrawlConfig, crawl_people_deep
+    from src.utils.throttle import DomainThrottle
+
+    monkeypatch.setattr(playwright_deep, "get_throttle", lambda: DomainThrottle(start_delay_s=0, start_concurrency=8))
+    team = [(f"/team/{i}", f"Person {i}") for i in range(6)] + [("/broken", "Broken"), ("/news", "News")]
+    fake_playwright.site.update({
+        "https://acme.com/": {"text": "Welcome", "links": [("/team", "Team")]},
+        "https://acme.com/team": {"text": "Our people", "links": team},
+        "https://acme.com/broken": {"fail": True},
+    })
+    for i in range(6):
+        fake_playwright.site[f"https://acme.com/team/{i}"] = {
+            "text": f"person{i}@acme.com",
+            "links": [(f"https://www.linkedin.com/in/person-{i}", f"Person {i}"), ("/team", "Team")],
+        }
+
+    def crawl(concurrency):
+        events = []
+        people = crawl_people_deep("https://acme.com/", config=CrawlConfig(max_pages=9, concurrency=concurrency),
+                                   progress_callback=events.append, browser_pool=pool)
+        for e in events:
+            e.pop("timings", None)
+        return people, events
+
+    pool = BrowserPool(size=1)
+    try:
+        serial = crawl(1)
+        fake_playwright.site["_peak"] = 0
+        concurrent = crawl(3)
+    finally:
+        pool.shutdown()
+
+    assert fake_playwright.site["_peak"] == 3
+    assert concurrent == serial
+    assert [p["profile_url"] for p in serial[0]] == [f"https://www.linkedin.com/in/person-{i}" for i in range(6)]
+    assert [e["url"] for e in serial[1] if e["type"] == "error"] == ["https://acme.com/broken"]
+    assert serial[1][-1]["msg"].startswith("deep crawl done: pages=10")
+
+
+def test_deep_crawl_reads_mailto_links_and_falls_back_to_per_part_reads(fake_playwright, monkeypatch):
+    from src.utils.playwright_deep import CrawlConfig, crawl_people_deep
+
+    fake_playwright.site.update({
+        "https://acme.com/": {"text": "Welcome", "links": [("/team", "Team")], "script_error": True},
+        "https://acme.com/team": {
+            "text": "Jane Doe",
+            "links": [("https://www.linkedin.com/in/jane-doe", "Jane Doe"), ("mailto:jane@acme.com", "Email")],
+        },
+    })
+    monkeypatch.setenv("DEEP_BROWSER_POOL", "0")
+    events = []
+    people = crawl_people_deep("https://acme.com/", config=CrawlConfig(max_pages=5), progress_callback=events.append)
+
+    assert [p["profile_url"] for p in people] == ["https://www.linkedin.com/in/jane-doe"]
+    assert people[0]["page_emails"] == ["jane@acme.com"]
+    assert set(events[-1]["timings"]) == {"navigate_s", "extract_s", "process_s"}
+
+
+def test_priority_frontier_visits_promising_links_first(fake_playwright, monkeypatch):
+    from src.utils.playwright_deep import CrawlConfig, crawl_people_deep
+
+    monkeypatch.setenv("DEEP_BROWSER_POOL", "0")
+    fake_playwright.site.update({
+        "https://acme.com/": {"text": "Welcome", "links": [("/blog", "Blog"), ("/who", "Our people")]},
+        "https://acme.com/who": {"text": "", "links": [("https://www.linkedin.com/in/jane-doe", "Jane Doe")]},
+    })
+
+    def visited(frontier):
+        events = []
+        crawl_people_deep("https://acme.com/", config=CrawlConfig(max_pages=2, frontier=frontier),
+                          progress_callback=events.append)
+        return [e["url"] for e in events if "url" in e]
+
+    assert visited("fifo") == ["https://acme.com/", "https://acme.com/blog"]
+    assert visited("priority") == ["https://acme.com/", "https://acme.com/who"]
+
+
+def test_multi_tab_crawl_opens_configured_tabs_on_a_slow_host(fake_playwright, monkeypatch):
+    from src.utils import playwright_deep
+    from src.utils.playwright_deep import CrawlConfig, crawl_people_deep
+    from src.utils.throttle import DomainThrottle
+
+    # the shared throttle's defaults: two connections to start, navigations slower than its target
+    throttle = DomainThrottle(start_delay_s=0, start_concurrency=2, target_latency_s=0.05)
+    monkeypatch.setattr(playwright_deep, "get_throttle", lambda: throttle)
+    monkeypatch.setenv("DEEP_BROWSER_POOL", "0")
+    team = [(f"/team/{i}", f"Person {i}") for i in range(8)]
+    fake_playwright.site.update({
+        "_load_s": 0.15,
+        "https://acme.com/": {"text": "Welcome", "links": [("/team", "Team")]},
+        "https://acme.com/team": {"text": "Our people", "links": team},
+    })
+    for i in range(8):
+        fake_playwright.site[f"https://acme.com/team/{i}"] = {
+            "links": [(f"https://www.linkedin.com/in/person-{i}", f"Person {i}")]}
+
+    started = time.monotonic()
+    people = crawl_people_deep("https://acme.com/", config=CrawlConfig(max_pages=10, concurrency=4))
+
+    assert len(people) == 8
+    assert fake_playwright.site["_peak"] == 4
+    assert throttle.state("acme.com").concurrency >= 4
+    assert time.monotonic() - started < 10 * 0.15  # well under one page at a time
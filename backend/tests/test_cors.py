@@ -55,8 +55,8 @@ def test_oauth_callback_sets_cookie(monkeypatch):
     def fake_get(url, headers=None, timeout=None):
         return DummyResp(200, {"email": "u@example.com", "name": "User"})
 
-    monkeypatch.setattr("requests.post", fake_post)
-    monkeypatch.setattr("requests.get", fake_get)
+    monkeypatch.setattr("src.utils.http_client.post", fake_post)
+    monkeypatch.setattr("src.utils.http_client.get", fake_get)
 
     r = client.get(f"/auth/google/callback?code=somecode&state={state}")
     assert r.status_code == 200
@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.utils import crawl_workers
+from src.utils.crawl_workers import CrawlWorkerCrashed, CrawlWorkerError, CrawlWorkerPool
+
+
+# Job functions run inside spawned worker processes, which import them by name.
+def _stream_job(emit, n):
+    for i in range(n):
+        emit("item", ("https://acme.com/", {"i": i}))
+    return os.getpid()
+
+
+def _pid_job(emit):
+    return os.getpid()
+
+
+def _raise_job(emit):
+    raise ValueError("bad page")
+
+
+def _crash_job(emit, marker):
+    # Crash on the first attempt only, so the pool's single retry succeeds.
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(3)
+    return "recovered"
+
+
+def _crash_after_stream_job(emit):
+    emit("item", ("https://acme.com/", {}))
+    os._exit(3)
+
+
+def _sleep_job(emit, seconds):
+    time.sleep(seconds)
+
+
+JOB = __name__ + ":{}"
+
+
+@pytest.fixture
+def pool():
+    p = CrawlWorkerPool(size=1, max_jobs_per_worker=2)
+    yield p
+    p.shutdown()
+
+
+def test_streams_messages_and_returns_result(pool):
+    got = []
+    fut = pool.submit(JOB.format("_stream_job"), {"n": 3}, on_message=lambda kind, data: got.append((kind, data)))
+    pid = fut.result(timeout=60)
+    assert pid != os.getpid()
+    assert [d[1]["i"] for _, d in got] == [0, 1, 2]
+
+    with pytest.raises(CrawlWorkerError, match="bad page"):
+        pool.submit(JOB.format("_raise_job")).result(timeout=60)
+
+
+def test_worker_recycled_after_max_jobs(pool):
+    pids = [pool.submit(JOB.format("_pid_job")).result(timeout=60) for _ in range(3)]
+    assert pids[0] == pids[1] != pids[2]
+    assert pool.stats()["recycled"] == 1
+
+
+def test_jobs_queued_past_max_jobs_go_to_fresh_workers(pool):
+    futures = [pool.submit(JOB.format("_pid_job")) for _ in range(6)]
+    pids = [f.result(timeout=60) for f in futures]
+    assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4] == pids[5]
+    stats = pool.stats()
+    assert stats["crashed"] == 0 and stats["retried"] == 0
+    assert stats["recycled"] == 3 and stats["spawned"] == 3
+
+
+def test_crash_recovery(pool, tmp_path):
+    marker = str(tmp_path / "crashed")
+    assert pool.submit(JOB.format("_crash_job"), {"marker": marker}).result(timeout=60) == "recovered"
+    stats = pool.stats()
+    assert stats["crashed"] == 1 and stats["retried"] == 1
+
+    # a job that already streamed output is not retried
+    with pytest.raises(CrawlWorkerCrashed):
+        pool.submit(JOB.format("_crash_after_stream_job")).result(timeout=60)
+    assert pool.submit(JOB.format("_pid_job")).result(timeout=60)
+
+
+def test_stuck_job_is_killed(pool):
+    with pytest.raises(TimeoutError):
+        pool.submit(JOB.format("_sleep_job"), {"seconds": 30}, timeout=1).result(timeout=60)
+    assert pool.stats()["timeouts"] == 1
+    assert pool.submit(JOB.format("_pid_job")).result(timeout=60)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_rss_without_psutil_includes_child_processes(monkeypatch):
+    monkeypatch.setitem(sys.modules, "psutil", None)  # import psutil raises ImportError
+    own = crawl_workers._rss_mb()
+    # a child holding ~200 MiB, like a Chromium the worker started
+    child = subprocess.Popen([sys.executable, "-c", "import sys, time; b = b'x' * (200 * 2 ** 20); "
+                              "sys.stdout.write('ready\\n'); sys.stdout.flush(); time.sleep(30)"],
+                             stdout=subprocess.PIPE, text=True)
+    try:
+        assert child.stdout.readline() == "ready\n"
+        assert crawl_workers._rss_mb() > own + 150
+    finally:
+        child.kill()
+        child.wait()
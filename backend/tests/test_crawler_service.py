@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("scrapy")
+
+from src.utils.scrapy_ok import MySpider, crawl_url
+
+
+def test_crawls_run_back_to_back_on_one_reactor(crawler_service, local_site):
+    first = crawl_url(f"{local_site}/team/alice", timeout=30)
+    second = crawl_url(f"{local_site}/team/bob", timeout=30)
+    assert [i["url"] for i in first] == [f"{local_site}/team/alice"]
+    assert [i["url"] for i in second] == [f"{local_site}/team/bob"]
+    assert crawler_service.running
+
+
+def test_submit_from_two_threads_at_once(crawler_service, local_site):
+    collected = {"carol": [], "dave": []}
+    futures = {}
+    ready = threading.Barrier(2)
+
+    def submit(name):
+        ready.wait(5)
+        futures[name] = crawler_service.submit(MySpider, start_url=f"{local_site}/team/{name}",
+                                               collected=collected[name])
+
+    threads = [threading.Thread(target=submit, args=(name,)) for name in collected]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    for name, fut in futures.items():
+        assert fut.result(timeout=30).spider.name == "myspider"
+        assert [i["url"] for i in collected[name]] == [f"{local_site}/team/{name}"]
+
+
+def test_stop_ends_a_running_crawl(crawler_service, local_site):
+    collected = []
+    # one request at a time: the slow page is in flight, the others wait behind it
+    urls = [f"{local_site}/slow"] + [f"{local_site}/team/p{i}" for i in range(5)]
+    fut = crawler_service.submit(MySpider, settings={"CONCURRENT_REQUESTS": 1}, start_urls=urls,
+                                 collected=collected)
+    deadline = time.monotonic() + 10
+    while getattr(fut.crawler, "engine", None) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.5)
+    assert fut.running() and not fut.done()
+
+    crawler_service.stop(fut)
+    fut.result(timeout=30)
+    # the request in flight completes; nothing queued behind it is fetched
+    assert [i["url"] for i in collected] in ([], [f"{local_site}/slow"])
+    assert crawler_service.running
+
+
+def test_shutdown_crawler_service_stops_the_shared_service(monkeypatch):
+    from src.utils import crawler_service as service_module
+
+    stopped = []
+    fake = type("FakeService", (), {"shutdown": lambda self: stopped.append(self)})()
+    monkeypatch.setattr(service_module, "_service", fake)
+    service_module.shutdown_crawler_service()
+    service_module.shutdown_crawler_service()
+    assert stopped == [fake] and service_module._service is None
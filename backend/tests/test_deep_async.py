@@ -0,0 +1,163 @@
+import asyncio
+import sys
+import types
+
+import pytest
+
+from src.utils import playwright_deep
+from src.utils.playwright_deep import CrawlConfig, crawl_people_deep_async, iter_people_deep
+from src.utils.throttle import DomainThrottle
+
+
+class FakePage:
+    def __init__(self, site):
+        self.site = site
+        self.url = ""
+        self.closed = False
+
+    def set_default_timeout(self, ms):
+        pass
+
+    async def goto(self, url, wait_until=None):
+        spec = self.site.get(url, {})
+        self.site["_in_flight"] += 1
+        self.site["_peak"] = max(self.site["_peak"], self.site["_in_flight"])
+        try:
+            await asyncio.sleep(spec.get("delay", 0.01))
+        finally:
+            self.site["_in_flight"] -= 1
+        if spec.get("fail"):
+            raise RuntimeError("net::ERR_FAILED")
+        self.url = url
+        return types.SimpleNamespace(status=200, headers={})
+
+    async def evaluate(self, script, arg):
+        spec = self.site.get(self.url, {})
+        return {"title": "Team", "text": spec.get("text", ""),
+                "anchors": [{"href": h, "text": t} for h, t in spec.get("links", [])]}
+
+    async def title(self):
+        return "Team"
+
+    async def inner_text(self, selector):
+        return self.site.get(self.url, {}).get("text", "")
+
+    async def eval_on_selector_all(self, selector, script):
+        if selector == "a[href]":
+            return [{"href": h, "text": t} for h, t in self.site.get(self.url, {}).get("links", [])]
+        return []
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, site):
+        self.site = site
+        self.pages = []
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        page = FakePage(self.site)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, site):
+        self.site = site
+        self.contexts = []
+        self.closed = False
+
+    async def new_context(self, **kwargs):
+        ctx = FakeContext(self.site)
+        self.contexts.append(ctx)
+        return ctx
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def site(monkeypatch):
+    site = {"_in_flight": 0, "_peak": 0, "_browsers": []}
+
+    class FakeChromium:
+        async def launch(self, **kwargs):
+            browser = FakeBrowser(site)
+            site["_browsers"].append(browser)
+            return browser
+
+    class FakeAsyncPlaywright:
+        async def __aenter__(self):
+            return types.SimpleNamespace(chromium=FakeChromium())
+
+        async def __aexit__(self, *exc):
+            return False
+
+    mod = types.ModuleType("playwright.async_api")
+    mod.async_playwright = FakeAsyncPlaywright
+    mod.TimeoutError = TimeoutError
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.async_api", mod)
+    monkeypatch.setattr(playwright_deep, "get_throttle", lambda: DomainThrottle(start_delay_s=0, start_concurrency=8))
+
+    team = [(f"/team/{i}", f"Person {i}") for i in range(6)] + [("/broken", "Broken"), ("/news", "News")]
+    site.update({
+        "https://acme.com/": {"text": "Welcome", "links": [("/team", "Team")]},
+        "https://acme.com/team": {"text": "Our people", "links": team},
+        "https://acme.com/broken": {"fail": True},
+    })
+    for i in range(6):
+        site[f"https://acme.com/team/{i}"] = {
+            "text": f"person{i}@acme.com",
+            "links": [(f"https://www.linkedin.com/in/person-{i}", f"Person {i}"), ("/team", "Team")],
+        }
+    return site
+
+
+def test_async_crawl_yields_people_in_serial_order(site):
+    events = []
+    people = asyncio.run(crawl_people_deep_async(
+        "https://acme.com/", config=CrawlConfig(max_pages=9, concurrency=3), progress_callback=events.append))
+
+    assert [p["profile_url"] for p in people] == [f"https://www.linkedin.com/in/person-{i}" for i in range(6)]
+    assert people[0]["page_emails"] == ["person0@acme.com"]
+    assert site["_peak"] == 3
+    assert [e["url"] for e in events if e["type"] == "error"] == ["https://acme.com/broken"]
+    assert events[-1]["msg"] == "deep crawl done: pages=10 people=6"
+    browser = site["_browsers"][0]
+    assert browser.closed and browser.contexts[0].closed
+
+
+def test_cancelling_the_consumer_closes_the_browser(site, monkeypatch):
+    site["https://acme.com/team/1"]["delay"] = 30
+    throttle = DomainThrottle(start_delay_s=0, start_concurrency=8)
+    monkeypatch.setattr(playwright_deep, "get_throttle", lambda: throttle)
+    got = []
+
+    async def main():
+        async def consume():
+            async for person in iter_people_deep("https://acme.com/", config=CrawlConfig(concurrency=3)):
+                got.append(person)
+
+        task = asyncio.ensure_future(consume())
+        while not got:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    assert [p["profile_url"] for p in got] == ["https://www.linkedin.com/in/person-0"]
+    context = site["_browsers"][0].contexts[0]
+    assert site["_browsers"][0].closed and context.closed
+    assert all(page.closed for page in context.pages)
+    assert site["_in_flight"] == 0 and throttle.state("acme.com").in_flight == 0
@@ -67,3 +67,114 @@ def test_duck_inject_with_explicit_allowed_sources(monkeypatch):
     # only linkedin result should remain after filtering
     hrefs = [r.get('href') or r.get('url') for r in res]
     assert all('linkedin.com' in h for h in hrefs)
+
+
+class _NoopDDGS:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def text(self, query):
+        return []
+
+
+def test_duck_parallel_returns_partial_results_when_backend_is_late(monkeypatch):
+    import time
+
+    def fast(query):
+        return [{'href': 'https://a.example/1', 'title': 'A'}, {'href': 'https://shared.example', 'title': 'S'}]
+
+    def also_fast(query):
+        return [{'href': 'https://shared.example', 'title': 'S dup'}, {'href': 'https://b.example/1', 'title': 'B'}]
+
+    def slow(query):
+        time.sleep(1.0)
+        return [{'href': 'https://slow.example/1', 'title': 'Slow'}]
+
+    monkeypatch.setattr('src.utils.duck.DDGS', _NoopDDGS)
+    monkeypatch.setattr('src.utils.duck.SEARCH_BACKENDS', [('fast', fast), ('slow', slow), ('also_fast', also_fast)])
+
+    started = time.monotonic()
+    res = duck('q', allowed_sources=[], parallel=True, backend_timeout_s=0.2, search_budget_s=0.5)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.9, "parallel search should not wait for the late backend"
+    hrefs = [r['href'] for r in res]
+    assert 'https://slow.example/1' not in hrefs
+    assert hrefs.count('https://shared.example') == 1
+    assert {r['backend'] for r in res} == {'fast', 'also_fast'}
+
+
+def test_duck_sequential_mode_tags_backend(monkeypatch):
+    calls = []
+
+    def one(query):
+        calls.append('one')
+        return [{'href': 'https://a.example/1'}]
+
+    def two(query):
+        calls.append('two')
+        return [{'href': 'https://b.example/1'}]
+
+    monkeypatch.setattr('src.utils.duck.DDGS', _NoopDDGS)
+    monkeypatch.setattr('src.utils.duck.SEARCH_BACKENDS', [('one', one), ('two', two)])
+
+    res = duck('q', allowed_sources=[], parallel=False)
+    assert calls == ['one', 'two']
+    assert [(r['href'], r['backend']) for r in res] == [('https://a.example/1', 'one'), ('https://b.example/1', 'two')]
+
+
+def test_duck_inject_runs_site_queries_concurrently(monkeypatch):
+    import time
+
+    hosts = ['a.example', 'b.example', 'c.example', 'd.example']
+
+    class SlowDDGS(_NoopDDGS):
+        def text(self, query):
+            time.sleep(0.3)
+            host = query.split('site:', 1)[1]
+            return [{'href': f'https://{host}/p/{i}', 'title': host} for i in range(3)]
+
+    monkeypatch.setattr('src.utils.duck.DDGS', SlowDDGS)
+
+    started = time.monotonic()
+    res = duck('q', allowed_sources=hosts, inject_sources=True, site_concurrency=4)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.9, "site: queries should overlap instead of running back to back"
+    assert len(res) == 12
+    assert {r['href'].split('/')[2] for r in res} == set(hosts)
+
+
+def test_duck_inject_stops_at_max_results_across_hosts(monkeypatch):
+    class ManyDDGS(_NoopDDGS):
+        def text(self, query):
+            host = query.split('site:', 1)[1]
+            return [{'href': f'https://{host}/p/{i}'} for i in range(10)]
+
+    monkeypatch.setattr('src.utils.duck.DDGS', ManyDDGS)
+
+    res = duck('q', allowed_sources=['a.example', 'b.example', 'c.example'], inject_sources=True, max_results=5)
+    assert len(res) == 5
+
+
+def test_iter_duck_yields_batches_as_backends_return(monkeypatch):
+    import time
+    from src.utils.duck import iter_duck
+
+    def fast(query):
+        return [{'href': 'https://a.example/1'}, {'href': 'https://shared.example'}]
+
+    def slow(query):
+        time.sleep(0.2)
+        return [{'href': 'https://shared.example'}, {'href': 'https://b.example/1'}]
+
+    monkeypatch.setattr('src.utils.duck.SEARCH_BACKENDS', [('slow', slow), ('fast', fast)])
+
+    batches = list(iter_duck('q', allowed_sources=[], parallel=True))
+    assert [[r['href'] for r in b] for b in batches] == [
+        ['https://a.example/1', 'https://shared.example'],
+        ['https://b.example/1'],
+    ]
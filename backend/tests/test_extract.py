@@ -0,0 +1,56 @@
+import time
+
+from src.utils.extract import extract_contacts, extract_many
+
+
+PAGE = """
+<div class="person"><h3>Jane Doe</h3>
+<p>Email <a href="mailto:jane.doe@acme-bio.com?subject=hi">write</a> or info@acme-bio.co.uk,
+call <a href="tel:+1-617-555-0142">us</a> or (617) 555-0199. Fax +44 20 7946 0958.</p>
+<a href="https://www.linkedin.com/in/jane-doe-tox/">LinkedIn</a>
+<a href="https://linkedin.com/company/acme-bio">Company</a>
+<a href="https://linkedin.com/feed/">Feed</a>
+<img src="/img/logo@2x.png"> noreply@example.com
+<p>Founded 2004-05-12. Our headquarters is at 100 Main St, Cambridge. Office hours 9-5.</p>
+</div>
+"""
+
+
+def test_extract_contacts_single_pass():
+    c = extract_contacts(PAGE)
+
+    assert c.emails == ["jane.doe@acme-bio.com", "info@acme-bio.co.uk"]
+    assert c.mailto == ["jane.doe@acme-bio.com"]
+    assert c.phones == ["+1-617-555-0142", "(617) 555-0199", "+44 20 7946 0958"]
+    assert c.tel == ["+1-617-555-0142"]
+    assert c.linkedin_urls == [
+        "https://www.linkedin.com/in/jane-doe-tox/",
+        "https://linkedin.com/company/acme-bio",
+    ]
+    # keyword order, snippet around the first occurrence of each keyword
+    assert len(c.locations) == 2
+    assert "headquarters is at 100 Main St" in c.locations[0]
+    assert "Office hours" in c.locations[1]
+
+
+def test_extract_contacts_limits_and_empty_input():
+    text = " ".join(f"person{i}@acme.com" for i in range(20))
+    assert extract_contacts(text, max_emails=3).emails == ["person0@acme.com", "person1@acme.com", "person2@acme.com"]
+    assert extract_contacts("").emails == []
+
+
+def test_extract_contacts_is_linear_on_hostile_input():
+    # Each of these made the old patterns quadratic (~1s at 20k chars).
+    for text in ("7" * 200_000, "a" * 200_000, "1." * 100_000, "a@" * 100_000):
+        started = time.perf_counter()
+        c = extract_contacts(text)
+        assert time.perf_counter() - started < 2.0
+        # at most the run boundary can match, never every offset inside it
+        assert len(c.phones) <= 1 and c.emails == []
+
+
+def test_extract_many_preserves_order():
+    pages = ["a@acme.com", "", "call 617-555-0142"]
+    results = extract_many(pages, workers=0)
+    assert [r.emails for r in results] == [["a@acme.com"], [], []]
+    assert results[2].phones == ["617-555-0142"]
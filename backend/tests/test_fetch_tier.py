@@ -0,0 +1,104 @@
+import pytest
+
+pytest.importorskip("scrapy")
+
+from scrapy.http import HtmlResponse, Request
+from scrapy.spidermiddlewares.httperror import HttpError
+from twisted.internet.error import DNSLookupError
+from twisted.python.failure import Failure
+
+from src.utils.scrapy_ok import MySpider, needs_javascript
+
+
+def _response(body, meta=None):
+    req = Request("https://example.com/team", meta=meta or {})
+    return HtmlResponse(url=req.url, body=body.encode("utf-8"), encoding="utf-8", request=req)
+
+
+STATIC_PAGE = "<html><head><title>Team</title></head><body><h1>Our team</h1><p>" + ("Jane Doe leads toxicology. " * 20) + "</p></body></html>"
+SPA_PAGE = '<html><head><title>App</title></head><body><div id="root"></div><script src="/main.js"></script></body></html>'
+
+
+def test_needs_javascript_detects_client_rendered_pages():
+    assert needs_javascript(_response(STATIC_PAGE)) == (False, "")
+    assert needs_javascript(_response(SPA_PAGE)) == (True, "spa-marker")
+    assert needs_javascript(_response("<html><body><p>short</p></body></html>"))[1] == "empty-body-text"
+    long_divs = "<html><body><div>" + ("word " * 100) + "</div></body></html>"
+    assert needs_javascript(_response(long_divs)) == (True, "missing-selectors")
+
+
+def test_parse_escalates_js_pages_and_records_tier():
+    spider = MySpider(start_url="https://example.com/team")
+
+    out = list(spider.parse(_response(SPA_PAGE, meta={"fetch_tier": "http", "playwright": False})))
+    assert len(out) == 1 and isinstance(out[0], Request)
+    assert out[0].meta["playwright"] is True
+    assert out[0].meta["fetch_tier"] == "playwright"
+
+    items = list(spider.parse(_response(STATIC_PAGE, meta={"fetch_tier": "http", "playwright": False})))
+    assert items[0]["fetch_tier"] == "http"
+
+    rendered = list(spider.parse(_response(SPA_PAGE, meta={"fetch_tier": "playwright", "playwright": True})))
+    assert rendered[0]["fetch_tier"] == "playwright"
+
+
+def test_contact_helpers_share_one_extraction_per_response(monkeypatch):
+    import src.utils.scrapy_ok as scrapy_ok
+
+    calls = []
+    real_extract = scrapy_ok.extract_contacts
+    monkeypatch.setattr(scrapy_ok, "extract_contacts", lambda text, **kw: calls.append(text) or real_extract(text, **kw))
+    spider = MySpider(start_url="https://example.com/team")
+    page = _response('<html><body><p>Jane Doe, jane@acme.com, +1 415 555 0100, Boston, MA</p>'
+                     '<a href="https://www.linkedin.com/in/jane-doe">in</a></body></html>')
+
+    assert spider.extract_emails(page) == ["jane@acme.com"]
+    assert spider.extract_linkedin(page) == ["https://www.linkedin.com/in/jane-doe"]
+    spider.extract_phones(page)
+    spider.extract_location(page)
+    list(spider.parse(page))
+    assert len(calls) == 1
+    spider.extract_emails(_response(STATIC_PAGE))
+    assert len(calls) == 2
+
+
+def _failure(exc, request):
+    try:
+        raise exc
+    except Exception:
+        failure = Failure()
+    failure.request = request
+    return failure
+
+
+def test_errback_escalates_only_bot_wall_statuses(monkeypatch):
+    spider = MySpider(start_url="https://example.com/team")
+    monkeypatch.setattr(spider, "_fetch_mode", lambda: "tiered")
+    req = Request("https://example.com/team", meta={"fetch_tier": "http", "playwright": False})
+
+    def http_error(status):
+        return _failure(HttpError(HtmlResponse(url=req.url, status=status, body=b"", request=req), "Ignoring"), req)
+
+    for status in (403, 429, 503):
+        out = spider.errback_handler(http_error(status))
+        assert isinstance(out, Request) and out.meta["fetch_tier"] == "playwright", status
+        assert out.meta["escalation_reason"] == f"http-{status}"
+
+    # a browser would get the same 404 or DNS failure
+    assert spider.errback_handler(http_error(404)) is None
+    assert spider.errback_handler(_failure(DNSLookupError("example.com"), req)) is None
+    assert spider.extracted_data["url"] == req.url
+
+
+def test_crawl_urls_streams_items_keyed_by_start_url(crawler_service, local_site):
+    from src.utils.scrapy_ok import crawl_urls
+
+    streamed = []
+    urls = [f"{local_site}/team/alice", f"{local_site}/old/bob", f"{local_site}/team/alice"]
+    items = crawl_urls(urls, on_item=lambda start_url, item: streamed.append((start_url, item["url"])), timeout=30)
+
+    # the redirected page is reported under the URL that was asked for
+    assert sorted(streamed) == [(f"{local_site}/old/bob", f"{local_site}/team/bob"),
+                                (f"{local_site}/team/alice", f"{local_site}/team/alice")]
+    assert sorted(i["url"] for i in items) == [f"{local_site}/team/alice", f"{local_site}/team/bob"]
+    assert all(i["linkedin_urls"] and i["fetch_tier"] == "http" for i in items)
@@ -0,0 +1,33 @@
+from src.utils.frontier import CrawlFrontier
+
+
+def test_pops_highest_score_first_and_fifo_among_ties():
+    f = CrawlFrontier()
+    for url, score in [("a", 0), ("b", 5), ("c", 0), ("d", 5)]:
+        f.push(url, 1, score)
+    assert f.push("a", 1, 99) == (False, None)  # already waiting
+    assert [f.pop()[0] for _ in range(4)] == ["b", "d", "a", "c"]
+    assert f.pop() is None and len(f) == 0
+
+
+def test_bounded_size_evicts_lowest_score():
+    f = CrawlFrontier(max_size=2)
+    f.push("low", 1, 1)
+    f.push("mid", 1, 2)
+    assert f.push("worse", 1, 0) == (False, None)
+    assert f.push("high", 1, 3) == (True, "low")
+    assert "low" not in f and len(f) == 2 and f.evicted == 1
+    assert [f.pop()[0], f.pop()[0]] == ["high", "mid"]
+
+
+def test_many_pushes_and_pops_stay_consistent():
+    f = CrawlFrontier(max_size=50)
+    for i in range(1000):
+        f.push(f"u{i}", 1, i % 97)
+        if i % 3 == 0:
+            f.pop()
+    scores = []
+    while f:
+        url, _depth = f.pop()
+        scores.append(int(url[1:]) % 97)
+    assert scores == sorted(scores, reverse=True)
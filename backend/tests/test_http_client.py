@@ -0,0 +1,27 @@
+from src.utils import http_client
+
+
+def test_session_is_shared_and_pooled():
+    s1 = http_client.get_session()
+    s2 = http_client.get_session()
+    assert s1 is s2
+    adapter = s1.get_adapter('https://www.googleapis.com/customsearch/v1')
+    assert adapter._pool_maxsize == http_client.HTTP_POOL_MAXSIZE
+
+
+def test_request_applies_default_timeout(monkeypatch):
+    captured = {}
+
+    def fake_request(method, url, **kwargs):
+        captured.update(kwargs, method=method, url=url)
+        return 'resp'
+
+    monkeypatch.setattr(http_client.get_session(), 'request', fake_request)
+
+    assert http_client.get('https://api.bing.microsoft.com/v7.0/search', params={'q': 'x'}) == 'resp'
+    assert captured['method'] == 'GET'
+    assert captured['timeout'] == (http_client.HTTP_CONNECT_TIMEOUT_S, http_client.HTTP_READ_TIMEOUT_S)
+
+    http_client.post('https://oauth2.googleapis.com/token', data={}, timeout=3)
+    assert captured['method'] == 'POST'
+    assert captured['timeout'] == 3
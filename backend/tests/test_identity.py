@@ -0,0 +1,163 @@
+import sys
+import types
+
+import src.handlers.handle as handle
+from src.utils.identity import IdentityIndex, LeadDeduper, canonical_profile_url, identity_keys, normalize_email
+
+
+def test_keys_are_normalized():
+    assert canonical_profile_url("https://uk.linkedin.com/in/Jane-Doe/?trk=people") == "url:linkedin.com/in/jane-doe"
+    assert canonical_profile_url("http://www.linkedin.com/in/jane-doe") == "url:linkedin.com/in/jane-doe"
+    assert canonical_profile_url("https://orcid.org/0000-0002-1825-009x") == "orcid:0000-0002-1825-009X"
+    assert canonical_profile_url("https://www.linkedin.com/profile/view?id=123&trk=nav") == "url:linkedin.com/profile/view?id=123"
+    assert normalize_email("mailto:Jane.Doe@Acme.com?subject=hi") == "jane.doe@acme.com"
+    assert normalize_email("info@acme.com") == ""
+    assert identity_keys(emails=["jane@acme.com"], name="Dr. Jané Doe, PhD", domain="acme.com") == [
+        "email:jane@acme.com", "name:jane doe|acme.com"]
+    assert identity_keys(name="Jane", domain="acme.com") == []
+
+
+def test_query_parameters_that_name_the_person_are_kept():
+    scholar = "https://scholar.google.com/citations?user={}&hl=en"
+    assert canonical_profile_url(scholar.format("AAA")) == "url:scholar.google.com/citations?user=AAA"
+    assert canonical_profile_url(scholar.format("AAA")) != canonical_profile_url(scholar.format("BBB"))
+    assert canonical_profile_url("https://scholar.google.com/citations?hl=de&user=AAA&oi=ao") == canonical_profile_url(
+        scholar.format("AAA"))
+    pubmed = "https://pubmed.ncbi.nlm.nih.gov/?term={}&sort=date"
+    assert canonical_profile_url(pubmed.format("Doe+J")) == "url:pubmed.ncbi.nlm.nih.gov?term=Doe+J"
+    assert canonical_profile_url(pubmed.format("Doe+J")) != canonical_profile_url(pubmed.format("Roe+R"))
+    assert canonical_profile_url("https://linkedin.com/profile/view?id=1") != canonical_profile_url(
+        "https://linkedin.com/profile/view?id=2")
+    # nobody's profile: a home page or a search page
+    assert canonical_profile_url("https://www.acme.com/?utm_source=x") == ""
+    assert canonical_profile_url("https://www.linkedin.com/search/results/people/?keywords=jane") == ""
+    assert canonical_profile_url("https://acme.com/team/jane-doe?utm_campaign=x") == "url:acme.com/team/jane-doe"
+
+
+def test_union_find_merges_transitively_and_persists(tmp_path):
+    path = str(tmp_path / "identity.sqlite3")
+    index = IdentityIndex(path)
+    pubmed, _ = index.resolve(["email:jane@acme.com"])
+    team, _ = index.resolve(["url:linkedin.com/in/jane-doe", "name:jane doe|acme.com"])
+    assert pubmed != team
+
+    lead, absorbed = index.resolve(["email:jane@acme.com", "url:linkedin.com/in/jane-doe"])
+    assert {lead, *absorbed} == {pubmed, team}
+    assert index.lookup(["name:jane doe|acme.com"]) == lead == index.find(pubmed) == index.find(team)
+
+    reloaded = IdentityIndex(path)
+    assert len(reloaded) == 3
+    assert reloaded.lookup(["email:jane@acme.com"]) == reloaded.lookup(["name:jane doe|acme.com"]) == lead
+    assert reloaded.stats()["leads"] == 1
+
+
+def test_deduper_lets_each_lead_through_once():
+    leads = LeadDeduper(IdentityIndex())
+    first = leads.claim(["url:linkedin.com/in/jane-doe"], "https://acme.com")
+    assert leads.claim(["url:linkedin.com/in/jane-doe", "email:jane@acme.com"], "https://pubmed.gov/1") is None
+    assert leads.claim(["email:jane@acme.com"], "https://pubmed.gov/2") is None
+    assert first["sources"] == ["https://acme.com", "https://pubmed.gov/1", "https://pubmed.gov/2"]
+    assert leads.claim([], "https://x.com") == {"lead_id": None, "sources": ["https://x.com"]}
+    assert leads.duplicates == 2
+
+
+def test_deduper_folds_a_later_sightings_contact_fields_into_the_kept_result():
+    leads = LeadDeduper(IdentityIndex())
+    keys = ["url:linkedin.com/in/jane-doe"]
+    kept = {"email": "", "phone": "+1 555 0100", "all_emails": [], "all_phones": ["+1 555 0100"], "rank": 30}
+    kept.update(leads.claim(keys, "https://acme.com"))
+    leads.keep(kept)
+
+    assert leads.claim(keys, "https://pubmed.gov/1") is None
+    later = {"email": "jane@acme.com", "phone": "+1 555 0199", "all_emails": ["jane@acme.com"],
+             "all_phones": ["+1 555 0199"], "rank": 70}
+    assert leads.fold(keys, later) is kept
+    assert kept["email"] == "jane@acme.com" and kept["phone"] == "+1 555 0100"
+    assert kept["all_phones"] == ["+1 555 0100", "+1 555 0199"] and kept["rank"] == 70
+    assert kept["sources"] == ["https://acme.com", "https://pubmed.gov/1"]
+    # nothing new: no update
+    assert leads.fold(keys, later) is None
+
+
+def test_scrape_progress_sends_an_update_when_a_duplicate_brings_an_email(monkeypatch):
+    def fake_iter_duck(q, inject_sources=True, focus_people=False, allowed_sources=None):
+        yield [{"href": "https://a.com", "title": "A"}, {"href": "https://b.com", "title": "B"}]
+
+    def fake_crawl_url(u):
+        item = {"url": u + "/team", "title": "Jane Doe", "linkedin_urls": ["https://www.linkedin.com/in/jane-doe"]}
+        if "b.com" in u:
+            item["emails"] = ["jane@acme.com"]
+        return [item]
+
+    mod = types.ModuleType('src.utils.scrapy_ok')
+    mod.crawl_url = fake_crawl_url
+    monkeypatch.setitem(sys.modules, 'src.utils.scrapy_ok', mod)
+    monkeypatch.setattr(handle, 'iter_duck', fake_iter_duck)
+    monkeypatch.setenv('USE_PLAYWRIGHT_DEEP', '0')
+    monkeypatch.setenv('SCRAPE_WORKERS', '1')
+
+    events = []
+    out = handle.scrape_progress('q', progress_callback=events.append)
+
+    items = [e['item'] for e in events if e['type'] == 'item']
+    updates = [e['item'] for e in events if e['type'] == 'item_update']
+    assert len(items) == 1 and items[0]['url'] == "https://a.com/team"
+    assert [u['lead_id'] for u in updates] == [items[0]['lead_id']]
+    assert updates[0]['email'] == "jane@acme.com" and updates[0]['all_emails'] == ["jane@acme.com"]
+    assert len(out['results']) == 1 and out['results'][0]['email'] == "jane@acme.com"
+    assert sorted(out['results'][0]['sources']) == ["https://a.com", "https://b.com"]
+
+
+def test_scrape_progress_emits_a_person_found_on_two_sites_once(monkeypatch):
+    def fake_iter_duck(q, inject_sources=True, focus_people=False, allowed_sources=None):
+        yield [{"href": "https://a.com", "title": "A"}, {"href": "https://b.com", "title": "B"},
+               {"href": "https://www.linkedin.com/in/bob", "title": "Bob"},
+               {"href": "https://uk.linkedin.com/in/bob/?trk=x", "title": "Bob"}]
+
+    def fake_crawl_url(u):
+        link = "https://www.linkedin.com/in/bob" if "a.com" in u else "https://de.linkedin.com/in/Bob/"
+        return [{"url": u + "/team", "title": "Team", "linkedin_urls": [link]}]
+
+    mod = types.ModuleType('src.utils.scrapy_ok')
+    mod.crawl_url = fake_crawl_url
+    monkeypatch.setitem(sys.modules, 'src.utils.scrapy_ok', mod)
+    monkeypatch.setattr(handle, 'iter_duck', fake_iter_duck)
+    monkeypatch.setenv('USE_PLAYWRIGHT_DEEP', '0')
+    scored = []
+    real_score = handle.calculate_propensity_score
+    monkeypatch.setattr(handle, 'calculate_propensity_score', lambda d, c=None: scored.append(d) or real_score(d, c))
+
+    events = []
+    out = handle.scrape_progress('q', progress_callback=events.append)
+
+    items = [e['item'] for e in events if e['type'] == 'item']
+    # the second sighting is scored too, so its fields can be folded into the lead
+    assert len(items) == 1 and len(scored) == 2
+    assert sorted(items[0]['sources']) == ["https://a.com", "https://b.com"]
+    assert [r['lead_id'] for r in out['results']] == [items[0]['lead_id']]
+    assert [r['href'] for e in events if e['type'] == 'search_results' for r in e['results']] == [
+        "https://www.linkedin.com/in/bob"]
+
+
+def test_people_sharing_a_company_link_stay_separate_leads(monkeypatch):
+    def fake_iter_duck(q, inject_sources=True, focus_people=False, allowed_sources=None):
+        yield [{"href": "https://acme.com", "title": "Acme"}]
+
+    def fake_crawl_url(u):
+        company = "https://www.linkedin.com/company/acme"
+        return [{"url": "https://acme.com/people/jane", "title": "Jane", "linkedin_urls": [company]},
+                {"url": "https://acme.com/people/bob", "title": "Bob", "linkedin_urls": [company]}]
+
+    mod = types.ModuleType('src.utils.scrapy_ok')
+    mod.crawl_url = fake_crawl_url
+    monkeypatch.setitem(sys.modules, 'src.utils.scrapy_ok', mod)
+    monkeypatch.setattr(handle, 'iter_duck', fake_iter_duck)
+    monkeypatch.setenv('USE_PLAYWRIGHT_DEEP', '0')
+
+    assert handle._lead_keys({"url": "https://acme.com/people/jane",
+                              "linkedin_urls": ["https://www.linkedin.com/company/acme"]}, handle._is_profile_url) == []
+    events = []
+    handle.scrape_progress('q', progress_callback=events.append)
+
+    items = [e['item'] for e in events if e['type'] == 'item']
+    assert sorted(i['url'] for i in items) == ["https://acme.com/people/bob", "https://acme.com/people/jane"]
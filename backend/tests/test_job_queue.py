@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+
+import src.handlers.handle as handle
+from src.utils.job_queue import CANCELLED, DEAD, FAILED, RUNNING, SUCCEEDED, JobQueue, LeaseLost
+from src.worker import QueueWorker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), lease_s=60, max_attempts=2, retry_base_s=10)
+
+
+def test_claim_is_exclusive_and_shared_across_connections(queue):
+    job_id = queue.enqueue("toxicology", {"max_results": 5})
+    other = JobQueue(queue.path)  # e.g. a worker process
+
+    job = other.claim("w1")
+    assert job["id"] == job_id and job["params"] == {"max_results": 5} and job["attempts"] == 1
+    assert queue.claim("w2") is None
+    assert queue.get(job_id)["status"] == RUNNING and queue.get(job_id)["lease_owner"] == "w1"
+
+
+def test_expired_lease_is_retried_with_backoff_then_dead_lettered(queue, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    job_id = queue.enqueue("q")
+
+    assert queue.claim("w1")["id"] == job_id
+    now[0] += 61  # w1 vanished without a heartbeat
+    assert queue.claim("w2") is None  # the lost attempt waits out its backoff first
+    job = queue.get(job_id)
+    assert job["status"] == FAILED and "lease expired" in job["error"] and job["available_at"] == now[0] + 10
+    with pytest.raises(LeaseLost):
+        queue.heartbeat(job_id, "w1")
+
+    now[0] += 10
+    assert queue.claim("w2")["attempts"] == 2
+    assert queue.fail(job_id, "w2", "search backend down") == DEAD
+    assert queue.get(job_id)["error"] == "search backend down"
+    assert queue.claim("w3") is None
+
+    assert queue.requeue(job_id)
+    assert queue.claim("w3")["attempts"] == 1
+
+
+def test_cancelled_job_whose_worker_vanished_is_not_rerun(queue, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    job_id = queue.enqueue("q")
+    queue.claim("w1")
+    assert queue.cancel(job_id) == RUNNING
+
+    now[0] += 61  # w1 vanished before its next heartbeat saw the cancel
+    assert queue.claim("w2") is None
+    job = queue.get(job_id)
+    assert job["status"] == CANCELLED and job["finished_at"] == now[0] and job["lease_owner"] is None
+    now[0] += 3600
+    assert queue.claim("w2") is None
+
+
+def test_requeue_clears_an_earlier_cancel_request(queue):
+    job_id = queue.enqueue("q", max_attempts=1)
+    queue.claim("w1")
+    assert queue.cancel(job_id) == RUNNING
+    assert queue.fail(job_id, "w1", "crashed before stopping") == DEAD
+
+    assert queue.requeue(job_id)
+    assert queue.get(job_id)["cancel_requested"] == 0
+    queue.claim("w2")
+    assert queue.heartbeat(job_id, "w2") is False
+
+
+def test_heartbeat_extends_lease_streams_items_and_reports_cancel(queue, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    job_id = queue.enqueue("q")
+    queue.claim("w1")
+
+    now[0] += 50
+    assert queue.heartbeat(job_id, "w1", percent=40, items=[{"url": "a"}, {"url": "b"}]) is False
+    now[0] += 50  # past the original lease, within the renewed one
+    assert queue.claim("w2") is None
+    assert queue.status_dict(job_id)["partial_results"] == [{"url": "a"}, {"url": "b"}]
+
+    assert queue.cancel(job_id) == RUNNING
+    assert queue.heartbeat(job_id, "w1", items=[{"url": "c"}], errors=[{"msg": "timed out", "url": "x"}]) is True
+    assert queue.status_dict(job_id)["errors"] == [{"msg": "timed out", "url": "x"}]
+    queue.complete(job_id, "w1", result={"query": "q"}, cancelled=True)
+    status = queue.status_dict(job_id, preview=2)
+    assert status["status"] == CANCELLED and status["results_count"] == 3
+    assert [r["url"] for r in status["partial_results"]] == ["b", "c"]
+    assert queue.page(job_id, offset=2)["results"] == [{"url": "c"}]
+    assert queue.delete(job_id) and queue.get(job_id) is None
+
+
+def test_heartbeat_updates_replace_items_of_the_same_lead(queue):
+    job_id = queue.enqueue("q")
+    queue.claim("w1")
+    queue.heartbeat(job_id, "w1", items=[{"lead_id": "a", "email": ""}, {"lead_id": "b", "email": ""}])
+    queue.heartbeat(job_id, "w1", updates=[{"lead_id": "a", "email": "jane@acme.com"}])
+    assert queue.page(job_id)["results"] == [{"lead_id": "a", "email": "jane@acme.com"}, {"lead_id": "b", "email": ""}]
+
+
+def test_worker_runs_scrape_progress_jobs(queue, monkeypatch):
+    seen = {}
+    checkpoint = threading.Event()
+
+    def fake_scrape_progress(query, max_results=200, allowed_sources=None, progress_callback=None, cancel_event=None):
+        if query == "boom":
+            raise RuntimeError("search backend down")
+        seen.update(max_results=max_results, allowed_sources=allowed_sources)
+        progress_callback({"type": "item", "item": {"url": "https://www.linkedin.com/in/a"}, "percent": 50})
+        progress_callback({"type": "error", "msg": "Failed to crawl https://b.com", "url": "https://b.com"})
+        checkpoint.wait(5)  # let a heartbeat flush the item
+        items = [{"url": "https://www.linkedin.com/in/a"}]
+        progress_callback({"type": "done", "percent": 100, "results": items})
+        return {"query": query, "results": items}
+
+    monkeypatch.setattr(handle, "scrape_progress", fake_scrape_progress)
+    ok = queue.enqueue("toxicology", {"max_results": 7, "allowed_sources": ["pubmed"]})
+    boom = queue.enqueue("boom")
+    worker = QueueWorker(queue, worker_id="w1", heartbeat_s=0.02)
+
+    def release_after_flush():
+        while queue.get(ok)["items_count"] == 0:
+            time.sleep(0.01)
+        checkpoint.set()
+
+    threading.Thread(target=release_after_flush, daemon=True).start()
+    worker.run(concurrency=2, poll_s=0.01, once=True)
+
+    job = queue.status_dict(ok)
+    assert job["status"] == SUCCEEDED and job["percent"] == 100
+    assert job["partial_results"] == [{"url": "https://www.linkedin.com/in/a"}]
+    assert job["errors"] == [{"msg": "Failed to crawl https://b.com", "url": "https://b.com"}]
+    assert queue.get(ok)["result"]["query"] == "toxicology"
+    assert seen == {"max_results": 7, "allowed_sources": ["pubmed"]}
+    failed = queue.get(boom)
+    assert failed["status"] == FAILED and failed["error"] == "search backend down" and failed["attempts"] == 1
+
@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+
+import src.handlers.handle as handle
+from src.utils.jobs import CANCELLED, FAILED, SUCCEEDED, JobManager
+
+
+def test_job_runs_in_background_and_collects_events(monkeypatch):
+    release = threading.Event()
+
+    def fake_scrape_progress(query, max_results=200, allowed_sources=None, progress_callback=None, cancel_event=None):
+        progress_callback({"type": "item", "item": {"url": "https://www.linkedin.com/in/a"}, "percent": 40})
+        release.wait(5)
+        progress_callback({"type": "item", "item": {"url": "https://www.linkedin.com/in/b"}, "percent": 80})
+        items = [{"url": "https://www.linkedin.com/in/a"}, {"url": "https://www.linkedin.com/in/b"}]
+        progress_callback({"type": "done", "percent": 100, "results": items})
+        return {"query": query, "results": items}
+
+    monkeypatch.setattr(handle, "scrape_progress", fake_scrape_progress)
+    manager = JobManager(workers=1)
+    try:
+        job = manager.submit("toxicology")  # returns before the scrape finishes
+        assert job.status in ("queued", "running")
+        while not job.results:
+            release.wait(0.01)
+        partial = job.status_dict()
+        assert partial["percent"] == 40 and partial["results_count"] == 1
+
+        release.set()
+        assert job.future.result(timeout=5)["query"] == "toxicology"
+        assert job.status == SUCCEEDED and job.status_dict()["percent"] == 100
+        page = job.page(offset=1, limit=1)
+        assert page["total"] == 2 and page["results"] == [{"url": "https://www.linkedin.com/in/b"}]
+        assert job.timings()["run_s"] >= 0
+
+        assert manager.delete(job.id) and manager.get(job.id) is None
+    finally:
+        manager.shutdown()
+
+
+def test_cancel_and_failure(monkeypatch):
+    started = threading.Event()
+
+    def fake_scrape_progress(query, max_results=200, allowed_sources=None, progress_callback=None, cancel_event=None):
+        if query == "boom":
+            raise RuntimeError("search backend down")
+        started.set()
+        assert cancel_event.wait(5)
+        return {"query": query, "results": []}
+
+    monkeypatch.setattr(handle, "scrape_progress", fake_scrape_progress)
+    manager = JobManager(workers=2)
+    try:
+        job = manager.submit("slow")
+        assert started.wait(5)
+        assert not manager.delete(job.id)  # still running
+        manager.cancel(job.id)
+        job.future.result(timeout=5)
+        assert job.status == CANCELLED
+
+        failed = manager.submit("boom")
+        failed.future.result(timeout=5)
+        assert failed.status == FAILED and "backend down" in failed.status_dict()["error"]
+    finally:
+        manager.shutdown()
+
+
+def test_scrape_progress_stops_dispatching_when_cancelled(monkeypatch):
+    import sys, types
+
+    cancel = threading.Event()
+    crawled = []
+
+    def fake_iter_duck(q, inject_sources=True, focus_people=False, allowed_sources=None):
+        yield [{"href": "https://a.com", "title": "A"}]
+        cancel.set()
+        yield [{"href": "https://b.com", "title": "B"}]
+
+    mod = types.ModuleType('src.utils.scrapy_ok')
+    mod.crawl_url = lambda u: crawled.append(u) or []
+    monkeypatch.setitem(sys.modules, 'src.utils.scrapy_ok', mod)
+    monkeypatch.setattr(handle, 'iter_duck', fake_iter_duck)
+    monkeypatch.setenv('USE_PLAYWRIGHT_DEEP', '0')
+
+    events = []
+    handle.scrape_progress('q', progress_callback=events.append, cancel_event=cancel)
+
+    assert "https://b.com" not in crawled
+    assert events[-1]["type"] == "done" and events[-1]["cancelled"] is True
+
+
+def test_scrape_endpoint_returns_handle_scrape_payload_off_the_event_loop(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    import main
+
+    payload = {"query": "tox", "fields": ["Director of Toxicology"],
+               "search_results": [{"href": "https://acme.com", "title": "Acme"}],
+               "results": [{"url": "https://acme.com/team", "rank": 40}]}
+    calls = []
+
+    def fake_scrape(query, max_results=200):
+        calls.append((query, threading.current_thread() is threading.main_thread()))
+        return payload
+
+    monkeypatch.setattr(handle, "scrape", fake_scrape)
+    monkeypatch.setattr(handle, "scrape_progress", lambda *a, **k: pytest.fail("/scrape must not run scrape_progress"))
+    r = TestClient(main.app).post("/scrape", json={"input": "tox"})
+    assert r.status_code == 200 and r.json() == payload
+    assert calls == [("tox", False)]
+
+
+def test_app_shutdown_stops_jobs_workers_and_crawlers(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    import main
+    from src.utils import browser_pool, crawl_workers, crawler_service, jobs
+
+    stopped = []
+    for module, name in ((jobs, "shutdown_job_manager"), (crawl_workers, "shutdown_crawl_pool"),
+                         (browser_pool, "shutdown_browser_pool"), (crawler_service, "shutdown_crawler_service")):
+        monkeypatch.setattr(module, name, lambda name=name: stopped.append(name))
+
+    with TestClient(main.app):
+        assert stopped == []
+    assert stopped == ["shutdown_job_manager", "shutdown_crawl_pool", "shutdown_browser_pool",
+                       "shutdown_crawler_service"]
@@ -0,0 +1,151 @@
+import os
+
+import pytest
+
+from src.utils.page_cache import PageCache, RENDERED, normalize_page_url, parse_domain_ttls, serve_document_route
+
+
+HTML = b"<html><body><p>Jane Doe, toxicology</p></body></html>"
+
+
+def _cache(tmp_path, **kwargs):
+    return PageCache(os.path.join(tmp_path, "pages.sqlite3"), **kwargs)
+
+
+def test_normalize_page_url():
+    assert normalize_page_url("HTTPS://Example.COM:443/team?b=2&utm_source=x&a=1#top") == "https://example.com/team?a=1&b=2"
+    assert normalize_page_url("http://example.com") == "http://example.com/"
+    assert parse_domain_ttls("a.com=60, b.org=0,bad") == {"a.com": 60.0, "b.org": 0.0}
+
+
+def test_put_get_and_variants(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.get("https://acme.com/team") is None
+    assert cache.put("https://acme.com/team#x", HTML, etag='"v1"', content_type="text/html")
+
+    page = cache.get("https://ACME.com/team")
+    assert page.body == HTML and page.fresh and page.etag == '"v1"'
+    assert cache.get("https://acme.com/team", RENDERED) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_domain_ttls_and_uncacheable_responses(tmp_path):
+    cache = _cache(tmp_path, default_ttl_s=60, domain_ttls={"linkedin.com": 0, "slow.org": 3600})
+    assert cache.ttl_for("https://www.slow.org/a") == 3600
+    assert cache.ttl_for("https://pubmed.ncbi.nlm.nih.gov/1/") == 7 * 86400
+    assert not cache.put("https://www.linkedin.com/in/jane", HTML)
+    assert not cache.put("https://acme.com/a", HTML, status=404)
+    assert not cache.put("https://acme.com/a", HTML, cache_control="private, no-store")
+
+
+def test_stale_entry_revalidates(tmp_path):
+    cache = _cache(tmp_path, default_ttl_s=0.01)
+    cache.put("https://acme.com/", HTML, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    cache._conn.execute("UPDATE page_cache SET stored_at = stored_at - 10")
+
+    page = cache.get("https://acme.com/")
+    assert not page.fresh
+    assert page.conditional_headers() == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+    cache.default_ttl_s = 60
+    cache.refresh("https://acme.com/", etag='"v2"')
+    page = cache.get("https://acme.com/")
+    assert page.fresh and page.etag == '"v2"' and page.last_modified.startswith("Mon")
+
+
+def test_byte_budget_evicts_least_recently_used(tmp_path):
+    body = os.urandom(4000)  # incompressible
+    cache = _cache(tmp_path, max_bytes=10_000)
+    cache.put("https://acme.com/1", body)
+    cache.put("https://acme.com/2", body)
+    cache.get("https://acme.com/1")  # 1 is now more recently used than 2
+    cache.put("https://acme.com/3", body)
+
+    assert cache.stats()["bytes"] <= 10_000
+    assert cache.get("https://acme.com/2") is None
+    assert cache.get("https://acme.com/1") is not None and cache.get("https://acme.com/3") is not None
+
+
+class _FakeRequest:
+    def __init__(self, url, resource_type="document", method="GET"):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+        self.headers = {"user-agent": "test"}
+
+
+class _FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self._body = body
+        self.headers = headers or {}
+
+    def body(self):
+        return self._body
+
+
+class _FakeRoute:
+    def __init__(self, response):
+        self.response = response
+        self.fetched_headers = None
+        self.fulfilled = None
+
+    def fetch(self, headers=None):
+        self.fetched_headers = headers
+        return self.response
+
+    def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+
+def test_serve_document_route_fetches_stores_and_revalidates(tmp_path):
+    cache = _cache(tmp_path)
+    url = "https://acme.com/team"
+
+    route = _FakeRoute(_FakeResponse(200, HTML, {"Content-Type": "text/html", "ETag": '"v1"'}))
+    assert serve_document_route(route, _FakeRequest(url), cache)
+    assert route.fulfilled["body"] == HTML
+    assert cache.get(url).etag == '"v1"'
+
+    # fresh: served without fetching
+    route = _FakeRoute(None)
+    assert serve_document_route(route, _FakeRequest(url), cache)
+    assert route.fetched_headers is None and route.fulfilled["body"] == HTML
+
+    # stale: conditional fetch, 304 served from cache
+    cache._conn.execute("UPDATE page_cache SET stored_at = stored_at - 1e9")
+    route = _FakeRoute(_FakeResponse(304))
+    assert serve_document_route(route, _FakeRequest(url), cache)
+    assert route.fetched_headers["If-None-Match"] == '"v1"'
+    assert route.fulfilled["body"] == HTML and cache.get(url).fresh
+
+    assert not serve_document_route(_FakeRoute(None), _FakeRequest(url, resource_type="script"), cache)
+    assert not serve_document_route(_FakeRoute(None), _FakeRequest(url), None)
+
+
+def test_scrapy_middleware_serves_hits_and_handles_304(tmp_path):
+    pytest.importorskip("scrapy")
+    from scrapy.http import HtmlResponse, Request, Response
+    from scrapy.spiders import Spider
+
+    from src.utils.page_cache import PageCacheMiddleware
+
+    cache = _cache(tmp_path)
+    mw = PageCacheMiddleware(cache)
+    spider = Spider("t")
+
+    req = Request("https://acme.com/team")
+    assert mw.process_request(req, spider) is None and req.meta["page_cache"] == "miss"
+    resp = HtmlResponse(req.url, body=HTML, headers={"ETag": '"v1"'}, request=req)
+    assert mw.process_response(req, resp, spider) is resp
+
+    hit = mw.process_request(Request("https://acme.com/team"), spider)
+    assert hit is not None and hit.body == HTML and "cached" in hit.flags
+    assert mw.process_request(Request("https://acme.com/team", meta={"playwright": True}), spider) is None
+
+    cache._conn.execute("UPDATE page_cache SET stored_at = stored_at - 1e9")
+    req = Request("https://acme.com/team")
+    assert mw.process_request(req, spider) is None
+    assert req.headers.get("If-None-Match") == b'"v1"'
+    out = mw.process_response(req, Response(req.url, status=304, request=req), spider)
+    assert out.status == 200 and out.body == HTML and "revalidated" in out.flags
@@ -0,0 +1,94 @@
+import json
+
+from src.utils import profile
+from src.utils.profile import PageAnalysis, is_profile_url
+
+
+# is_profile_url as it was before PageAnalysis; the split scorer must agree with it.
+def _reference_is_profile_url(url, page_text=None, jsonld_texts=None):
+    if not url:
+        return False, 0
+
+    u = url.lower()
+    score = 0
+
+    # Strong URL patterns
+    if "linkedin.com/in/" in u or "/in/" in u and "linkedin.com" in u:
+        score += 60
+    if "linkedin.com/pub/" in u or "linkedin.com/profile/view" in u:
+        score += 50
+    if profile._ORCID_RE.search(u):
+        score += 60
+    if "researchgate.net/profile/" in u:
+        score += 55
+    if "scholar.google.com/citations" in u:
+        score += 55
+    if "pubmed.ncbi.nlm.nih.gov/?term=" in u:
+        score += 60
+
+    # Path tokens indicating person pages
+    path_tokens = ("/people/", "/person/", "/staff/", "/team/", "/profile/", "/users/", "/~")
+    if any(t in u for t in path_tokens):
+        score += 20
+
+    # author tokens
+    if "/author" in u or "?author=" in u or "&author=" in u:
+        score += 10
+
+    # content signals
+    if page_text:
+        if profile._NAME_RE.search(page_text[:200]):
+            score += 10
+        if "mailto:" in page_text or "@" in page_text:
+            score += 10
+
+    # JSON-LD / schema.org Person
+    try:
+        if profile._looks_like_person_schema(jsonld_texts):
+            score += 40
+    except Exception:
+        pass
+
+    return (score >= 60, score)
+
+
+URLS = [
+    "",
+    "https://www.linkedin.com/in/jane-doe",
+    "https://linkedin.com/pub/jane",
+    "https://orcid.org/0000-0002-1825-009X",
+    "https://www.researchgate.net/profile/John-Smith",
+    "https://scholar.google.com/citations?user=abc",
+    "https://pubmed.ncbi.nlm.nih.gov/?term=smith",
+    "https://acme.com/team/jane",
+    "https://acme.com/blog?author=jane",
+    "https://acme.com/~jane",
+    "https://acme.com/news",
+]
+
+PAGES = [
+    (None, None),
+    ("Jane Doe leads research. Contact: jane@acme.com", None),
+    ("welcome", [json.dumps({"@graph": [{"@type": ["Person"], "name": "Jane"}]}), "not json", ""]),
+    ("Team Page mailto:x", [json.dumps({"@type": "Organization"})]),
+]
+
+
+def test_page_analysis_matches_original_scoring():
+    for text, jsonlds in PAGES:
+        analysis = PageAnalysis(text, jsonlds)
+        for url in URLS:
+            expected = _reference_is_profile_url(url, page_text=text, jsonld_texts=jsonlds)
+            assert analysis.score(url) == expected, (url, text)
+            assert is_profile_url(url, page_text=text, jsonld_texts=jsonlds) == expected
+
+
+def test_page_signals_are_computed_once(monkeypatch):
+    calls = []
+    original = profile._looks_like_person_schema
+    monkeypatch.setattr(profile, "_looks_like_person_schema", lambda blobs: calls.append(1) or original(blobs))
+
+    analysis = PageAnalysis("Jane Doe", [json.dumps({"@type": "Person"})])
+    scores = [analysis.score(f"https://acme.com/team/{i}") for i in range(50)]
+    assert len(calls) == 1
+    assert scores[0] == (True, 70)
@@ -10,11 +10,11 @@ def test_search_results_only_profiles(monkeypatch):
         {"href": "https://researchgate.net/profile/john-smith", "title": "John"},
     ]
 
-    def fake_duck(q, inject_sources=True, focus_people=False, allowed_sources=None):
-        return fake_results
+    def fake_iter_duck(q, inject_sources=True, focus_people=False, allowed_sources=None):
+        yield fake_results
 
     import sys, types
-    monkeypatch.setattr(handle, 'duck', fake_duck)
+    monkeypatch.setattr(handle, 'iter_duck', fake_iter_duck)
     # disable deep crawl to keep function short
     monkeypatch.setenv('USE_PLAYWRIGHT_DEEP', '0')
     # Ensure the `from src.utils.scrapy_ok import crawl_url` import raises ImportError
@@ -66,3 +66,150 @@ def test_scrape_filters_non_profile_results(monkeypatch):
     urls = [r.get('url') for r in results]
     assert 'https://www.linkedin.com/in/alice' in urls
     assert not any('example.com/about' in (u or '') for u in urls)
+
+
+def test_scrape_progress_crawls_before_search_finishes(monkeypatch):
+    import sys, threading, types
+
+    first_crawl_started = threading.Event()
+
+    def fake_iter_duck(q, inject_sources=True, focus_people=False, allowed_sources=None):
+        yield [{"href": "https://a.com", "title": "A"}]
+        # The second batch only arrives once the first hit is already being crawled
+        assert first_crawl_started.wait(5), "crawl did not start on the first search batch"
+        yield [{"href": "https://www.linkedin.com/in/bob", "title": "Bob"}, {"href": "https://b.com", "title": "B"}]
+
+    crawled = []
+
+    def fake_crawl_url(u):
+        crawled.append(u)
+        first_crawl_started.set()
+        return []
+
+    mod = types.ModuleType('src.utils.scrapy_ok')
+    mod.crawl_url = fake_crawl_url
+    monkeypatch.setitem(sys.modules, 'src.utils.scrapy_ok', mod)
+    monkeypatch.setattr(handle, 'iter_duck', fake_iter_duck)
+    monkeypatch.setenv('USE_PLAYWRIGHT_DEEP', '0')
+
+    events = []
+    out = handle.scrape_progress('test-query', progress_callback=events.append)
+
+    assert crawled == ["https://a.com", "https://b.com"]
+    search_events = [e for e in events if e.get('type') == 'search_results']
+    assert [r['href'] for e in search_events for r in e['results']] == ["https://www.linkedin.com/in/bob"]
+    assert len(out['search_results']) == 3
+    assert events[-1]['type'] == 'done'
+    percents = [e['percent'] for e in events if e.get('type') == 'progress']
+    assert percents == sorted(percents)
+
+
+def test_scrape_uses_single_batch_crawl_when_available(monkeypatch):
+    import sys, types
+
+    def fake_duck(q, inject_sources=True):
+        return [{"href": "https://a.com"}, {"href": "https://b.com"}]
+
+    batches = []
+
+    def fake_crawl_urls(urls, on_item=None, settings=None, timeout=None):
+        batches.append(list(urls))
+        on_item("https://a.com", {"url": "https://www.linkedin.com/in/alice", "title": "Alice", "linkedin_urls": ["https://www.linkedin.com/in/alice"]})
+        on_item("https://b.com", {"url": "https://example.com/about", "title": "About", "linkedin_urls": []})
+        return []
+
+    def fail_crawl_url(u):
+        raise AssertionError("per-URL crawl should not be used when crawl_urls exists")
+
+    mod = types.ModuleType('src.utils.scrapy_ok')
+    mod.crawl_url = fail_crawl_url
+    mod.crawl_urls = fake_crawl_urls
+    monkeypatch.setitem(sys.modules, 'src.utils.scrapy_ok', mod)
+    monkeypatch.setattr(handle, 'duck', fake_duck)
+
+    out = handle.scrape('query', max_results=5)
+
+    assert batches == [["https://a.com", "https://b.com"]]
+    assert [r.get('url') for r in out['results']] == ['https://www.linkedin.com/in/alice']
+
+
+def test_scrape_progress_slow_site_does_not_block_others(monkeypatch):
+    import sys, threading, types
+
+    b_item_sent = threading.Event()
+
+    def fake_iter_duck(q, inject_sources=True, focus_people=False, allowed_sources=None):
+        yield [{"href": "https://slow.com", "title": "Slow"}, {"href": "https://b.com", "title": "B"}]
+
+    def fake_crawl_url(u):
+        if "slow" in u:
+            # only finishes once the other site's item has been streamed
+            assert b_item_sent.wait(5), "fast site was blocked behind the slow one"
+            return []
+        return [{"url": "https://www.linkedin.com/in/bob", "title": "Bob", "linkedin_urls": ["https://www.linkedin.com/in/bob"]}]
+
+    mod = types.ModuleType('src.utils.scrapy_ok')
+    mod.crawl_url = fake_crawl_url
+    monkeypatch.setitem(sys.modules, 'src.utils.scrapy_ok', mod)
+    monkeypatch.setattr(handle, 'iter_duck', fake_iter_duck)
+    monkeypatch.setenv('USE_PLAYWRIGHT_DEEP', '0')
+    monkeypatch.setenv('SCRAPE_WORKERS', '2')
+
+    events = []
+
+    def cb(evt):
+        events.append(evt)
+        if evt.get('type') == 'item':
+            b_item_sent.set()
+
+    out = handle.scrape_progress('test-query', progress_callback=cb)
+
+    assert [r['url'] for r in out['results']] == ["https://www.linkedin.com/in/bob"]
+    completions = [e['url'] for e in events if e.get('type') == 'progress' and e.get('url') and e['percent'] > 0]
+    assert completions[-1] == "https://slow.com"
+    assert events[-1]['type'] == 'done'
+
+
+def test_scrape_progress_crawls_each_search_batch_in_one_run_and_streams_items(monkeypatch):
+    import sys, threading, types
+
+    first_item_sent = threading.Event()
+
+    def fake_iter_duck(q, inject_sources=True, focus_people=False, allowed_sources=None):
+        yield [{"href": "https://a.com", "title": "A"}, {"href": "https://b.com", "title": "B"},
+               {"href": "https://www.linkedin.com/in/zed", "title": "Zed"}]
+
+    batches = []
+
+    def fake_crawl_urls(urls, on_item=None, settings=None, timeout=None):
+        batches.append(list(urls))
+        on_item("https://a.com", {"url": "https://a.com/team", "title": "Alice",
+                                  "linkedin_urls": ["https://www.linkedin.com/in/alice"]})
+        # the crawl is still running when the first item reaches the client
+        assert first_item_sent.wait(5), "items were held until the batch finished"
+        on_item("https://b.com", {"url": "https://b.com/team", "title": "Bob",
+                                  "linkedin_urls": ["https://www.linkedin.com/in/bob"]})
+        return []
+
+    def fail_crawl_url(u):
+        raise AssertionError("per-URL crawl should not be used when crawl_urls exists")
+
+    mod = types.ModuleType('src.utils.scrapy_ok')
+    mod.crawl_url = fail_crawl_url
+    mod.crawl_urls = fake_crawl_urls
+    monkeypatch.setitem(sys.modules, 'src.utils.scrapy_ok', mod)
+    monkeypatch.setattr(handle, 'iter_duck', fake_iter_duck)
+    monkeypatch.setenv('USE_PLAYWRIGHT_DEEP', '0')
+
+    events = []
+
+    def cb(evt):
+        events.append(evt)
+        if evt.get('type') == 'item':
+            first_item_sent.set()
+
+    out = handle.scrape_progress('test-query', progress_callback=cb)
+
+    assert batches == [["https://a.com", "https://b.com"]]
+    assert [r['sources'] for r in out['results']] == [["https://a.com"], ["https://b.com"]]
+    assert events[-1]['type'] == 'done' and events[-1]['percent'] == 100
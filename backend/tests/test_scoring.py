@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from src.handlers.handle import calculate_propensity_score
+from src.utils import scoring
+from src.utils.scoring import KeywordMatcher, PropensityScorer
+
+
+# calculate_propensity_score as it was before the compiled matcher; the scorer must agree with it.
+def _reference_score(data, context=None):
+    score = 0
+    text_content = data.get('text_content', '').lower()
+    title = data.get('title', '').lower()
+
+    role_keywords = [
+        'toxicology', 'safety', 'hepatic', '3d', 'preclinical',
+        'drug development', 'director', 'head of', 'vp', 'chief'
+    ]
+    role_score = sum(5 for keyword in role_keywords if keyword in text_content or keyword in title)
+    score += min(role_score, 30)
+
+    funding_keywords = ['series a', 'series b', 'funding', 'raised', 'investment', 'ipo']
+    funding_score = sum(5 for keyword in funding_keywords if keyword in text_content)
+    score += min(funding_score, 20)
+
+    tech_keywords = ['in vitro', '3d model', 'organ-on-chip', 'spheroid', 'nam', 'new approach methodologies']
+    tech_score = sum(5 for keyword in tech_keywords if keyword in text_content)
+    score += min(tech_score, 15)
+
+    hub_locations = ['boston', 'cambridge', 'bay area', 'basel', 'san francisco', 'uk']
+    location_score = sum(5 for loc in hub_locations if loc in text_content)
+    score += min(location_score, 10)
+
+    science_keywords = ['publication', 'published', 'research', 'dili', 'liver injury', 'toxicity']
+    science_score = sum(8 for keyword in science_keywords if keyword in text_content)
+    score += min(science_score, 40)
+
+    if data.get('linkedin_urls'):
+        score += 5
+
+    emails = data.get('emails', [])
+    if any('@' in email and not any(x in email.lower() for x in ['gmail', 'yahoo', 'hotmail']) for email in emails):
+        score += 5
+
+    return min(score, 100)
+
+
+FRAGMENTS = [
+    "Toxicology", "safety", "HEPATIC", "3D", "3d model", "preclinical", "drug development", "Director", "head of",
+    "VP", "chief", "Series A", "series b", "funding", "raised", "investment", "IPO", "in vitro", "organ-on-chip",
+    "spheroid", "name", "new approach methodologies", "Boston", "Cambridge", "bay area", "Basel", "San Francisco",
+    "Duke", "UK", "publication", "published", "research", "DILI", "liver injury", "toxicity", "toxicologyst",
+    "bipolar", "vpn", "3dmodel", "series", "the", "of", "and", "team", "lab", "", "\n", "  ", "é", "naming",
+]
+EMAILS = ["jane@acme.com", "x@gmail.com", "y@YAHOO.com", "not-an-email", "z@hotmail.co.uk", "info@pharma.ch"]
+
+
+def _corpus():
+    rng = random.Random(7)
+    docs = [
+        {"text_content": "", "title": ""},
+        {"text_content": "Head of Preclinical Safety, Boston", "title": "Jane Doe",
+         "emails": ["jane@acme.com"], "linkedin_urls": ["https://www.linkedin.com/in/jane"]},
+        {"text_content": "", "title": "VP Toxicology | 3D models", "emails": ["a@gmail.com"]},
+        {"text_content": " ".join(FRAGMENTS) * 3, "title": "Director", "emails": EMAILS,
+         "linkedin_urls": ["x"]},
+    ]
+    for _ in range(400):
+        text = rng.choice(["", " ", "-"]).join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 60)))
+        docs.append({
+            "text_content": text,
+            "title": " ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 4))),
+            "emails": rng.sample(EMAILS, rng.randint(0, 2)),
+            "linkedin_urls": rng.choice([[], ["https://www.linkedin.com/in/x"]]),
+        })
+    return docs
+
+
+def test_scores_match_the_previous_function(monkeypatch):
+    monkeypatch.setattr(KeywordMatcher, "_build_automaton", staticmethod(lambda keywords: None))
+    scorer = PropensityScorer()
+    assert scorer.matcher.backend == "substring"
+    for doc in _corpus():
+        assert scorer.score(doc) == _reference_score(doc), doc
+        assert calculate_propensity_score(doc) == _reference_score(doc), doc
+
+
+def test_aho_corasick_backend_matches_the_previous_function():
+    pytest.importorskip("ahocorasick")
+    scorer = PropensityScorer()
+    assert scorer.matcher.backend == "aho-corasick"
+    for doc in _corpus():
+        assert scorer.score(doc) == _reference_score(doc), doc
+
+
+def test_breakdown_reports_hits_per_category():
+    scorer = PropensityScorer()
+    breakdown = scorer.breakdown({
+        "text_content": "Published research on DILI and liver injury; toxicity of spheroid 3D models in Boston, UK.",
+        "title": "Director of Toxicology",
+        "emails": ["jane@acme.com"],
+    })
+    assert breakdown["hits"] == {"role": 3, "funding": 0, "tech": 2, "location": 2, "science": 5}
+    assert breakdown["scores"] == {"role": 15, "funding": 0, "tech": 10, "location": 10, "science": 40}
+    assert breakdown["linkedin_bonus"] == 0 and breakdown["email_bonus"] == 5
+    assert breakdown["total"] == 80
+    assert scoring.get_propensity_scorer() is scoring.get_propensity_scorer()
@@ -0,0 +1,82 @@
+import time
+
+from src.utils.search_cache import SearchCache
+
+
+def _cache(tmp_path, **kwargs):
+    return SearchCache(str(tmp_path / 'search.sqlite3'), **kwargs)
+
+
+def test_fetch_hits_after_first_miss(tmp_path):
+    cache = _cache(tmp_path, ttl_s=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [{'href': 'https://a.example'}]
+
+    assert cache.fetch('ddgs', 'Liver  Toxicity', 10, loader) == [{'href': 'https://a.example'}]
+    # normalized query (case/whitespace) shares the entry
+    assert cache.fetch('ddgs', 'liver toxicity', 10, loader) == [{'href': 'https://a.example'}]
+    assert len(calls) == 1
+    # different backend or max_results is a different key
+    cache.fetch('bing', 'liver toxicity', 10, loader)
+    cache.fetch('ddgs', 'liver toxicity', 20, loader)
+    assert len(calls) == 3
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 3
+
+
+def test_empty_results_are_not_cached(tmp_path):
+    cache = _cache(tmp_path)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return []
+
+    cache.fetch('google', 'q', 10, loader)
+    cache.fetch('google', 'q', 10, loader)
+    assert len(calls) == 2
+
+
+def test_stale_entry_is_served_and_refreshed(tmp_path):
+    cache = _cache(tmp_path, ttl_s=0.05, stale_s=60)
+    cache.set('ddgs', 'q', 10, [{'href': 'https://old.example'}])
+    time.sleep(0.1)
+
+    res = cache.fetch('ddgs', 'q', 10, lambda: [{'href': 'https://new.example'}])
+    assert res == [{'href': 'https://old.example'}]
+
+    for _ in range(50):
+        if cache.stats()['refreshes']:
+            break
+        time.sleep(0.02)
+    results, _age = cache.get('ddgs', 'q', 10)
+    assert results == [{'href': 'https://new.example'}]
+    assert cache.stats()['stale_hits'] == 1
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = _cache(tmp_path, ttl_s=0.01, stale_s=0.01)
+    cache.set('ddgs', 'q', 10, [{'href': 'https://old.example'}])
+    time.sleep(0.05)
+    assert cache.fetch('ddgs', 'q', 10, lambda: [{'href': 'https://new.example'}]) == [{'href': 'https://new.example'}]
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = _cache(tmp_path, max_entries=2)
+    cache.set('ddgs', 'a', 10, [{'href': 'a'}])
+    time.sleep(0.01)
+    cache.set('ddgs', 'b', 10, [{'href': 'b'}])
+    time.sleep(0.01)
+    cache.get('ddgs', 'a', 10)  # touch a so b becomes least recently used
+    time.sleep(0.01)
+    cache.set('ddgs', 'c', 10, [{'href': 'c'}])
+
+    assert cache.get('ddgs', 'a', 10) is not None
+    assert cache.get('ddgs', 'b', 10) is None
+    assert cache.get('ddgs', 'c', 10) is not None
+    assert cache.stats()['evictions'] == 1
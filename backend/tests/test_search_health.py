@@ -0,0 +1,60 @@
+import time
+
+from src.utils.search_health import BackendRegistry, CLOSED, HALF_OPEN, OPEN
+from src.utils.duck import duck
+
+
+def test_circuit_opens_after_repeated_failures_and_probes_half_open():
+    reg = BackendRegistry(failure_threshold=2, cooldown_s=0.05)
+    assert reg.allow('bing')
+    reg.record_failure('bing', 0.01, 'boom')
+    assert reg.allow('bing')
+    reg.record_failure('bing', 0.01, 'boom')
+    assert reg.stats()['bing']['state'] == OPEN
+    assert not reg.allow('bing')
+
+    time.sleep(0.06)
+    assert reg.allow('bing'), "one probe is admitted after the cooldown"
+    assert reg.stats()['bing']['state'] == HALF_OPEN
+    assert not reg.allow('bing'), "only a single probe at a time"
+
+    reg.record_failure('bing', 0.01, 'still down')
+    assert reg.stats()['bing']['state'] == OPEN
+
+    time.sleep(0.06)
+    assert reg.allow('bing')
+    reg.record_success('bing', 0.01, 5)
+    stats = reg.stats()['bing']
+    assert stats['state'] == CLOSED
+    assert stats['skipped'] == 2
+    assert stats['errors'] == 3
+
+
+def test_order_prefers_cheapest_cost_per_result():
+    reg = BackendRegistry()
+    reg.record_success('slow', 2.0, 10)      # 0.2 s per result
+    reg.record_success('fast', 0.5, 10)      # 0.05 s per result
+    reg.record_success('empty', 0.1, 0)      # 1.0 s per result
+    assert reg.order(['slow', 'empty', 'fast', 'new']) == ['new', 'fast', 'slow', 'empty']
+
+
+def test_duck_skips_backend_with_open_circuit(monkeypatch):
+    calls = []
+
+    def good(query):
+        calls.append('good')
+        return [{'href': 'https://a.example/1'}]
+
+    def broken(query):
+        calls.append('broken')
+        raise RuntimeError('rate limited')
+
+    monkeypatch.setattr('src.utils.duck.SEARCH_BACKENDS', [('good', good), ('broken', broken)])
+
+    for _ in range(5):
+        res = duck('q', allowed_sources=[], parallel=False)
+        assert [r['href'] for r in res] == ['https://a.example/1']
+
+    # default threshold is 3 consecutive failures; later searches skip the backend
+    assert calls.count('broken') == 3
+    assert calls.count('good') == 5
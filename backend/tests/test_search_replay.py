@@ -0,0 +1,49 @@
+import pytest
+
+from src.utils import duck as duck_mod
+from src.utils.search_replay import (
+    ReplayBackend,
+    ReplayError,
+    StubBackend,
+    recording_backends,
+    replay_backends,
+)
+
+
+def test_record_then_replay_roundtrip(tmp_path, monkeypatch):
+    def live_ddgs(query):
+        return [{'href': 'https://a.example/1', 'title': query}]
+
+    def live_bing(query):
+        raise RuntimeError('quota exceeded')
+
+    recorded = recording_backends([('ddgs', live_ddgs), ('bing', live_bing)], str(tmp_path))
+    monkeypatch.setattr(duck_mod, 'SEARCH_BACKENDS', recorded)
+    live = duck_mod.duck('Liver Toxicity', allowed_sources=[], parallel=False)
+
+    monkeypatch.setattr(duck_mod, 'SEARCH_BACKENDS', replay_backends(str(tmp_path), names=('ddgs', 'bing')))
+    replayed = duck_mod.duck('liver  toxicity', allowed_sources=[], parallel=False)
+
+    assert [r['href'] for r in replayed] == [r['href'] for r in live] == ['https://a.example/1']
+    # the recorded failure is replayed as a failure too
+    with pytest.raises(ReplayError):
+        ReplayBackend('bing', str(tmp_path))('liver toxicity')
+
+
+def test_replay_missing_fixture(tmp_path):
+    assert ReplayBackend('ddgs', str(tmp_path))('unknown') == []
+    with pytest.raises(KeyError):
+        ReplayBackend('ddgs', str(tmp_path), strict=True)('unknown')
+
+
+def test_injected_latency_and_errors():
+    import time
+
+    slow = StubBackend('ddgs', results_per_query=3, latency_s=0.05)
+    started = time.monotonic()
+    assert len(slow('q')) == 3
+    assert time.monotonic() - started >= 0.05
+
+    failing = StubBackend('ddgs', error_rate=1.0)
+    with pytest.raises(ReplayError):
+        failing('q')
@@ -0,0 +1,85 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from src.utils.throttle import DomainThrottle, ThrottleMiddleware, domain_key, parse_retry_after
+
+
+def test_domain_key_and_retry_after_parsing():
+    assert domain_key("https://WWW.Acme.com:8443/team") == "acme.com"
+    assert domain_key("pubmed.ncbi.nlm.nih.gov") == "pubmed.ncbi.nlm.nih.gov"
+    assert parse_retry_after(b"120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_additive_increase_on_fast_responses():
+    t = DomainThrottle(start_delay_s=1.0, start_concurrency=2, max_concurrency=3, increase_every=2)
+    for _ in range(4):
+        t.record("https://acme.com/", status=200, latency_s=0.1)
+    state = t.state("acme.com")
+    assert state.concurrency == 3
+    assert state.delay_s < 1.0
+
+
+def test_backoff_on_slow_errors_and_429_with_retry_after():
+    t = DomainThrottle(start_delay_s=0.2, start_concurrency=4, target_latency_s=1.0)
+    t.record("acme.com", status=200, latency_s=0.5)
+    t.record("acme.com", status=200, latency_s=5.0)
+    assert t.state("acme.com").concurrency == 3
+
+    t.record("acme.com", status=429, retry_after="30")
+    state = t.state("acme.com")
+    assert state.concurrency == 1 and state.delay_s >= 1.0 and state.backoffs == 1
+    assert 29 < t.blocked_for("https://www.acme.com/x") <= 30
+    assert not t.acquire("acme.com", timeout=0.05)
+
+    snap = t.snapshot()["acme.com"]
+    assert snap["last_status"] == 429 and snap["blocked_for_s"] > 0
+
+
+def test_sustained_slow_but_successful_responses_do_not_back_off():
+    t = DomainThrottle(start_delay_s=0.5, start_concurrency=2, max_delay_s=30.0, target_latency_s=2.0)
+    for _ in range(12):
+        t.record("acme.com", status=200, latency_s=2.5)  # e.g. Chromium domcontentloaded on a heavy site
+    state = t.state("acme.com")
+    assert state.delay_s <= 0.5 and state.concurrency >= 2 and state.errors == 0
+    concurrency, delay = state.concurrency, state.delay_s
+
+    # a spike well above the domain's own average still gives up a slot, without growing the delay
+    t.record("acme.com", status=200, latency_s=9.0)
+    assert state.concurrency == concurrency - 1 and state.delay_s == delay
+
+
+def test_acquire_honours_concurrency_and_delay():
+    t = DomainThrottle(start_delay_s=0.0, start_concurrency=1)
+    assert t.acquire("acme.com")
+    assert not t.acquire("acme.com", timeout=0.05)  # only one slot
+    assert t.acquire("other.org", timeout=0.05)  # domains are independent
+
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(t.acquire("acme.com", timeout=2)))
+    waiter.start()
+    time.sleep(0.05)
+    t.release("acme.com", status=200, latency_s=0.1)
+    waiter.join()
+    assert acquired == [True]
+
+    t = DomainThrottle(start_delay_s=0.2, start_concurrency=4)
+    started = time.monotonic()
+    t.acquire("acme.com")
+    t.acquire("acme.com")
+    assert time.monotonic() - started >= 0.19
+
+
+def test_middleware_copies_state_onto_downloader_slot():
+    slot = SimpleNamespace(delay=1.0, concurrency=4)
+    crawler = SimpleNamespace(engine=SimpleNamespace(downloader=SimpleNamespace(slots={"acme.com": slot})))
+    mw = ThrottleMiddleware(crawler, DomainThrottle(start_delay_s=1.0, start_concurrency=4))
+    request = SimpleNamespace(url="https://acme.com/a", meta={"download_slot": "acme.com", "download_latency": 0.2})
+    response = SimpleNamespace(status=503, flags=[], headers={"Retry-After": b"5"})
+
+    assert mw.process_response(request, response, spider=None) is response
+    assert slot.concurrency == 2 and slot.delay == 2.0
+    assert mw.process_exception(request, Exception("boom"), spider=None) is None
+    assert slot.concurrency == 1
@@ -253,7 +253,8 @@ export function LeadFinder() {
                 }
                 return merged;
               });
-            } else if (data.type === 'item') {
+            } else if (data.type === 'item' || data.type === 'item_update') {
+              // item_update re-sends a lead already shown, with fields a later sighting filled in
               setProgress(typeof data.percent === 'number' ? data.percent : 0);
               setResults((prev) => {
                 // Avoid duplicating a previously-added search result: replace if same url